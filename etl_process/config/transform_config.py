@@ -0,0 +1,59 @@
+"""
+    Column configuration of the airport and delay datasets, shared by
+    extraction (to type the CSV reader) and the Transformer.
+"""
+
+AIRPORT_CONFIG = {
+    "crit_cols": ["name", "iata"],
+    "col_types": {
+        "str_cols": ["name", "iata", "city"],
+        "float_cols": ["lat", "lon", "alt"],
+        "int_cols": []
+    }
+}
+
+DELAY_CONFIG = {
+    "crit_cols": ["year", "month",
+                  "carrier", "carrier_name",
+                  "airport", "airport_name"],
+    "col_types": {
+        "str_cols": ["carrier", "carrier_name",
+                     "airport", "airport_name"],
+        "int_cols": ["year", "month", "arr_flights",
+                     "arr_del15", "arr_cancelled",
+                     "arr_diverted", "arr_delay",
+                     "carrier_delay", "weather_delay",
+                     "nas_delay", "security_delay",
+                     "late_aircraft_delay"],
+        "float_cols": ["carrier_ct", "weather_ct",
+                       "nas_ct", "security_ct",
+                       "late_aircraft_ct"]
+    },
+    # str_cols parsed straight to category, see read_dtypes
+    "categorical_cols": ["carrier", "airport"]
+}
+
+# Parser dtype per col_types key. Integer columns are parsed as float64
+# because BTS writes counts with decimals and leaves gaps, they become
+# int64 once the Transformer has filled their nulls.
+READ_DTYPES = {
+    "str_cols": "string",
+    "int_cols": "float64",
+    "float_cols": "float64"
+}
+
+
+def read_dtypes(config) -> "dict[str, str]":
+    """
+    Build the read_csv dtype mapping for a dataset config, so that the
+    parser allocates the final column representation directly.
+
+    :param config: AIRPORT_CONFIG or DELAY_CONFIG
+    :return: column name -> dtype
+    """
+    dtypes = {col: READ_DTYPES[key]
+              for key, cols in config["col_types"].items()
+              for col in cols}
+    dtypes.update({col: "category"
+                   for col in config.get("categorical_cols", [])})
+    return dtypes
@@ -1,10 +1,20 @@
 import os
 import sys
 from config.env_config import setup_env
-from src.load.load import load_main
-from src.extract.extract import extract_main
-from src.transform.transform import transform_main
-from src.utils.logging_utils import setup_logger
+from src.load.load import load_file_main, load_main, load_stream_main
+from src.extract.extract import extract_main, extract_stream_main
+from src.out_of_core.duckdb_pipeline import run_duckdb_pipeline
+from src.transform.transform import (
+    AIRPORT_CONFIG,
+    DELAY_CONFIG,
+    transform_main,
+)
+from src.transform.stream import transform_chunks
+from src.utils.get_data import DEFAULT_CHUNKSIZE
+from src.utils.instrumentation import REPORT_FILE, run_report, stage
+from src.utils.logging_utils import _ensure_log_directory, setup_logger
+from src.utils.manifest import RunManifest, hash_config, hash_file
+from src.utils.post_data import DATA_DIR
 
 # Use LOG_BASE_PATH if set (for testing), otherwise use default
 log_base_path = os.getenv("LOG_BASE_PATH")
@@ -12,8 +22,54 @@ logger = setup_logger(
     "etl_pipeline", "etl_pipeline.log", base_path=log_base_path
 )
 
+RAW_FILES = ["airports.csv", "Airline_Delay_Cause.csv"]
+ETL_ENGINES = ["pandas", "duckdb", "stream"]
+
+
+def run_out_of_core(post_data: bool, load_mode: str) -> None:
+    """
+    Run the pipeline with the DuckDB engine: extract and transform stream
+    from the raw files to Parquet, and the load streams the Parquet file,
+    so memory stays flat whatever the size of the history.
+    """
+    if load_mode != "replace":
+        raise ValueError("The duckdb engine only supports LOAD_MODE=replace")
+    logger.info("Started DuckDB Extract and Transform Phases")
+    with stage("extract_transform"):
+        merged_path = run_duckdb_pipeline(write_rollups=post_data)
+    logger.info("DuckDB Extract and Transform Phases Completed")
+    logger.info("Starting Load Phase")
+    with stage("load"):
+        load_file_main(merged_path)
+    logger.info("Load Phase Completed")
+
+
+def run_streaming(post_data: bool, load_mode: str, compact: bool,
+                  chunksize: int) -> None:
+    """
+    Run the pipeline as one stream of delay chunks: each chunk is parsed,
+    cleaned, joined to the airports and queued for COPY, which loads it
+    while the next chunks are parsed. Only the airports and a few chunks
+    are in memory at once.
+    """
+    if load_mode != "replace":
+        raise ValueError("The stream engine only supports LOAD_MODE=replace")
+    if post_data:
+        logger.warning("The stream engine does not write POST_DATA files")
+    logger.info("Started streamed Extract, Transform and Load Phases")
+    with stage("stream"):
+        airports, delay_chunks = extract_stream_main(chunksize)
+        load_stream_main(transform_chunks(airports, delay_chunks, compact))
+    logger.info("Streamed Extract, Transform and Load Phases Completed")
+
 
 def main():
+    # Per-stage time, memory and row counts are appended to the run report
+    with run_report(_ensure_log_directory(log_base_path) / REPORT_FILE):
+        run_pipeline()
+
+
+def run_pipeline():
     # Get the argument from the run_etl command and set up the environment
     setup_env(sys.argv)
     logger.info(
@@ -32,17 +88,98 @@ def main():
     except KeyError:
         post_data = False
 
-    logger.info("Started Extraction Phase")
-    extracted_data = extract_main(post_data)
-    logger.info("Extraction Phase Completed")
+    # File format of the intermediate outputs (csv, parquet, feather, arrow)
+    file_format = os.getenv("OUTPUT_FORMAT", "csv")
 
-    logger.info("Started Transform Phase")
-    transformed_data = transform_main(extracted_data, post_data)
-    logger.info("Transform Phase Completed")
+    # Keep repeated string columns as categoricals (much smaller in memory)
+    compact = os.getenv("COMPACT_MODE", "False") == "True"
 
-    logger.info("Starting Load Phase")
-    load_main(transformed_data)
-    logger.info("Load Phase Completed")
+    # Processes cleaning the delay data, 1 cleans in process
+    workers = int(os.getenv("TRANSFORM_WORKERS", "1"))
+
+    # replace reloads the whole table, incremental upserts new periods only
+    load_mode = os.getenv("LOAD_MODE", "replace")
+
+    # Concurrent COPY streams of a replace load, 1 loads over one connection
+    load_workers = int(os.getenv("LOAD_WORKERS", "1"))
+
+    # Months before the last loaded one an incremental load sends again
+    lookback_months = int(os.getenv("LOAD_LOOKBACK_MONTHS", "0"))
+
+    # pandas holds every frame in memory, duckdb runs out of core and
+    # stream runs the phases chunk by chunk
+    etl_engine = os.getenv("ETL_ENGINE", "pandas")
+    if etl_engine not in ETL_ENGINES:
+        raise ValueError(f"Unknown ETL_ENGINE: {etl_engine}")
+    if etl_engine == "duckdb":
+        run_out_of_core(post_data, load_mode)
+        return
+    if etl_engine == "stream":
+        chunksize = int(os.getenv("STREAM_CHUNKSIZE", DEFAULT_CHUNKSIZE))
+        run_streaming(post_data, load_mode, compact, chunksize)
+        return
+
+    # Skip stages whose inputs are unchanged unless FORCE_RUN=True
+    force_run = os.getenv("FORCE_RUN", "False") == "True"
+    manifest = RunManifest()
+
+    # POST_DATA and OUTPUT_FORMAT decide which files the stages write, so a
+    # change reruns the stages to write them
+    output_inputs = {"POST_DATA": str(post_data),
+                     "OUTPUT_FORMAT": file_format}
+    extract_inputs = {**{name: hash_file(DATA_DIR / "raw" / name)
+                         for name in RAW_FILES},
+                      **output_inputs}
+    extract_key = hash_config(extract_inputs)
+    if not force_run and manifest.is_fresh("extract", extract_key):
+        logger.info("Raw inputs unchanged, reusing cached extraction")
+        extracted_data = tuple(manifest.load_artifacts("extract"))
+    else:
+        logger.info("Started Extraction Phase")
+        with stage("extract") as metrics:
+            extracted_data = extract_main(post_data, file_format)
+            metrics.rows_out = sum(map(len, extracted_data))
+        manifest.record("extract", extract_key, extract_inputs,
+                        {"airports": extracted_data[0],
+                         "delay": extracted_data[1]})
+        logger.info("Extraction Phase Completed")
+
+    transform_inputs = {**manifest.output_hashes("extract"),
+                        "AIRPORT_CONFIG": hash_config(AIRPORT_CONFIG),
+                        "DELAY_CONFIG": hash_config(DELAY_CONFIG),
+                        "COMPACT_MODE": str(compact),
+                        **output_inputs}
+    transform_key = hash_config(transform_inputs)
+    if not force_run and manifest.is_fresh("transform", transform_key):
+        logger.info("Extracted data unchanged, reusing cached transform")
+        transformed_data = manifest.load_artifacts("transform")[0]
+    else:
+        logger.info("Started Transform Phase")
+        with stage("transform",
+                   rows_in=sum(map(len, extracted_data))) as metrics:
+            transformed_data = transform_main(extracted_data, post_data,
+                                              file_format, compact, workers)
+            metrics.rows_out = len(transformed_data)
+        manifest.record("transform", transform_key, transform_inputs,
+                        {"merged": transformed_data})
+        logger.info("Transform Phase Completed")
+
+    load_inputs = {**manifest.output_hashes("transform"),
+                   "LOAD_MODE": load_mode,
+                   "LOAD_LOOKBACK_MONTHS": str(lookback_months),
+                   "TARGET_DB_HOST": os.getenv("TARGET_DB_HOST", ""),
+                   "TARGET_DB_NAME": os.getenv("TARGET_DB_NAME", "")}
+    load_key = hash_config(load_inputs)
+    if not force_run and manifest.is_fresh("load", load_key):
+        logger.info("Transformed data unchanged, skipping Load Phase")
+    else:
+        logger.info("Starting Load Phase")
+        with stage("load", rows_in=len(transformed_data)):
+            loaded = load_main(transformed_data, load_mode, load_workers,
+                               lookback_months)
+        if loaded:
+            manifest.record("load", load_key, load_inputs)
+        logger.info("Load Phase Completed")
 
 
 if __name__ == "__main__":
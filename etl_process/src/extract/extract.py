@@ -1,27 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from typing import Iterator, Tuple
 import pandas as pd
-from src.extract.get_delay_data import extract_delay_data
+from src.extract.get_delay_data import (
+    extract_delay_data,
+    extract_delay_data_chunks,
+)
 from src.extract.get_airports import extract_airport_locations
+from src.utils.get_data import DEFAULT_CHUNKSIZE
 from src.utils.logging_utils import setup_logger
 from src.utils.post_data import post
 import logging
+import timeit
 
 logger = setup_logger(__name__, "extract_data.log", level=logging.DEBUG)
 
 
-def extract_main(write_to_file=False) -> "tuple[pd.DataFrame, pd.DataFrame]":
+def extract_main(write_to_file=False,
+                 file_format="csv",
+                 parallel=True) -> "tuple[pd.DataFrame, pd.DataFrame]":
     """
         Runs the extraction phase
 
         args:
             write_to_file: whether to write the output to a file
+            file_format: extension of the output files (csv, parquet,
+            feather or arrow)
+            parallel: whether to extract the airports and delays files
+            concurrently, in two threads. The files are independent, so
+            the wall time is that of the slower one.
     """
-    airports = extract_airport_locations()
-    delay_info = extract_delay_data()
-    logger.info(f"Extraction completed successfully - "
+    start_time = timeit.default_timer()
+    if parallel:
+        with ThreadPoolExecutor(max_workers=2,
+                                thread_name_prefix="extract") as executor:
+            # Run in copies of this context so the threads' stages are
+            # nested under the current one in the run report
+            airports_future = executor.submit(
+                contextvars.copy_context().run, extract_airport_locations)
+            delay_future = executor.submit(
+                contextvars.copy_context().run, extract_delay_data)
+            # result() re-raises any error from the extraction thread
+            airports = airports_future.result()
+            delay_info = delay_future.result()
+    else:
+        airports = extract_airport_locations()
+        delay_info = extract_delay_data()
+    logger.info(f"Extraction completed successfully in "
+                f"{timeit.default_timer() - start_time:.2f}s - "
                 f"Airports: {airports.shape}, Delays: {delay_info.shape}")
 
     if write_to_file:
-        post("processed", "extract_airports.csv", airports)
-        post("processed", "extract_delay.csv", delay_info)
+        post("processed", f"extract_airports.{file_format}", airports)
+        post("processed", f"extract_delay.{file_format}", delay_info)
 
     return (airports, delay_info)
+
+
+def extract_stream_main(chunksize: int = DEFAULT_CHUNKSIZE
+                        ) -> Tuple[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+        Runs the extraction phase as a stream: the airports, a few hundred
+        rows, are read whole and the delay file is parsed lazily, one chunk
+        at a time as the iterator is consumed.
+
+        args:
+            chunksize: maximum number of delay rows per chunk
+
+        returns:
+            tuple[pd.DataFrame, Iterator[pd.DataFrame]]: the airports and
+            the delay chunks, in file order
+    """
+    airports = extract_airport_locations()
+    logger.info(f"Extracted airports {airports.shape}, streaming delays in "
+                f"chunks of {chunksize} rows")
+    return airports, extract_delay_data_chunks(chunksize)
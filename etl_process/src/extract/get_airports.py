@@ -1,19 +1,29 @@
-from src.utils.get_data import get_raw_file
+from config.transform_config import AIRPORT_CONFIG, read_dtypes
+from src.utils.get_data import get_raw_file, get_raw_header
 import pandas as pd
 from src.utils.logging_utils import setup_logger
 import logging
 
 logger = setup_logger(__name__, "extract_data.log", level=logging.DEBUG)
 
+# Only the columns that are kept (plus country, used to filter) are parsed,
+# straight into the dtypes the Transformer casts to. The file writes nulls
+# as \N.
+READ_OPTIONS = {
+    "usecols": ["name", "city", "country", "iata", "lat", "lon", "alt"],
+    "dtype": {**read_dtypes(AIRPORT_CONFIG), "country": "category"},
+    "na_values": ["\\N"],
+}
+
 
 def extract_airport_locations() -> pd.DataFrame:
     """
         Extracts and processes airport location data for US airports from a
-        CSV file. This function reads the 'airports.csv' file using the
-        `get_raw_file` utility, filters the data to include only airports
-        located in the United States, sorts the results by the IATA code,
-        selects relevant columns, and replaces any occurrences of the string
-        '\\N' with None to standardize missing values.
+        CSV file. This function validates the header of 'airports.csv',
+        reads only the relevant columns with their final dtypes using the
+        `get_raw_file` utility (parsing '\\N' as null), filters the data to
+        include only airports located in the United States and sorts the
+        results by the IATA code.
         Returns:
             pd.DataFrame: A DataFrame containing the following columns for
             US airports:
@@ -33,10 +43,9 @@ def extract_airport_locations() -> pd.DataFrame:
                        "lat", "lon", "alt", "tz",
                        "dst", "timezone", "type", "source"]
 
-    airports_df = get_raw_file("airports.csv")
-
-    # Validate schema
-    missing_columns = set(EXPECTED_SCHEMA) - set(airports_df.columns)
+    # Validate schema on the header, before parsing only the needed columns
+    missing_columns = set(EXPECTED_SCHEMA) - \
+        set(get_raw_header("airports.csv"))
     if missing_columns:
         logger.setLevel(logging.ERROR)
         logger.error(
@@ -44,6 +53,8 @@ def extract_airport_locations() -> pd.DataFrame:
         )
         raise KeyError(f"Missing expected columns: {missing_columns}")
 
+    airports_df = get_raw_file("airports.csv", **READ_OPTIONS)
+
     # Filter American airports
     us_airports_df = (airports_df[airports_df['country'] == 'United States']
                       .sort_values(by="iata"))
@@ -52,9 +63,6 @@ def extract_airport_locations() -> pd.DataFrame:
     us_airports_df = us_airports_df[['name', 'city', 'iata', 'lat',
                                      'lon', 'alt']]
 
-    # Replace all \N with None so pandas recognises them as nulls
-    us_airports_df = us_airports_df.replace('\\N', None)
-
     # Verify integrity
     if (us_airports_df.empty):
         logger.setLevel(logging.ERROR)
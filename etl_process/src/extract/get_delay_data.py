@@ -1,10 +1,63 @@
-from src.utils.get_data import get_raw_file
+from config.transform_config import DELAY_CONFIG, read_dtypes
+from src.utils.get_data import (
+    DEFAULT_CHUNKSIZE,
+    get_raw_file,
+    get_raw_file_chunks,
+    get_raw_header,
+)
 import pandas as pd
+from typing import Iterable, Iterator
 from src.utils.logging_utils import setup_logger
 import logging
 
 logger = setup_logger(__name__, "extract_data.log", level=logging.DEBUG)
 
+EXPECTED_SCHEMA = [
+    "year",
+    "month",
+    "carrier",
+    "carrier_name",
+    "airport",
+    "airport_name",
+    "arr_flights",
+    "arr_del15",
+    "carrier_ct",
+    "weather_ct",
+    "nas_ct",
+    "security_ct",
+    "late_aircraft_ct",
+    "arr_cancelled",
+    "arr_diverted",
+    "arr_delay",
+    "carrier_delay",
+    "weather_delay",
+    "nas_delay",
+    "security_delay",
+    "late_aircraft_delay"
+]
+
+# Parse straight into the dtypes the Transformer casts to
+READ_OPTIONS = {
+    "usecols": EXPECTED_SCHEMA,
+    "dtype": read_dtypes(DELAY_CONFIG),
+}
+
+
+def _validate_schema(columns: Iterable[str]) -> None:
+    """
+        Checks that every column of EXPECTED_SCHEMA is present.
+
+        Raises:
+            KeyError: If expected columns are missing
+    """
+    missing_columns = set(EXPECTED_SCHEMA) - set(columns)
+    if missing_columns:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Missing expected columns in delays: {missing_columns}"
+        )
+        raise KeyError(f"Missing expected columns: {missing_columns}")
+
 
 def extract_delay_data() -> pd.DataFrame:
     """
@@ -31,40 +84,10 @@ def extract_delay_data() -> pd.DataFrame:
             KeyError: If expected columns are missing
             ValueError: If no data is extracted
     """
-    EXPECTED_SCHEMA = [
-        "year",
-        "month",
-        "carrier",
-        "carrier_name",
-        "airport",
-        "airport_name",
-        "arr_flights",
-        "arr_del15",
-        "carrier_ct",
-        "weather_ct",
-        "nas_ct",
-        "security_ct",
-        "late_aircraft_ct",
-        "arr_cancelled",
-        "arr_diverted",
-        "arr_delay",
-        "carrier_delay",
-        "weather_delay",
-        "nas_delay",
-        "security_delay",
-        "late_aircraft_delay"
-    ]
-
-    delay_df = get_raw_file("Airline_Delay_Cause.csv")
-
-    # Validate schema
-    missing_columns = set(EXPECTED_SCHEMA) - set(delay_df.columns)
-    if missing_columns:
-        logger.setLevel(logging.ERROR)
-        logger.error(
-            f"Missing expected columns in delays: {missing_columns}"
-        )
-        raise KeyError(f"Missing expected columns: {missing_columns}")
+    # Validate schema on the header, before parsing only the needed columns
+    _validate_schema(get_raw_header("Airline_Delay_Cause.csv"))
+
+    delay_df = get_raw_file("Airline_Delay_Cause.csv", **READ_OPTIONS)
 
     delay_df = delay_df.sort_values(["year", "month", "carrier", "airport"])
 
@@ -76,5 +99,40 @@ def extract_delay_data() -> pd.DataFrame:
     return delay_df
 
 
+def extract_delay_data_chunks(
+        chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+        Streams airline delay data from CSV file in bounded-size chunks.
+
+        The schema is validated once against the header before any rows are
+        parsed. Unlike extract_delay_data the rows are yielded in file order,
+        as sorting would require the whole file to be in memory.
+
+        Args:
+            chunksize: Maximum number of rows per chunk
+
+        Yields:
+            pd.DataFrame: Chunks with the same columns as extract_delay_data
+
+        Raises:
+            FileNotFoundError: If the delay data file doesn't exist
+            KeyError: If expected columns are missing
+            ValueError: If no data is extracted
+    """
+    _validate_schema(get_raw_header("Airline_Delay_Cause.csv"))
+
+    extracted_rows = 0
+    for chunk in get_raw_file_chunks("Airline_Delay_Cause.csv", chunksize,
+                                     **READ_OPTIONS):
+        extracted_rows += len(chunk)
+        yield chunk
+
+    # Verify integrity
+    if extracted_rows == 0:
+        logger.setLevel(logging.ERROR)
+        logger.error("No delay data extracted, ensure data exists")
+        raise ValueError("No delay extracted, ensure data exists")
+
+
 if __name__ == "__main__":
     print(extract_delay_data().head())
@@ -0,0 +1,143 @@
+import io
+from typing import Iterable
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from psycopg import Connection, sql
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+)
+from src.utils.instrumentation import stage
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
+
+# Rows serialised and sent per COPY write
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def pg_type(dtype) -> str:
+    """
+    Map a pandas dtype to the PostgreSQL column type used to store it.
+
+    Args:
+        dtype: pandas dtype of the column
+
+    Returns:
+        str: PostgreSQL type name, TEXT for strings and categoricals
+    """
+    if is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if is_integer_dtype(dtype):
+        return "BIGINT"
+    if is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def build_create_table(data: pd.DataFrame,
+                       table: str,
+                       schema: str,
+                       if_not_exists: bool = False) -> sql.Composed:
+    """
+    Build a CREATE TABLE statement with one explicitly typed column per
+    DataFrame column.
+
+    Args:
+        data: DataFrame whose dtypes define the table
+        table: name of the table to create
+        schema: schema of the table
+        if_not_exists: whether to leave an existing table untouched
+
+    Returns:
+        sql.Composed: the CREATE TABLE statement
+    """
+    columns = sql.SQL(", ").join(
+        sql.SQL("{} {}").format(sql.Identifier(str(col)),
+                                sql.SQL(pg_type(dtype)))
+        for col, dtype in data.dtypes.items()
+    )
+    return sql.SQL("CREATE TABLE {}{} ({})").format(
+        sql.SQL("IF NOT EXISTS " if if_not_exists else ""),
+        sql.Identifier(schema, table), columns
+    )
+
+
+def copy_dataframe(conn: Connection,
+                   data: pd.DataFrame,
+                   table: str,
+                   schema: str,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Stream a DataFrame into an existing table with COPY FROM STDIN.
+
+    Rows are converted to Arrow and sent one batch at a time, see
+    copy_batches.
+
+    Args:
+        conn: open psycopg connection, the caller owns the transaction
+        data: DataFrame to copy, columns must match the table
+        table: name of the target table
+        schema: schema of the target table
+        batch_size: rows serialised per write
+
+    Returns:
+        int: number of rows copied
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    batches = (
+        pa.RecordBatch.from_pandas(data.iloc[start:start + batch_size],
+                                   preserve_index=False)
+        for start in range(0, len(data), batch_size)
+    )
+    return copy_batches(conn, batches, list(data.columns), table, schema)
+
+
+def copy_batches(conn: Connection,
+                 batches: Iterable[pa.RecordBatch],
+                 columns: "list[str]",
+                 table: str,
+                 schema: str) -> int:
+    """
+    Stream Arrow record batches into an existing table with COPY FROM STDIN.
+
+    Each batch is serialised as CSV with pyarrow, so only a single batch is
+    held as text in memory. Strings are always quoted and nulls are sent as
+    unquoted empty fields, which COPY reads as NULL.
+
+    Args:
+        conn: open psycopg connection, the caller owns the transaction
+        batches: record batches whose columns match `columns`
+        columns: columns of the table to fill, in batch order
+        table: name of the target table
+        schema: schema of the target table
+
+    Returns:
+        int: number of rows copied
+    """
+    statement = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+        sql.Identifier(schema, table),
+        sql.SQL(", ").join(sql.Identifier(str(col)) for col in columns)
+    )
+    write_options = pa_csv.WriteOptions(include_header=False)
+    rows = 0
+    with stage("copy") as metrics, conn.cursor() as cursor:
+        metrics.bytes_out = 0
+        with cursor.copy(statement) as copy:
+            for batch in batches:
+                buffer = io.BytesIO()
+                pa_csv.write_csv(batch, buffer, write_options)
+                copy.write(buffer.getbuffer())
+                rows += batch.num_rows
+                metrics.bytes_out += buffer.tell()
+        metrics.rows_out = rows
+    logger.info(f"Copied {rows} rows to {schema}.{table}")
+    return rows
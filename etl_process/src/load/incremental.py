@@ -0,0 +1,291 @@
+from typing import Optional, Tuple
+import pandas as pd
+from psycopg import Cursor, sql
+from sqlalchemy import Engine
+from src.load.copy_loader import (
+    DEFAULT_BATCH_SIZE,
+    build_create_table,
+    copy_dataframe,
+)
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
+
+# Columns identifying one row of the merged data
+KEY_COLUMNS = ["year", "month", "carrier", "iata"]
+# Repeated keys quoted in the error of a table that cannot be upserted
+DUPLICATE_EXAMPLES = 5
+WATERMARK_TABLE = "load_watermark"
+STAGING_TABLE = "upsert_staging"
+
+
+def _ensure_watermark_table(cursor: Cursor, schema: str) -> None:
+    cursor.execute(sql.SQL(
+        "CREATE TABLE IF NOT EXISTS {} ("
+        "table_name TEXT PRIMARY KEY, "
+        "year INTEGER NOT NULL, "
+        "month INTEGER NOT NULL, "
+        "loaded_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ).format(sql.Identifier(schema, WATERMARK_TABLE)))
+
+
+def _check_unique_keys(cursor: Cursor, table: str, schema: str) -> None:
+    """
+    Raise if rows of the table repeat a key, which a replace load of data
+    with repeated keys leaves behind, before the unique key index is built
+    on it. Rows with a null key column are not compared, like in the index.
+    """
+    keys = sql.SQL(", ").join(map(sql.Identifier, KEY_COLUMNS))
+    cursor.execute(sql.SQL(
+        "SELECT {keys}, COUNT(*) FROM {table} WHERE {not_null} "
+        "GROUP BY {keys} HAVING COUNT(*) > 1 LIMIT %s"
+    ).format(
+        keys=keys,
+        table=sql.Identifier(schema, table),
+        not_null=sql.SQL(" AND ").join(
+            sql.SQL("{} IS NOT NULL").format(sql.Identifier(col))
+            for col in KEY_COLUMNS),
+    ), (DUPLICATE_EXAMPLES,))
+    duplicates = cursor.fetchall()
+    if duplicates:
+        raise ValueError(
+            f"{schema}.{table} has rows repeating a key of {KEY_COLUMNS}, "
+            f"e.g. {[tuple(row[:-1]) for row in duplicates]}, so it cannot "
+            f"be loaded incrementally. Remove the repeated keys first")
+
+
+def _ensure_tables(cursor: Cursor, data: pd.DataFrame,
+                   table: str, schema: str) -> None:
+    """Create the target table, its key index and the watermark table."""
+    cursor.execute(build_create_table(data, table, schema,
+                                      if_not_exists=True))
+    index = f"{table}_key_idx"
+    cursor.execute("SELECT 1 FROM pg_indexes "
+                   "WHERE schemaname = %s AND indexname = %s",
+                   (schema, index))
+    if not cursor.fetchall():
+        _check_unique_keys(cursor, table, schema)
+        cursor.execute(sql.SQL("CREATE UNIQUE INDEX {} ON {} ({})").format(
+            sql.Identifier(index),
+            sql.Identifier(schema, table),
+            sql.SQL(", ").join(map(sql.Identifier, KEY_COLUMNS))
+        ))
+    _ensure_watermark_table(cursor, schema)
+
+
+def read_watermark(cursor: Cursor, table: str,
+                   schema: str) -> Optional[Tuple[int, int]]:
+    """
+    Read the last loaded (year, month) of a table.
+
+    Args:
+        cursor: open psycopg cursor
+        table: name of the loaded table
+        schema: schema holding the watermark table
+
+    Returns:
+        tuple[int, int] | None: the last loaded period, or None if the table
+        has never been loaded incrementally
+    """
+    cursor.execute(sql.SQL(
+        "SELECT year, month FROM {} WHERE table_name = %s"
+    ).format(sql.Identifier(schema, WATERMARK_TABLE)), (table,))
+    row = cursor.fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def _write_watermark(cursor: Cursor, table: str, schema: str,
+                     period: Tuple[int, int]) -> None:
+    cursor.execute(sql.SQL(
+        "INSERT INTO {} (table_name, year, month) VALUES (%s, %s, %s) "
+        "ON CONFLICT (table_name) DO UPDATE SET year = EXCLUDED.year, "
+        "month = EXCLUDED.month, loaded_at = now()"
+    ).format(sql.Identifier(schema, WATERMARK_TABLE)),
+        (table, int(period[0]), int(period[1])))
+
+
+def sync_watermark(engine: Engine, table: str, schema: str,
+                   columns: "list[str]") -> Optional[Tuple[int, int]]:
+    """
+    Set the watermark of a table to the newest period it holds, after a
+    replace load, so the next incremental load starts from the replaced
+    data. The watermark is removed when the table is empty.
+
+    Args:
+        engine: SQLAlchemy database engine using the psycopg driver
+        table: name of the loaded table
+        schema: schema of the loaded and watermark tables
+        columns: columns of the loaded table, tables without year and
+          month are left alone
+
+    Returns:
+        tuple[int, int] | None: the new watermark
+    """
+    if not {"year", "month"} <= set(columns):
+        return None
+    with engine.begin() as conn:
+        with conn.connection.driver_connection.cursor() as cursor:
+            _ensure_watermark_table(cursor, schema)
+            cursor.execute(sql.SQL(
+                "SELECT year, month FROM {} "
+                "ORDER BY year DESC, month DESC LIMIT 1"
+            ).format(sql.Identifier(schema, table)))
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute(sql.SQL(
+                    "DELETE FROM {} WHERE table_name = %s"
+                ).format(sql.Identifier(schema, WATERMARK_TABLE)), (table,))
+                latest = None
+            else:
+                latest = (int(row[0]), int(row[1]))
+                _write_watermark(cursor, table, schema, latest)
+    logger.info(f"Watermark of {schema}.{table} set to {latest}")
+    return latest
+
+
+def start_period(watermark: Tuple[int, int],
+                 lookback_months: int = 0) -> Tuple[int, int]:
+    """
+    First (year, month) to send again, `lookback_months` before the
+    watermark.
+
+    Args:
+        watermark: last loaded period
+        lookback_months: earlier months to send again, 0 sends the
+          watermark month only
+
+    Returns:
+        tuple[int, int]: the first period to send
+    """
+    if lookback_months < 0:
+        raise ValueError(f"lookback_months must not be negative, got "
+                         f"{lookback_months}")
+    months = watermark[0] * 12 + watermark[1] - 1 - lookback_months
+    year, month = divmod(months, 12)
+    return year, month + 1
+
+
+def rows_since(data: pd.DataFrame,
+               since: Optional[Tuple[int, int]]) -> pd.DataFrame:
+    """
+    Select the rows of a DataFrame from a (year, month) onwards.
+
+    Args:
+        data: DataFrame with year and month columns
+        since: first period to keep, None keeps every row
+
+    Returns:
+        pd.DataFrame: the rows of the periods from since onwards
+    """
+    if since is None:
+        return data
+    period = data["year"] * 100 + data["month"]
+    return data[period >= since[0] * 100 + since[1]]
+
+
+def build_upsert(columns: "list[str]", table: str,
+                 schema: str) -> sql.Composed:
+    """
+    Build the statement moving the staging rows into the target table.
+
+    Rows with a new key are inserted. Rows with an existing key are only
+    updated when at least one value differs, so unchanged rows are not
+    rewritten. Of staging rows repeating a key, the last one copied is
+    kept, like drop_duplicates(KEY_COLUMNS, keep="last").
+
+    Args:
+        columns: columns of the target table
+        table: name of the target table
+        schema: schema of the target table
+
+    Returns:
+        sql.Composed: the INSERT ... ON CONFLICT statement
+    """
+    cols = sql.SQL(", ").join(map(sql.Identifier, columns))
+    keys = sql.SQL(", ").join(map(sql.Identifier, KEY_COLUMNS))
+    values = [col for col in columns if col not in KEY_COLUMNS]
+    return sql.SQL(
+        "INSERT INTO {target} ({cols}) "
+        "SELECT DISTINCT ON ({keys}) {cols} FROM {staging} "
+        "ORDER BY {keys}, ctid DESC "
+        "ON CONFLICT ({keys}) DO UPDATE SET {updates} "
+        "WHERE ({current}) IS DISTINCT FROM ({excluded})"
+    ).format(
+        target=sql.Identifier(schema, table),
+        staging=sql.Identifier("pg_temp", STAGING_TABLE),
+        cols=cols,
+        keys=keys,
+        updates=sql.SQL(", ").join(
+            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(col))
+            for col in values
+        ),
+        current=sql.SQL(", ").join(
+            sql.Identifier(table, col) for col in values
+        ),
+        excluded=sql.SQL(", ").join(
+            sql.SQL("EXCLUDED.{}").format(sql.Identifier(col))
+            for col in values
+        ),
+    )
+
+
+def upsert_table(engine: Engine,
+                 data: pd.DataFrame,
+                 table: str,
+                 schema: str,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 lookback_months: int = 0
+                 ) -> Tuple[int, Optional[Tuple[int, int]]]:
+    """
+    Incrementally load a DataFrame into the target table.
+
+    Only the periods from the stored watermark onwards are sent. The latest
+    loaded month is sent again, as BTS revises it, along with the
+    `lookback_months` months before it. Revisions of earlier months are
+    not picked up, they need a replace load. The rows are copied into
+    a temporary staging table and merged with INSERT ... ON CONFLICT on
+    KEY_COLUMNS, then the watermark moves to the newest period in data.
+
+    Args:
+        engine: SQLAlchemy database engine using the psycopg driver
+        data: merged DataFrame containing KEY_COLUMNS
+        table: name of the target table
+        schema: schema of the target and watermark tables
+        batch_size: rows sent per COPY write
+        lookback_months: months before the watermark to send again
+
+    Returns:
+        tuple[int, tuple[int, int] | None]: number of rows inserted or
+        changed, and the first period sent, None if every row was sent
+    """
+    with engine.begin() as conn:
+        raw_conn = conn.connection.driver_connection
+        with raw_conn.cursor() as cursor:
+            _ensure_tables(cursor, data, table, schema)
+            watermark = read_watermark(cursor, table, schema)
+
+            since = None if watermark is None else \
+                start_period(watermark, lookback_months)
+            data = rows_since(data, since)
+            if data.empty:
+                logger.info(f"No new periods to load since {watermark}")
+                return 0, since
+
+            cursor.execute(sql.SQL(
+                "CREATE TEMP TABLE {} (LIKE {}) ON COMMIT DROP"
+            ).format(sql.Identifier(STAGING_TABLE),
+                     sql.Identifier(schema, table)))
+            copy_dataframe(raw_conn, data, STAGING_TABLE, "pg_temp",
+                           batch_size)
+
+            cursor.execute(build_upsert(list(data.columns), table, schema))
+            changed_rows = cursor.rowcount
+
+            period = data["year"] * 100 + data["month"]
+            latest = divmod(int(period.max()), 100)
+            _write_watermark(cursor, table, schema, latest)
+
+    logger.info(f"Upserted {changed_rows} of {len(data)} rows since "
+                f"{watermark}, watermark now {latest}")
+    return changed_rows, since
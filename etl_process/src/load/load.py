@@ -1,12 +1,62 @@
+from pathlib import Path
+from typing import Iterable
 import pandas as pd
-from src.load.load_database import load_to_database
+from src.load.load_database import (
+    load_chunks_to_database,
+    load_parquet_to_database,
+    load_to_database,
+)
 from src.utils.logging_utils import setup_logger
 import logging
 
 logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
 
 
-def load_main(data: pd.DataFrame):
+def load_main(data: pd.DataFrame, mode: str = "replace",
+              workers: int = 1, lookback_months: int = 0) -> bool:
+    """
+        Runs the load phase
 
-    logger.info("Started load to database")
-    load_to_database(data)
+        args:
+            data: merged data to load
+            mode: "replace" to recreate the table or "incremental" to upsert
+            only new and changed rows
+            workers: number of concurrent COPY streams of a replace load
+            lookback_months: months before the last loaded one that an
+            incremental load sends again
+
+        returns:
+            bool: True if the data was loaded and validated
+    """
+    logger.info(f"Started {mode} load to database")
+    return load_to_database(data, mode=mode, workers=workers,
+                            lookback_months=lookback_months)
+
+
+def load_file_main(path: Path) -> bool:
+    """
+        Runs the load phase from a Parquet file, streamed in batches
+
+        args:
+            path: Parquet file holding the merged data
+
+        returns:
+            bool: True if the data was loaded and validated
+    """
+    logger.info(f"Started replace load to database from {path}")
+    return load_parquet_to_database(path)
+
+
+def load_stream_main(chunks: Iterable[pd.DataFrame]) -> bool:
+    """
+        Runs the load phase from a stream of merged chunks, copied while the
+        next chunks are extracted and transformed
+
+        args:
+            chunks: merged chunks, see transform_chunks
+
+        returns:
+            bool: True if the data was loaded and validated
+    """
+    logger.info("Started streamed replace load to database")
+    return load_chunks_to_database(chunks)
@@ -1,79 +1,260 @@
-
-
 from pathlib import Path
+from typing import Iterable
 import pandas as pd
+import pyarrow.parquet as pq
 from sqlalchemy import Engine, create_engine
 from config.db_config import load_db_config
+from src.load.copy_loader import (
+    DEFAULT_BATCH_SIZE,
+    copy_batches,
+    copy_dataframe,
+)
+from src.load.incremental import (
+    KEY_COLUMNS,
+    rows_since,
+    sync_watermark,
+    upsert_table,
+)
+from src.load.parallel_loader import parallel_copy
+from src.load.shadow_table import (
+    create_shadow_table,
+    shadow_name,
+    swap_in_shadow,
+)
+from src.load.stream_loader import DEFAULT_QUEUE_SIZE, stream_copy
+from src.load.validation import (
+    Checksums,
+    frame_checksums,
+    track_batches,
+    track_frames,
+    validate_load,
+)
 from src.utils.logging_utils import setup_logger
 import logging
 
 logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
 
 
-def load_to_database(data: pd.DataFrame) -> bool:
+TABLE_NAME = "sam_capstone"
+SCHEMA_NAME = "de_2506_a"
+LOAD_MODES = ["replace", "incremental"]
+
+
+def create_db_engine(**engine_options) -> Engine:
+    """
+    Create a SQLAlchemy engine for the target database using the psycopg 3
+    driver, which is required for COPY.
+
+    Args:
+        **engine_options: Passed to create_engine, e.g. pool_size
+
+    Returns:
+        Engine: engine connected to the target database
+    """
+    config = load_db_config()
+    db_config = config["target_database"]
+
+    return create_engine(
+        f"postgresql+psycopg://{db_config['user']}:{db_config['password']}@"
+        f"{db_config['host']}:{db_config['port']}/{db_config['dbname']}",
+        **engine_options
+    )
+
+
+def load_to_database(data: pd.DataFrame,
+                     method: str = "copy",
+                     batch_size: int = DEFAULT_BATCH_SIZE,
+                     mode: str = "replace",
+                     workers: int = 1,
+                     lookback_months: int = 0) -> bool:
     """
     Load DataFrame to PostgreSQL database.
 
     Args:
         data: DataFrame to load
+        method: "copy" to stream rows with COPY FROM STDIN, or "insert" to
+          use DataFrame.to_sql. Ignored in incremental mode, which always
+          uses COPY
+        batch_size: rows sent per COPY write or INSERT batch
+        mode: "replace" to recreate the table, or "incremental" to upsert
+          the periods since the last load
+        workers: number of concurrent COPY streams of a replace with
+          method "copy", see parallel_copy
+        lookback_months: months before the watermark an incremental load
+          sends again, see upsert_table
 
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        config = load_db_config()
-        db_config = config["target_database"]
-
-        engine = create_engine(
-            f"postgresql://{db_config['user']}:{db_config['password']}@"
-            f"{db_config['host']}:{db_config['port']}/{db_config['dbname']}"
-        )
-
-        subset = data.head(10000)  # limit upload to 10000 records
-        subset.to_sql("sam_capstone",
-                      engine,
-                      index=False,
-                      schema="de_2506_a",
-                      if_exists="replace")
-        logger.info(f"Loaded {len(subset)} rows to database")
-
-        # validate database shape
-        return execute_sql(engine, "count_records", len(subset)) and \
-            execute_sql(engine, "count_columns", len(subset.columns))
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode: {mode}")
+        # one pooled connection per COPY stream
+        engine = create_db_engine(pool_size=max(workers, 5))
+
+        since = None
+        if mode == "incremental":
+            _, since = upsert_table(engine, data, TABLE_NAME, SCHEMA_NAME,
+                                    batch_size, lookback_months)
+            # only the periods sent are checked, one row per key as kept
+            # by build_upsert
+            expected = frame_checksums(rows_since(data, since)
+                                       .drop_duplicates(KEY_COLUMNS,
+                                                        keep="last"))
+        else:
+            rows = write_table(engine, data, method, batch_size, workers)
+            logger.info(f"Loaded {rows} rows to database")
+            sync_watermark(engine, TABLE_NAME, SCHEMA_NAME,
+                           list(data.columns))
+            expected = frame_checksums(data)
+
+        return validate_load(engine, expected, TABLE_NAME, SCHEMA_NAME,
+                             since)
 
     except Exception as e:
         logger.error(f"Database loading failed - {e}")
         return False
 
 
-def execute_sql(engine: Engine, file_name: str, expected_result) -> bool:
+def write_table(engine: Engine,
+                data: pd.DataFrame,
+                method: str = "copy",
+                batch_size: int = DEFAULT_BATCH_SIZE,
+                workers: int = 1) -> int:
     """
-    Execute SQL query from file and validate result against expected value.
+    Replace the target table with the contents of a DataFrame.
+
+    The rows are written to a shadow table, which is indexed, analyzed and
+    then swapped in for the target (see swap_in_shadow), so the dashboard
+    keeps reading the previous table for the length of the load.
+
+    With method "copy" the shadow table gets column types derived from the
+    DataFrame dtypes and is filled with COPY, all in one transaction. With
+    more than one worker the rows are split by year into that many COPY
+    streams, see parallel_copy.
 
     Args:
         engine: SQLAlchemy database engine
-        file_name: Name of SQL file (without .sql extension) in src/sql
-          directory
-        expected_result: Expected query result value for validation
+        data: DataFrame to write
+        method: "copy" or "insert"
+        batch_size: rows sent per COPY write or INSERT batch
+        workers: number of concurrent COPY streams
+
+    Returns:
+        int: number of rows written
+
+    Raises:
+        ValueError: If the method is not supported
+    """
+    if method == "copy" and workers > 1:
+        return parallel_copy(engine, data, TABLE_NAME, SCHEMA_NAME, workers,
+                             batch_size)
+    if method == "copy":
+        with engine.begin() as conn:
+            raw_conn = conn.connection.driver_connection
+            with raw_conn.cursor() as cursor:
+                shadow = create_shadow_table(cursor, data, TABLE_NAME,
+                                             SCHEMA_NAME)
+            rows = copy_dataframe(raw_conn, data, shadow, SCHEMA_NAME,
+                                  batch_size)
+            with raw_conn.cursor() as cursor:
+                swap_in_shadow(cursor, TABLE_NAME, SCHEMA_NAME,
+                               list(data.columns))
+        return rows
+    if method == "insert":
+        data.to_sql(shadow_name(TABLE_NAME),
+                    engine,
+                    index=False,
+                    schema=SCHEMA_NAME,
+                    if_exists="replace",
+                    chunksize=batch_size)
+        with engine.begin() as conn:
+            with conn.connection.driver_connection.cursor() as cursor:
+                swap_in_shadow(cursor, TABLE_NAME, SCHEMA_NAME,
+                               list(data.columns))
+        return len(data)
+    raise ValueError(f"Unknown load method: {method}")
+
+
+def load_parquet_to_database(path: Path,
+                             batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+    """
+    Replace the target table with the contents of a Parquet file, reading
+    and copying it one record batch at a time so memory use does not grow
+    with the file. The rows go to a shadow table that is swapped in once
+    complete, as in write_table. The checksums the table is validated
+    against are added up from the same batches.
+
+    Args:
+        path: Parquet file, e.g. written by the DuckDB engine
+        batch_size: rows read and sent per COPY write
 
     Returns:
-        bool: True if query result matches expected value, False otherwise
+        bool: True if successful, False otherwise
     """
+    try:
+        parquet_file = pq.ParquetFile(path)
+        # Empty frame with the file's dtypes, to derive the column types
+        empty = parquet_file.schema_arrow.empty_table().to_pandas()
+        expected = frame_checksums(empty)
+        engine = create_db_engine()
+        with engine.begin() as conn:
+            raw_conn = conn.connection.driver_connection
+            with raw_conn.cursor() as cursor:
+                shadow = create_shadow_table(cursor, empty, TABLE_NAME,
+                                             SCHEMA_NAME)
+            rows = copy_batches(raw_conn,
+                                track_batches(
+                                    parquet_file.iter_batches(batch_size),
+                                    expected),
+                                list(empty.columns), shadow, SCHEMA_NAME)
+            with raw_conn.cursor() as cursor:
+                swap_in_shadow(cursor, TABLE_NAME, SCHEMA_NAME,
+                               list(empty.columns))
+        logger.info(f"Loaded {rows} rows to database from {path.name}")
+        sync_watermark(engine, TABLE_NAME, SCHEMA_NAME, list(empty.columns))
 
-    current_dir = Path(__file__).parent
-    sql_file = current_dir.parent / "sql" / f"{file_name}.sql"
-    if not sql_file.exists():
-        logger.error(f"Sql file {file_name} not found")
+        return validate_load(engine, expected, TABLE_NAME, SCHEMA_NAME)
+
+    except Exception as e:
+        logger.error(f"Database loading failed - {e}")
         return False
-    with open(sql_file, "r") as query_file:
-        query = query_file.read()
-    output = pd.read_sql_query(query, engine).iloc[0]['result']
 
-    if output != expected_result:
-        logger.error(f"Expected: {expected_result},"
-                     f"Got: {output}")
+
+def load_chunks_to_database(chunks: Iterable[pd.DataFrame],
+                            batch_size: int = DEFAULT_BATCH_SIZE,
+                            queue_size: int = DEFAULT_QUEUE_SIZE) -> bool:
+    """
+    Replace the target table with a stream of DataFrame chunks, copied by a
+    loader thread while the next chunks are produced, see stream_copy. The
+    checksums the table is validated against are added up chunk by chunk.
+    An empty stream leaves the table unchanged and is not validated.
+
+    Args:
+        chunks: DataFrames with the same columns and dtypes, e.g. from
+          transform_chunks
+        batch_size: rows sent per COPY write
+        queue_size: chunks waiting to be copied, at most
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        expected = Checksums()
+        engine = create_db_engine()
+        rows = stream_copy(engine, track_frames(chunks, expected),
+                           TABLE_NAME, SCHEMA_NAME, batch_size, queue_size)
+        if not expected.columns:
+            # no chunk at all, stream_copy left the table as it was
+            return True
+        logger.info(f"Loaded {rows} rows to database")
+        sync_watermark(engine, TABLE_NAME, SCHEMA_NAME, list(expected.nulls))
+
+        return validate_load(engine, expected, TABLE_NAME, SCHEMA_NAME)
+
+    except Exception as e:
+        logger.error(f"Database loading failed - {e}")
         return False
-    return True
 
 
 if __name__ == "__main__":
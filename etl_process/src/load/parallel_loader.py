@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from typing import List
+import pandas as pd
+from sqlalchemy import Engine
+from src.load.copy_loader import DEFAULT_BATCH_SIZE, copy_dataframe
+from src.load.shadow_table import (
+    create_shadow_table,
+    drop_table,
+    swap_in_shadow,
+)
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
+
+
+def split_by_year(data: pd.DataFrame, streams: int) -> List[pd.DataFrame]:
+    """
+    Split a DataFrame into at most `streams` parts of whole years, with
+    balanced row counts. Years are assigned largest first to the part
+    holding the fewest rows so far.
+
+    Args:
+        data: DataFrame with a year column
+        streams: maximum number of parts
+
+    Returns:
+        list[pd.DataFrame]: non-empty parts, together holding every row
+    """
+    if streams < 1:
+        raise ValueError(f"streams must be positive, got {streams}")
+    # rows without a year are a bucket of their own, not dropped
+    year_rows = data["year"].value_counts(dropna=False)
+    parts = min(streams, len(year_rows))
+    buckets: List[List[int]] = [[] for _ in range(parts)]
+    bucket_rows = [0] * parts
+    for year, rows in year_rows.items():
+        smallest = bucket_rows.index(min(bucket_rows))
+        buckets[smallest].append(year)
+        bucket_rows[smallest] += rows
+    missing = data["year"].isna()
+    return [data[data["year"].isin(years) | (missing & pd.isna(years).any())]
+            for years in buckets]
+
+
+def _copy_stream(engine: Engine, part: pd.DataFrame, table: str,
+                 schema: str, batch_size: int) -> int:
+    """Copy one part over its own pooled connection and commit it."""
+    with engine.begin() as conn:
+        return copy_dataframe(conn.connection.driver_connection, part,
+                              table, schema, batch_size)
+
+
+def parallel_copy(engine: Engine,
+                  data: pd.DataFrame,
+                  table: str,
+                  schema: str,
+                  streams: int,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Replace a table with the contents of a DataFrame, sent as concurrent
+    COPY streams of whole years into its shadow table.
+
+    Each stream uses its own pooled connection, so the engine pool must
+    allow `streams` connections. Once every stream has committed, the
+    shadow table is indexed and swapped in for the target in one
+    transaction, see swap_in_shadow: readers see the old table until the
+    swap and the new one after it, never a partial load. If a stream fails
+    the target is left untouched.
+
+    Args:
+        engine: SQLAlchemy engine using the psycopg driver
+        data: DataFrame with a year column to load
+        table: name of the target table
+        schema: schema of the target table
+        streams: number of concurrent COPY streams
+        batch_size: rows serialised per COPY write
+
+    Returns:
+        int: number of rows loaded
+    """
+    parts = split_by_year(data, streams)
+
+    with engine.begin() as conn:
+        with conn.connection.driver_connection.cursor() as cursor:
+            shadow = create_shadow_table(cursor, data, table, schema)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(parts), 1),
+                                thread_name_prefix="copy") as executor:
+            # Copied contexts keep the streams' stages under the caller's
+            futures = [executor.submit(contextvars.copy_context().run,
+                                       _copy_stream, engine, part, shadow,
+                                       schema, batch_size)
+                       for part in parts]
+            rows = sum(future.result() for future in futures)
+    except Exception:
+        with engine.begin() as conn:
+            with conn.connection.driver_connection.cursor() as cursor:
+                drop_table(cursor, shadow, schema)
+        raise
+
+    with engine.begin() as conn:
+        with conn.connection.driver_connection.cursor() as cursor:
+            swap_in_shadow(cursor, table, schema, list(data.columns))
+    logger.info(f"Loaded {rows} rows to {schema}.{table} over "
+                f"{len(parts)} COPY streams")
+    return rows
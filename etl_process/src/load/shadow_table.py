@@ -0,0 +1,87 @@
+import pandas as pd
+from psycopg import Cursor, sql
+from src.load.copy_loader import build_create_table
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
+
+# Suffix of the table a replace load fills before it is swapped in
+SHADOW_SUFFIX = "_shadow"
+# Columns the dashboard filters and groups by, indexed after the load
+INDEX_COLUMNS = ["year", "state", "carrier", "iata"]
+
+
+def shadow_name(table: str) -> str:
+    """Name of the shadow table of a table."""
+    return table + SHADOW_SUFFIX
+
+
+def _index_name(table: str, column: str) -> str:
+    return f"{table}_{column}_idx"
+
+
+def create_shadow_table(cursor: Cursor, data: pd.DataFrame,
+                        table: str, schema: str) -> str:
+    """
+    Recreate the empty shadow table of a table, with the columns of a
+    DataFrame. The live table is not touched.
+
+    Args:
+        cursor: open psycopg cursor
+        data: DataFrame whose dtypes define the table
+        table: name of the live table
+        schema: schema of both tables
+
+    Returns:
+        str: name of the shadow table
+    """
+    shadow = shadow_name(table)
+    drop_table(cursor, shadow, schema)
+    cursor.execute(build_create_table(data, shadow, schema))
+    return shadow
+
+
+def drop_table(cursor: Cursor, table: str, schema: str) -> None:
+    """Drop a table if it exists."""
+    cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(
+        sql.Identifier(schema, table)))
+
+
+def swap_in_shadow(cursor: Cursor, table: str, schema: str,
+                   columns: "list[str]") -> None:
+    """
+    Index and analyze the filled shadow table, then replace the live table
+    with it.
+
+    Building the indexes once the rows are in is much faster than keeping
+    them up to date row by row, and ANALYZE gives the planner statistics
+    before the first query. Only the final drop and renames take a lock on
+    the live table, so when run in the caller's transaction, readers see
+    the old table until it commits and the complete new one after.
+
+    Args:
+        cursor: open psycopg cursor, the caller owns the transaction
+        table: name of the live table
+        schema: schema of both tables
+        columns: columns of the shadow table, those in INDEX_COLUMNS are
+          indexed
+    """
+    shadow = shadow_name(table)
+    indexed = [col for col in INDEX_COLUMNS if col in columns]
+    for col in indexed:
+        cursor.execute(sql.SQL("CREATE INDEX {} ON {} ({})").format(
+            sql.Identifier(_index_name(shadow, col)),
+            sql.Identifier(schema, shadow), sql.Identifier(col)))
+    cursor.execute(sql.SQL("ANALYZE {}").format(
+        sql.Identifier(schema, shadow)))
+
+    drop_table(cursor, table, schema)
+    cursor.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(
+        sql.Identifier(schema, shadow), sql.Identifier(table)))
+    for col in indexed:
+        cursor.execute(sql.SQL("ALTER INDEX {} RENAME TO {}").format(
+            sql.Identifier(schema, _index_name(shadow, col)),
+            sql.Identifier(_index_name(table, col))))
+    logger.info(f"Swapped {schema}.{shadow} in as {schema}.{table}, "
+                f"indexed on {indexed}")
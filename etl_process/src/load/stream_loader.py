@@ -0,0 +1,118 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+import queue
+from typing import Iterable
+import pandas as pd
+from sqlalchemy import Engine
+from src.load.copy_loader import DEFAULT_BATCH_SIZE, copy_dataframe
+from src.load.shadow_table import create_shadow_table, swap_in_shadow
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
+
+# Chunks produced but not yet copied, bounding the memory of the handoff
+DEFAULT_QUEUE_SIZE = 2
+# Put on the queue after the last chunk, or instead when production fails
+_DONE = object()
+_FAILED = object()
+
+
+class StreamAborted(Exception):
+    """The producer of a streamed load failed, the load is rolled back."""
+
+
+def _put(chunks: queue.Queue, item, loader: Future) -> None:
+    """Queue an item, giving up if the loader has stopped taking them."""
+    while True:
+        try:
+            chunks.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            if loader.done():
+                return
+
+
+def _copy_chunks(engine: Engine, chunks: queue.Queue, table: str,
+                 schema: str, batch_size: int) -> int:
+    """
+    Copy queued chunks into the shadow table and swap it in, in one
+    transaction, until _DONE. The shadow table takes the columns of the
+    first chunk.
+    """
+    rows = 0
+    with engine.begin() as conn:
+        raw_conn = conn.connection.driver_connection
+        chunk = chunks.get()
+        if chunk is _DONE:
+            logger.warning(f"No chunks to load, {schema}.{table} unchanged")
+            return 0
+        if chunk is _FAILED:
+            raise StreamAborted(f"Load of {schema}.{table} aborted")
+        columns = list(chunk.columns)
+        with raw_conn.cursor() as cursor:
+            shadow = create_shadow_table(cursor, chunk, table, schema)
+        while chunk is not _DONE:
+            if chunk is _FAILED:
+                # leaving the transaction rolls back the shadow table
+                raise StreamAborted(f"Load of {schema}.{table} aborted")
+            rows += copy_dataframe(raw_conn, chunk, shadow, schema,
+                                   batch_size)
+            chunk = chunks.get()
+        with raw_conn.cursor() as cursor:
+            swap_in_shadow(cursor, table, schema, columns)
+    return rows
+
+
+def stream_copy(engine: Engine,
+                chunks: Iterable[pd.DataFrame],
+                table: str,
+                schema: str,
+                batch_size: int = DEFAULT_BATCH_SIZE,
+                queue_size: int = DEFAULT_QUEUE_SIZE) -> int:
+    """
+    Replace a table with a stream of DataFrame chunks, copying each chunk
+    while the next ones are produced.
+
+    The chunks are pulled from the iterable in the calling thread and handed
+    to a loader thread through a queue of at most `queue_size` chunks, so
+    producing (parsing, cleaning) overlaps with COPY, which waits on the
+    network and the database. When the loader falls behind, the producer
+    blocks instead of building up chunks. The loader fills the shadow table
+    in a single transaction and swaps it in once the stream is exhausted,
+    see swap_in_shadow. If producing or copying fails, the transaction is
+    rolled back and the target is left untouched.
+
+    Args:
+        engine: SQLAlchemy engine using the psycopg driver
+        chunks: DataFrames with the same columns and dtypes
+        table: name of the target table
+        schema: schema of the target table
+        batch_size: rows serialised per COPY write
+        queue_size: chunks waiting to be copied, at most
+
+    Returns:
+        int: number of rows loaded
+    """
+    if queue_size < 1:
+        raise ValueError(f"queue_size must be positive, got {queue_size}")
+    pending: queue.Queue = queue.Queue(maxsize=queue_size)
+    with ThreadPoolExecutor(max_workers=1,
+                            thread_name_prefix="copy") as executor:
+        # The copy stages are nested under the caller's in the run report
+        loader = executor.submit(contextvars.copy_context().run,
+                                 _copy_chunks, engine, pending, table,
+                                 schema, batch_size)
+        try:
+            for chunk in chunks:
+                if loader.done():
+                    break
+                _put(pending, chunk, loader)
+        except BaseException:
+            _put(pending, _FAILED, loader)
+            raise
+        _put(pending, _DONE, loader)
+        # re-raises any error of the loader thread
+        rows = loader.result()
+    logger.info(f"Streamed {rows} rows to {schema}.{table}")
+    return rows
@@ -0,0 +1,277 @@
+from dataclasses import dataclass, field
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from psycopg import sql
+from sqlalchemy import Engine
+from src.utils.instrumentation import stage
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
+
+# Columns summed on both sides, when present
+SUM_COLUMNS = ["total_ct", "arr_flights"]
+# Column whose values are counted separately
+GROUP_COLUMN = "year"
+# Columns of the (year, month) period an incremental load is checked from
+PERIOD_COLUMNS = ["year", "month"]
+
+
+@dataclass
+class Checksums:
+    """
+    Aggregates of a loaded table, computed once from the data in process and
+    once from the database. Sums are compared with a relative tolerance, as
+    the database adds floats in a different order.
+    """
+    rows: int = 0
+    columns: int = 0
+    year_rows: Dict[Optional[int], int] = field(default_factory=dict)
+    sums: Dict[str, float] = field(default_factory=dict)
+    nulls: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, other: "Checksums") -> None:
+        """Add the checksums of more rows of the same table."""
+        self.rows += other.rows
+        self.columns = other.columns
+        for totals, values in [(self.year_rows, other.year_rows),
+                               (self.sums, other.sums),
+                               (self.nulls, other.nulls)]:
+            for key, value in values.items():
+                totals[key] = totals.get(key, 0) + value
+
+
+def _year(value) -> Optional[int]:
+    return None if pd.isna(value) else int(value)
+
+
+def frame_checksums(data: pd.DataFrame,
+                    sum_columns: "list[str]" = SUM_COLUMNS) -> Checksums:
+    """
+    Compute the checksums of a DataFrame as it should appear once loaded.
+
+    Args:
+        data: DataFrame being loaded
+        sum_columns: columns to sum, those missing from data are skipped
+
+    Returns:
+        Checksums: expected aggregates of the loaded table
+    """
+    checksums = Checksums(
+        rows=len(data),
+        columns=len(data.columns),
+        sums={col: float(data[col].sum())
+              for col in sum_columns if col in data.columns},
+        nulls={str(col): int(count)
+               for col, count in data.isna().sum().items()},
+    )
+    if GROUP_COLUMN in data.columns:
+        counts = data[GROUP_COLUMN].value_counts(dropna=False)
+        checksums.year_rows = {_year(year): int(rows)
+                               for year, rows in counts.items()}
+    return checksums
+
+
+def track_batches(batches: Iterable[pa.RecordBatch],
+                  checksums: Checksums) -> Iterator[pa.RecordBatch]:
+    """
+    Pass record batches through, adding each one to a running checksum, so
+    a streamed load is checked without reading its source twice.
+
+    Args:
+        batches: record batches being loaded
+        checksums: checksums of the batches so far, e.g. frame_checksums of
+          an empty frame with the source schema, updated in place
+
+    Yields:
+        pa.RecordBatch: the batches, unchanged
+    """
+    for batch in batches:
+        checksums.rows += batch.num_rows
+        for name, column in zip(batch.schema.names, batch.columns):
+            checksums.nulls[name] = \
+                checksums.nulls.get(name, 0) + column.null_count
+            if name in checksums.sums:
+                checksums.sums[name] += pc.sum(column).as_py() or 0
+        if GROUP_COLUMN in batch.schema.names:
+            for count in pc.value_counts(batch.column(GROUP_COLUMN)) \
+                    .to_pylist():
+                year = count["values"]
+                checksums.year_rows[year] = \
+                    checksums.year_rows.get(year, 0) + count["counts"]
+        yield batch
+
+
+def track_frames(frames: Iterable[pd.DataFrame],
+                 checksums: Checksums) -> Iterator[pd.DataFrame]:
+    """
+    Pass DataFrames through, adding the checksums of each one to a running
+    total, like track_batches.
+
+    Args:
+        frames: chunks of the data being loaded
+        checksums: checksums of the chunks so far, updated in place
+
+    Yields:
+        pd.DataFrame: the chunks, unchanged
+    """
+    for frame in frames:
+        checksums.add(frame_checksums(frame))
+        yield frame
+
+
+def build_validation_query(columns: "list[str]",
+                           table: str,
+                           schema: str,
+                           sum_columns: "list[str]",
+                           since: bool = False) -> sql.Composed:
+    """
+    Build one statement returning every checksum of a table.
+
+    The table is scanned once, grouped by year when it has a year column,
+    and the row counts, sums and null counts of the groups are added up by
+    fetch_checksums. The column count is joined onto every group, so an
+    empty table still returns one row.
+
+    Args:
+        columns: columns of the table
+        table: name of the table
+        schema: schema of the table
+        sum_columns: columns to sum, a subset of columns
+        since: only check the rows from a (year, month) onwards
+
+    Returns:
+        sql.Composed: the SELECT, taking the schema and table name, then
+        the year and month when since is set, as parameters
+    """
+    grouped = GROUP_COLUMN in columns
+    aggregates = [sql.SQL("COUNT(*)")]
+    aggregates += [sql.SQL("SUM({})").format(sql.Identifier(col))
+                   for col in sum_columns]
+    aggregates += [sql.SQL("COUNT(*) - COUNT({})").format(sql.Identifier(col))
+                   for col in columns]
+    return sql.SQL(
+        "SELECT c.n, t.* FROM ("
+        "SELECT COUNT(*) AS n FROM information_schema.columns "
+        "WHERE table_schema = %s AND table_name = %s) AS c "
+        "LEFT JOIN (SELECT {group}, {aggregates} FROM {table}{where}"
+        "{group_by}) AS t ON true"
+    ).format(
+        group=sql.Identifier(GROUP_COLUMN) if grouped else sql.SQL("NULL"),
+        aggregates=sql.SQL(", ").join(aggregates),
+        table=sql.Identifier(schema, table),
+        where=sql.SQL(" WHERE ({}) >= (%s, %s)").format(
+            sql.SQL(", ").join(map(sql.Identifier, PERIOD_COLUMNS)))
+        if since else sql.SQL(""),
+        group_by=sql.SQL(" GROUP BY {}").format(sql.Identifier(GROUP_COLUMN))
+        if grouped else sql.SQL(""),
+    )
+
+
+def fetch_checksums(engine: Engine,
+                    columns: "list[str]",
+                    table: str,
+                    schema: str,
+                    sum_columns: "list[str]" = SUM_COLUMNS,
+                    since: Optional[Tuple[int, int]] = None) -> Checksums:
+    """
+    Compute the checksums of a loaded table in a single round trip.
+
+    Args:
+        engine: SQLAlchemy engine using the psycopg driver
+        columns: columns expected in the table
+        table: name of the table
+        schema: schema of the table
+        sum_columns: columns to sum, those missing from columns are skipped
+        since: first (year, month) to check, None checks every row
+
+    Returns:
+        Checksums: aggregates of the table
+    """
+    sum_columns = [col for col in sum_columns if col in columns]
+    query = build_validation_query(columns, table, schema, sum_columns,
+                                   since is not None)
+    params = (schema, table) + tuple(map(int, since or ()))
+    with engine.connect() as conn:
+        with conn.connection.driver_connection.cursor() as cursor:
+            cursor.execute(query, params)
+            groups = cursor.fetchall()
+
+    checksums = Checksums(
+        columns=groups[0][0],
+        sums=dict.fromkeys(sum_columns, 0.0),
+        nulls=dict.fromkeys(columns, 0),
+    )
+    for n_columns, year, rows, *values in groups:
+        if rows is None:  # empty grouped table
+            continue
+        checksums.rows += rows
+        if GROUP_COLUMN in columns:
+            checksums.year_rows[year] = rows
+        for col, value in zip(sum_columns, values):
+            checksums.sums[col] += float(value or 0)
+        for col, nulls in zip(columns, values[len(sum_columns):]):
+            checksums.nulls[col] += nulls
+    return checksums
+
+
+def compare_checksums(expected: Checksums, actual: Checksums) -> List[str]:
+    """
+    List the differences between two sets of checksums.
+
+    Args:
+        expected: checksums of the data that was loaded
+        actual: checksums of the table
+
+    Returns:
+        list[str]: one message per mismatch, empty if they agree
+    """
+    mismatches = [
+        f"{name}: expected {want}, got {got}"
+        for name, want, got in [
+            ("rows", expected.rows, actual.rows),
+            ("columns", expected.columns, actual.columns),
+            ("rows per year", expected.year_rows, actual.year_rows),
+            ("nulls", expected.nulls, actual.nulls),
+        ]
+        if want != got
+    ]
+    for col, want in expected.sums.items():
+        got = actual.sums.get(col)
+        if got is None or not math.isclose(want, got, rel_tol=1e-9):
+            mismatches.append(f"sum of {col}: expected {want}, got {got}")
+    return mismatches
+
+
+def validate_load(engine: Engine,
+                  expected: Checksums,
+                  table: str,
+                  schema: str,
+                  since: Optional[Tuple[int, int]] = None) -> bool:
+    """
+    Check a loaded table against the checksums of the data sent to it,
+    with one query, see build_validation_query.
+
+    Args:
+        engine: SQLAlchemy engine using the psycopg driver
+        expected: checksums of the loaded data, see frame_checksums
+        table: name of the table
+        schema: schema of the table
+        since: first (year, month) sent by an incremental load, the
+          earlier rows of the table are not checked
+
+    Returns:
+        bool: True if every checksum matches, False otherwise
+    """
+    with stage("validate", rows_in=expected.rows):
+        actual = fetch_checksums(engine, list(expected.nulls), table, schema,
+                                 list(expected.sums), since)
+    mismatches = compare_checksums(expected, actual)
+    for mismatch in mismatches:
+        logger.error(f"Validation of {schema}.{table} failed - {mismatch}")
+    if not mismatches:
+        logger.info(f"Validated {actual.rows} rows of {schema}.{table}")
+    return not mismatches
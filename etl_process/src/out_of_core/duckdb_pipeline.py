@@ -0,0 +1,243 @@
+import os
+from pathlib import Path
+import shutil
+import duckdb
+from config.transform_config import AIRPORT_CONFIG, DELAY_CONFIG
+from src.extract.get_delay_data import EXPECTED_SCHEMA
+from src.transform.aggregate import ROLLUPS
+from src.utils.get_data import _raw_path
+from src.utils.logging_utils import setup_logger
+from src.utils.post_data import DATA_DIR
+import logging
+import timeit
+
+logger = setup_logger(__name__, "etl_pipeline.log", level=logging.DEBUG)
+
+# DuckDB spills to disk above this, so memory stays flat as the history
+# grows
+MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT", "1GB")
+SPILL_DIR = DATA_DIR / "cache" / "duckdb_spill"
+
+AIRPORT_COLUMNS = ["name", "city", "iata", "lat", "lon", "alt"]
+# Delay columns dropped from the merged output
+DROPPED_COLUMNS = ["arr_del15", "airport_name", "airport"]
+# Strings pd.read_csv parses as null by default, so both engines read the
+# same nulls
+NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN",
+             "-nan", "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN",
+             "None", "n/a", "nan", "null"]
+# SQL type per col_types key, matching the Transformer dtypes
+SQL_TYPES = {
+    "str_cols": "VARCHAR",
+    "int_cols": "BIGINT",
+    "float_cols": "DOUBLE",
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(path: Path) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def clean_columns(config: dict, columns: "list[str]") -> "list[str]":
+    """
+        SELECT expressions filling and casting every column the way
+        Transformer.clean does: nulls become 'N/A' or 0 and integer columns
+        are truncated like pandas' astype.
+
+        Args:
+            config: AIRPORT_CONFIG or DELAY_CONFIG
+            columns: columns to select, in output order
+
+        Returns:
+            list[str]: one SQL expression per column
+    """
+    col_types = {col: key for key, cols in config["col_types"].items()
+                 for col in cols}
+    expressions = []
+    for col in columns:
+        name = _quote(col)
+        key = col_types.get(col)
+        if key == "str_cols":
+            expression = f"coalesce({name}, 'N/A')"
+        elif key == "int_cols":
+            expression = f"CAST(trunc(coalesce({name}, 0)) AS BIGINT)"
+        elif key == "float_cols":
+            expression = f"CAST(coalesce({name}, 0) AS DOUBLE)"
+        else:
+            expression = name
+        expressions.append(f"{expression} AS {name}")
+    return expressions
+
+
+def _not_null(config: dict) -> str:
+    return " AND ".join(f"{_quote(col)} IS NOT NULL"
+                        for col in config["crit_cols"])
+
+
+def _null_strings(*extra: str) -> str:
+    return "[" + ", ".join("'" + value.replace("'", "''") + "'"
+                           for value in NA_VALUES + list(extra)) + "]"
+
+
+def _read_types(config: dict) -> str:
+    """read_csv types struct for the typed columns of a config."""
+    return "{" + ", ".join(
+        f"'{col}': '{SQL_TYPES['float_cols' if key == 'int_cols' else key]}'"
+        for key, cols in config["col_types"].items() for col in cols
+    ) + "}"
+
+
+def build_merge_query(airports_csv: Path, delay_csv: Path) -> str:
+    """
+        Build the query producing merge_main's output straight from the raw
+        CSV files: extraction filters, Transformer.clean (duplicates,
+        critical nulls, fills and casts), the IATA join and the state,
+        total_ct and arr_flights_pct derivations.
+
+        Every step is a streaming scan, hash aggregate or hash join, which
+        DuckDB spills to disk when they exceed its memory limit.
+
+        Args:
+            airports_csv: raw airports file
+            delay_csv: raw delay file
+
+        Returns:
+            str: the SELECT statement
+    """
+    ct_cols = [col for col in EXPECTED_SCHEMA if col.endswith("_ct")]
+    delay_columns = [col for col in EXPECTED_SCHEMA
+                     if col not in DROPPED_COLUMNS]
+    total_ct = " + ".join(f"d.{_quote(col)}" for col in ct_cols)
+    # The airports file also writes nulls as \N
+    airport_nulls = _null_strings("\\N")
+
+    return f"""
+        WITH raw_airports AS (
+            -- distinct rows, each at its first position in the file
+            SELECT {", ".join(map(_quote, AIRPORT_COLUMNS))},
+                   min(source_row) AS source_row
+            FROM (SELECT *, row_number() OVER () AS source_row
+                  FROM read_csv({_literal(airports_csv)}, header = true,
+                                parallel = false,
+                                nullstr = {airport_nulls},
+                                types = {_read_types(AIRPORT_CONFIG)}))
+            WHERE country = 'United States'
+            GROUP BY ALL
+        ),
+        airports AS (
+            SELECT {", ".join(clean_columns(AIRPORT_CONFIG,
+                                            AIRPORT_COLUMNS))}
+            FROM raw_airports
+            WHERE {_not_null(AIRPORT_CONFIG)}
+            -- the first airport of each code, like AirportIndex
+            QUALIFY row_number() OVER (PARTITION BY iata
+                                       ORDER BY source_row) = 1
+        ),
+        raw_delays AS (
+            SELECT DISTINCT {", ".join(map(_quote, EXPECTED_SCHEMA))}
+            FROM read_csv({_literal(delay_csv)}, header = true,
+                          nullstr = {_null_strings()},
+                          types = {_read_types(DELAY_CONFIG)})
+        ),
+        delays AS (
+            SELECT {", ".join(clean_columns(DELAY_CONFIG, EXPECTED_SCHEMA))}
+            FROM raw_delays
+            WHERE {_not_null(DELAY_CONFIG)}
+        )
+        SELECT {", ".join(f"d.{_quote(col)}" for col in delay_columns)},
+               {", ".join(f"a.{_quote(col)}" for col in AIRPORT_COLUMNS)},
+               nullif(split_part(split_part(d.airport_name, ', ', 2),
+                                 ':', 1), '') AS state,
+               {total_ct} AS total_ct,
+               round_even(({total_ct}) / d.arr_flights * 100, 2)
+                   AS arr_flights_pct
+        FROM delays d
+        JOIN airports a ON d.airport = a.iata
+        ORDER BY d.year, d.month, d.carrier, d.airport
+    """
+
+
+def build_rollup_query(merged: Path, group_cols: "list[str]") -> str:
+    """The rollups of build_rollups, computed from the merged Parquet."""
+    ct_cols = [col for col in EXPECTED_SCHEMA if col.endswith("_ct")]
+    ct_cols.append("total_ct")
+    groups = ", ".join(map(_quote, group_cols))
+    aggregates = [f"sum({_quote(col)}) AS {_quote(col)}"
+                  for col in ct_cols]
+    aggregates.append("CAST(sum(arr_flights) AS BIGINT) AS arr_flights")
+    aggregates += [f"avg({_quote(col)}) AS {_quote(col)}"
+                   for col in ["lat", "lon", "arr_flights_pct"]]
+    return (f"SELECT {groups}, {', '.join(aggregates)} "
+            f"FROM read_parquet({_literal(merged)}) "
+            f"GROUP BY {groups} ORDER BY {groups}")
+
+
+def remove_stale_outputs(output_dir: Path, written: "list[Path]") -> None:
+    """
+        Remove the merged data and rollups of earlier runs in other formats,
+        e.g. merged_data.arrow or the merged_data dataset of the pandas
+        engine. The dashboard prefers those to Parquet, so it would keep
+        showing the earlier run's data.
+
+        Args:
+            output_dir: folder holding the outputs
+            written: outputs of this run, kept
+    """
+    stale = [path for pattern in ("merged_data*", "rollup_*")
+             for path in output_dir.glob(pattern) if path not in written]
+    for path in stale:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    if stale:
+        logger.info(f"Removed outdated outputs "
+                    f"{sorted(path.name for path in stale)}")
+
+
+def run_duckdb_pipeline(output_dir: Path = DATA_DIR / "output",
+                        write_rollups: bool = False) -> Path:
+    """
+        Run extract and transform out of core with DuckDB, writing the
+        merged data to Parquet instead of holding any frame in memory.
+        Merged data and rollups left in output_dir by earlier runs are
+        removed, see remove_stale_outputs.
+
+        Args:
+            output_dir: folder receiving merged_data.parquet
+            write_rollups: also write the dashboard rollups as Parquet
+
+        Returns:
+            Path: the merged Parquet file, see load_file_main
+    """
+    start_time = timeit.default_timer()
+    merged = output_dir / "merged_data.parquet"
+    SPILL_DIR.mkdir(parents=True, exist_ok=True)
+
+    with duckdb.connect() as conn:
+        conn.execute(f"SET memory_limit = '{MEMORY_LIMIT}'")
+        conn.execute(f"SET temp_directory = {_literal(SPILL_DIR)}")
+        query = build_merge_query(_raw_path("airports.csv"),
+                                  _raw_path("Airline_Delay_Cause.csv"))
+        conn.execute(f"COPY ({query}) TO {_literal(merged)} "
+                     f"(FORMAT parquet)")
+        rows = conn.execute(
+            f"SELECT count(*) FROM read_parquet({_literal(merged)})"
+        ).fetchone()[0]
+        logger.info(f"DuckDB pipeline wrote {rows} merged rows to {merged} "
+                    f"in {timeit.default_timer() - start_time:.2f}s")
+
+        written = [merged]
+        if write_rollups:
+            for name, group_cols in ROLLUPS.items():
+                rollup = output_dir / f"rollup_{name}.parquet"
+                conn.execute(f"COPY ({build_rollup_query(merged, group_cols)})"
+                             f" TO {_literal(rollup)} (FORMAT parquet)")
+                written.append(rollup)
+            logger.info("DuckDB pipeline wrote the dashboard rollups")
+    remove_stale_outputs(output_dir, written)
+    return merged
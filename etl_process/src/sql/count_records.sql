@@ -1,4 +0,0 @@
-SELECT
-    COUNT(*) as result
-FROM 
-    de_2506_a.sam_capstone
\ No newline at end of file
@@ -0,0 +1,42 @@
+import pandas as pd
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+# Rollup name -> group-by columns, matching the dashboard graph and map pages
+ROLLUPS = {
+    "year_carrier": ["year", "carrier_name"],
+    "year_name": ["year", "name"],
+    "year_state": ["year", "state"],
+    "state_year": ["state", "year"],
+}
+
+
+def build_rollups(merged_df: pd.DataFrame) -> "dict[str, pd.DataFrame]":
+    """
+        Pre-aggregate the merged data for the dashboard, so each page
+        interaction is a lookup on a few hundred rows instead of a groupby
+        over the full dataset.
+
+        Every rollup carries the sums of the '_ct' columns and arr_flights,
+        and the means of lat, lon and arr_flights_pct.
+
+        Args:
+            merged_df: output of merge_main
+
+        Returns:
+            dict[str, pd.DataFrame]: rollup name -> aggregated DataFrame,
+            see ROLLUPS
+    """
+    ct_cols = [col for col in merged_df.columns if col.endswith('_ct')]
+    agg_dict = {col: 'sum' for col in ct_cols}
+    agg_dict.update({'arr_flights': 'sum', 'lat': 'mean', 'lon': 'mean',
+                     'arr_flights_pct': 'mean'})
+
+    rollups = {}
+    for name, group_cols in ROLLUPS.items():
+        rollups[name] = merged_df.groupby(group_cols, observed=True) \
+            .agg(agg_dict).reset_index()
+        logger.info(f"Built rollup {name} - {rollups[name].shape}")
+    return rollups
@@ -0,0 +1,102 @@
+from collections import Counter
+import numpy as np
+import pandas as pd
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+
+class AirportIndex:
+    """
+        Hash index of the airports on their IATA code, used to attach the
+        airport columns to delay rows without a full DataFrame merge.
+
+        Codes are resolved to airport row positions with a hash lookup,
+        once per distinct code when the delay codes are categorical, and
+        the airport columns are gathered with take for the matched rows
+        only. Unmatched codes are counted across calls, so the index can be
+        reused for every chunk of a streamed delay file.
+    """
+
+    def __init__(self, airport_df: pd.DataFrame, key: str = "iata"):
+        """
+            Args:
+                airport_df: cleaned airports, one row per code
+                key: column holding the IATA code
+
+            Duplicate codes keep their first airport and are logged.
+        """
+        duplicated = airport_df[key].duplicated()
+        if duplicated.any():
+            logger.warning(f"Keeping the first of duplicated airport "
+                           f"codes: {sorted(airport_df[key][duplicated])}")
+            airport_df = airport_df[~duplicated]
+        self.airports = airport_df.reset_index(drop=True)
+        self.codes = pd.Index(self.airports[key].to_numpy(dtype=object))
+        self.unmatched: Counter = Counter()
+
+    def lookup(self, codes: pd.Series) -> np.ndarray:
+        """
+            Resolve codes to airport row positions.
+
+            Args:
+                codes: IATA codes, categorical or strings
+
+            Returns:
+                np.ndarray: position in self.airports of each code, -1
+                where the code has no airport
+        """
+        if isinstance(codes.dtype, pd.CategoricalDtype):
+            category_positions = self.codes.get_indexer(
+                codes.cat.categories.to_numpy(dtype=object))
+            # Null codes are -1, which picks the appended -1
+            return np.append(category_positions, -1) \
+                .take(codes.cat.codes.to_numpy())
+        return self.codes.get_indexer(codes.to_numpy(dtype=object))
+
+    def join(self, delay_df: pd.DataFrame,
+             on: str = "airport") -> pd.DataFrame:
+        """
+            Inner join the airport columns onto delay rows.
+
+            Rows whose code has no airport are left out and counted in
+            self.unmatched.
+
+            Args:
+                delay_df: delay rows, or one chunk of them
+                on: column of delay_df holding the IATA code
+
+            Returns:
+                pd.DataFrame: the matched delay rows, keeping their index,
+                followed by the airport columns
+        """
+        positions = self.lookup(delay_df[on])
+        matched = positions >= 0
+        if not matched.all():
+            self.unmatched.update(
+                delay_df[on][~matched].value_counts(dropna=False)
+                .loc[lambda counts: counts > 0].to_dict())
+        rows = np.flatnonzero(matched)
+
+        delay_rows = delay_df.take(rows)
+        airport_rows = self.airports.take(positions[rows])
+        airport_rows.index = delay_rows.index
+        return pd.concat([delay_rows, airport_rows], axis=1, copy=False)
+
+    def unmatched_counts(self) -> pd.Series:
+        """Rows left out per unmatched code so far, most frequent first."""
+        return pd.Series(self.unmatched, dtype="int64") \
+            .sort_values(ascending=False)
+
+    def log_unmatched(self, total_rows: int) -> None:
+        """Log the number of unmatched rows and the most frequent codes."""
+        counts = self.unmatched_counts()
+        dropped_rows = int(counts.sum())
+        percentage_dropped = round(dropped_rows / total_rows * 100, 2) \
+            if total_rows else 0.0
+        logger.info(f"{dropped_rows} rows unmatched and removed - "
+                    f"{percentage_dropped}% removed")
+        if dropped_rows:
+            logger.info(f"{len(counts)} unmatched airport codes, most "
+                        f"frequent: {counts.head(10).to_dict()}")
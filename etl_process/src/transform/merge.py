@@ -1,12 +1,59 @@
+from typing import Tuple
+import numpy as np
 import pandas as pd
+from src.transform.airport_index import AirportIndex
 from src.utils.logging_utils import setup_logger
 import logging
 
 logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
 
 
+def parse_states(airport_names: pd.Series) -> pd.Series:
+    """
+        Extract the state from BTS airport names, 'City, ST: Airport'.
+        Names without a state give a null.
+    """
+    return airport_names.str.split(', ').str[1].astype("string") \
+        .str.split(':').str[0].astype("string")
+
+
+def airport_dimension(delay_df: pd.DataFrame
+                      ) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+        Build the airport dimension of the delay data, one row per distinct
+        airport name with its code and state.
+
+        The names are parsed once per distinct value instead of once per
+        delay row, there are only a few hundred of them.
+
+        Args:
+            delay_df: delay rows with 'airport' and 'airport_name'
+
+        Returns:
+            tuple[pd.DataFrame, np.ndarray]: the dimension, and the
+            dimension row of every delay row (-1 for a null name)
+    """
+    names = delay_df['airport_name']
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        codes = names.cat.codes.to_numpy()
+        unique_names = names.cat.categories
+    else:
+        codes, unique_names = pd.factorize(names)
+    unique_names = pd.Series(unique_names, dtype="string")
+
+    airport = delay_df['airport'].groupby(codes).first() \
+        .reindex(unique_names.index)
+    dimension = pd.DataFrame({
+        'airport': airport.astype("string"),
+        'airport_name': unique_names,
+        'state': parse_states(unique_names),
+    })
+    return dimension, codes
+
+
 def merge_main(airport_df: pd.DataFrame,
-               delay_df: pd.DataFrame) -> pd.DataFrame:
+               delay_df: pd.DataFrame,
+               compact: bool = False) -> pd.DataFrame:
     """
         Merge airport and delay dataframes and extract state information.
 
@@ -15,26 +62,39 @@ def merge_main(airport_df: pd.DataFrame,
             information with 'iata' codes
             delay_df: DataFrame containing flight
             delay data with 'airport' codes
+            compact: Store the derived state column as a categorical
 
         Returns:
             Merged DataFrame with state column added and
-            unnecessary columns removed
+            unnecessary columns removed. Delay rows whose airport code has
+            no airport are removed, and keep their index otherwise.
     """
-    merged_df = delay_df.merge(airport_df,
-                               left_on='airport',
-                               right_on='iata',
-                               how='left')
-    records = len(merged_df)
+    airport_index = AirportIndex(airport_df)
     # ~5000 unmatched codes
-    merged_df.dropna(inplace=True)
-    dropped_rows = records - len(merged_df)
-    percentage_dropped = round(dropped_rows / records * 100, 2)
-
-    logger.info(f"{dropped_rows} rows unmatched and removed - "
-                f"{percentage_dropped}% removed")
-    merged_df['state'] = merged_df['airport_name'] \
-        .str.split(', ') \
-        .str[1].str.split(':').str[0]
+    merged_df = airport_index.join(delay_df, on='airport')
+    airport_index.log_unmatched(len(delay_df))
+    return derive_columns(merged_df, compact)
+
+
+def derive_columns(merged_df: pd.DataFrame,
+                   compact: bool = False) -> pd.DataFrame:
+    """
+        Add the state, total_ct and arr_flights_pct columns to joined delay
+        rows and drop the columns they replace. Each row is derived on its
+        own, so chunks of the joined rows can be processed separately.
+
+        Args:
+            merged_df: delay rows with the airport columns joined
+            compact: Store the derived state column as a categorical
+
+        Returns:
+            pd.DataFrame: the merged output columns
+    """
+    dimension, rows = airport_dimension(merged_df)
+    state_codes, states = pd.factorize(dimension['state'])
+    state = pd.Categorical.from_codes(
+        np.append(state_codes, -1).take(rows), states)
+    merged_df['state'] = state if compact else state.astype("string")
 
     ct_cols = [col for col in merged_df.columns if col.endswith('_ct')]
     merged_df['total_ct'] = merged_df[ct_cols].sum(axis=1)
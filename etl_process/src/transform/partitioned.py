@@ -0,0 +1,137 @@
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.transform.transformer import Transformer
+from src.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+# Below this many rows per partition the process start up and pickling
+# cost more than the cleaning itself
+MIN_PARTITION_ROWS = 50_000
+
+
+def partition_rows(data: pd.DataFrame, partitions: int) -> np.ndarray:
+    """
+        Assign every row to a partition from the hash of its values.
+
+        Identical rows always share a hash, so every set of duplicates lands
+        in a single partition and removing duplicates per partition gives the
+        same result as over the whole frame.
+
+        Args:
+            data: frame to split
+            partitions: number of partitions
+
+        Returns:
+            np.ndarray: partition number of each row
+    """
+    row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    return (row_hashes % np.uint64(partitions)).astype(np.intp)
+
+
+def _init_worker() -> None:
+    """Only the merged summary is logged, not every partition."""
+    logging.getLogger("src.transform.transformer").setLevel(logging.WARNING)
+
+
+def _clean_partition(args: Tuple[pd.DataFrame, "list[str]",
+                                 "dict[str,list[str]]", bool]
+                     ) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    data, crit_cols, col_types, compact = args
+    cleaner = Transformer(data, crit_cols, col_types, compact)
+    return cleaner.clean(), cleaner.stats
+
+
+def _concat_partitions(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+        Concatenate cleaned partitions, unifying the categories of
+        categorical columns first, as filling nulls may have added a category
+        to only some partitions.
+    """
+    for col in frames[0].columns:
+        if not isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            continue
+        categories = pd.Index([])
+        for frame in frames:
+            categories = categories.append(
+                frame[col].cat.categories.difference(categories, sort=False))
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames)
+
+
+def merge_stats(stats: List[Dict[str, int]]) -> Dict[str, int]:
+    """Sum the per-partition statistics of Transformer.clean."""
+    merged: Dict[str, int] = {}
+    for partition_stats in stats:
+        for key, value in partition_stats.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def clean_partitioned(data: pd.DataFrame,
+                      crit_cols: "list[str]",
+                      col_types: "dict[str,list[str]]",
+                      compact: bool = False,
+                      workers: Optional[int] = None
+                      ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+        Clean a frame with Transformer.clean in a pool of processes.
+
+        The rows are hashed into one partition per worker (see
+        partition_rows), each partition is cleaned in its own process and
+        the results are put back in the original row order, so the output
+        is the same as cleaning the whole frame at once. The partitions are
+        pickled to and from the workers, which only pays off with several
+        free cores, so workers are capped at the CPU count. Frames too small
+        to give every worker MIN_PARTITION_ROWS rows use fewer workers, down
+        to cleaning in process.
+
+        Args:
+            data: raw frame to clean
+            crit_cols: see Transformer
+            col_types: see Transformer
+            compact: see Transformer
+            workers: number of processes, at most and by default the
+            number of CPUs
+
+        Returns:
+            tuple[pd.DataFrame, dict]: the cleaned frame and the merged
+            duplicate and null statistics
+    """
+    cpus = os.cpu_count() or 1
+    workers = min(workers or cpus, cpus)
+    partitions = max(1, min(workers, len(data) // MIN_PARTITION_ROWS))
+    if partitions == 1:
+        cleaner = Transformer(data, crit_cols, col_types, compact)
+        return cleaner.clean(), cleaner.stats
+
+    partition = partition_rows(data, partitions)
+    tasks = []
+    for number in range(partitions):
+        positions = np.flatnonzero(partition == number)
+        part = data.take(positions)
+        # Label rows by position to restore the original order afterwards
+        part.index = positions
+        tasks.append((part, crit_cols, col_types, compact))
+
+    with ProcessPoolExecutor(max_workers=partitions,
+                             initializer=_init_worker) as executor:
+        results = list(executor.map(_clean_partition, tasks))
+
+    clean_data = _concat_partitions([frame for frame, _ in results]) \
+        .sort_index()
+    clean_data.index = data.index[clean_data.index]
+    stats = merge_stats([partition_stats for _, partition_stats in results])
+
+    logger.info(f"Cleaned {stats['rows']} rows in {partitions} partitions")
+    logger.info(f"Removed {stats['duplicates']} duplicate rows")
+    Transformer._log_null_handling(stats["rows_dropped"],
+                                   stats["rows_with_nulls"],
+                                   stats["nulls_before_fill"],
+                                   stats["nulls_after_fill"])
+    return clean_data, stats
@@ -0,0 +1,130 @@
+from typing import Dict, Iterable, Iterator, List
+import numpy as np
+import pandas as pd
+from config.transform_config import AIRPORT_CONFIG, DELAY_CONFIG
+from src.transform.airport_index import AirportIndex
+from src.transform.merge import derive_columns
+from src.transform.partitioned import merge_stats
+from src.transform.transformer import Transformer
+from src.utils.instrumentation import stage
+from src.utils.logging_utils import setup_logger
+import logging
+
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+
+class SeenRows:
+    """
+        Hashes of the rows of every chunk seen so far, to remove rows
+        repeating a row of an earlier chunk.
+
+        The hashes are kept as a few sorted uint64 runs, 8 bytes per
+        distinct row, instead of the rows themselves. Each chunk adds a run
+        and runs of similar length are merged with one sort, so there are
+        O(log n) runs and a hash is copied O(log n) times in all, instead of
+        on every chunk. Unlike within a chunk, where Transformer.clean
+        compares rows sharing a hash exactly, a row whose hash collides with
+        an earlier chunk's row is treated as a duplicate, a chance of about
+        n^2 / 2^65 for n rows.
+    """
+
+    def __init__(self):
+        self.runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(map(len, self.runs))
+
+    @property
+    def hashes(self) -> np.ndarray:
+        """Every hash seen, as one sorted array."""
+        return np.sort(np.concatenate(self.runs)) if self.runs \
+            else np.empty(0, dtype=np.uint64)
+
+    def filter_new(self, data: pd.DataFrame) -> np.ndarray:
+        """
+            Mark the rows not seen in an earlier chunk and remember them.
+
+            Args:
+                data: raw chunk, with the dtypes of every other chunk
+
+            Returns:
+                np.ndarray: True for each row whose hash is new
+        """
+        row_hashes = pd.util.hash_pandas_object(data, index=False) \
+            .to_numpy()
+        # Searching the runs for sorted hashes is faster than in row order
+        keys, rows = np.unique(row_hashes, return_inverse=True)
+        seen = np.zeros(len(keys), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, keys), len(run) - 1)
+            seen |= run[positions] == keys
+        new_hashes = keys[~seen]
+        if len(new_hashes):
+            self.runs.append(new_hashes)
+        # Runs hold distinct hashes, so merging them keeps them unique
+        while len(self.runs) > 1 and \
+                len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], last]))
+        return ~seen[rows]
+
+
+def transform_chunks(airports: pd.DataFrame,
+                     delay_chunks: Iterable[pd.DataFrame],
+                     compact: bool = False) -> Iterator[pd.DataFrame]:
+    """
+        Clean and merge a stream of delay chunks, yielding merged chunks as
+        they are ready.
+
+        The airports are cleaned once and stay in memory as an AirportIndex.
+        Every delay chunk has the rows of earlier chunks removed (see
+        SeenRows), is cleaned with Transformer.clean and joined to the
+        airports, so the merged rows are those of transform_main, in file
+        order instead of sorted. Apart from the row hashes, memory is bounded
+        by the chunk size.
+
+        Args:
+            airports: raw airports, as extract_airport_locations returns
+            delay_chunks: raw delay chunks, see extract_delay_data_chunks
+            compact: see Transformer
+
+        Yields:
+            pd.DataFrame: merged chunks, with the columns of merge_main
+    """
+    with stage("clean_airports", rows_in=len(airports)) as metrics:
+        clean_airports = Transformer(airports,
+                                     AIRPORT_CONFIG["crit_cols"],
+                                     AIRPORT_CONFIG["col_types"],
+                                     compact).clean()
+        metrics.rows_out = len(clean_airports)
+    airport_index = AirportIndex(clean_airports)
+    seen_rows = SeenRows()
+    stats: List[Dict[str, int]] = []
+
+    for chunk in delay_chunks:
+        with stage("transform_chunk", rows_in=len(chunk)) as metrics:
+            new_rows = seen_rows.filter_new(chunk)
+            cleaner = Transformer(chunk[new_rows],
+                                  DELAY_CONFIG["crit_cols"],
+                                  DELAY_CONFIG["col_types"],
+                                  compact)
+            clean_delay = cleaner.clean()
+            stats.append({**cleaner.stats,
+                          "rows": len(chunk),
+                          "duplicates": cleaner.stats["duplicates"]
+                          + int((~new_rows).sum())})
+            merged = derive_columns(
+                airport_index.join(clean_delay, on="airport"), compact)
+            metrics.rows_out = len(merged)
+        yield merged
+
+    total = merge_stats(stats)
+    if total:
+        logger.info(f"Cleaned {total['rows']} rows in {len(stats)} chunks")
+        logger.info(f"Removed {total['duplicates']} duplicate rows")
+        Transformer._log_null_handling(total["rows_dropped"],
+                                       total["rows_with_nulls"],
+                                       total["nulls_before_fill"],
+                                       total["nulls_after_fill"])
+        airport_index.log_unmatched(total["rows"] - total["duplicates"]
+                                    - total["rows_dropped"])
@@ -1,46 +1,23 @@
 import pandas as pd
 
+from config.transform_config import AIRPORT_CONFIG, DELAY_CONFIG
+from src.transform.aggregate import build_rollups
 from src.transform.merge import merge_main
+from src.transform.partitioned import clean_partitioned
 from src.transform.transformer import Transformer
-from src.utils.post_data import post
+from src.utils.instrumentation import stage
+from src.utils.post_data import post, post_dataset
 from src.utils.logging_utils import setup_logger
 import logging
 
 logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
 
-# Add these constants at the top of the file after the logger setup:
-
-AIRPORT_CONFIG = {
-    "crit_cols": ["name", "iata"],
-    "col_types": {
-        "str_cols": ["name", "iata", "city"],
-        "float_cols": ["lat", "lon", "alt"],
-        "int_cols": []
-    }
-}
-
-DELAY_CONFIG = {
-    "crit_cols": ["year", "month",
-                  "carrier", "carrier_name",
-                  "airport", "airport_name"],
-    "col_types": {
-        "str_cols": ["carrier", "carrier_name",
-                     "airport", "airport_name"],
-        "int_cols": ["year", "month", "arr_flights",
-                     "arr_del15", "arr_cancelled",
-                     "arr_diverted", "arr_delay",
-                     "carrier_delay", "weather_delay",
-                     "nas_delay", "security_delay",
-                     "late_aircraft_delay"],
-        "float_cols": ["carrier_ct", "weather_ct",
-                       "nas_ct", "security_ct",
-                       "late_aircraft_ct"]
-    }
-}
-
 
 def transform_main(data: "tuple[pd.DataFrame,pd.DataFrame]",
-                   write_to_file=False) -> pd.DataFrame:
+                   write_to_file=False,
+                   file_format="csv",
+                   compact=False,
+                   workers=1) -> pd.DataFrame:
     """
         Transform raw airport and delay data by cleaning and preprocessing
         both datasets.
@@ -49,8 +26,21 @@ def transform_main(data: "tuple[pd.DataFrame,pd.DataFrame]",
             data (tuple[pd.DataFrame, pd.DataFrame]): Tuple containing raw
             airport and delay data
 
-            write_to_file (bool, optional): Whether to write cleaned data to
-            CSV files. Defaults to False.
+            write_to_file (bool, optional): Whether to write cleaned data
+            and the dashboard rollups built from it to files. The merged
+            data is also published for the dashboard as merged_data.arrow,
+            with categorical strings, and as the merged_data dataset
+            partitioned by year and month. Defaults to False.
+
+            file_format (str, optional): Extension of the output files, one
+            of csv, parquet, feather or arrow. Defaults to csv.
+
+            compact (bool, optional): Keep the string columns as
+            categoricals through cleaning, merge and output. Defaults to
+            False.
+
+            workers (int, optional): Number of processes cleaning the delay
+            data, see clean_partitioned. Defaults to 1, cleaning in process.
 
         Returns:
             pd.DataFrame: Cleaned and merged data
@@ -58,15 +48,27 @@ def transform_main(data: "tuple[pd.DataFrame,pd.DataFrame]",
 
     airport_cleaner = Transformer(data[0],
                                   AIRPORT_CONFIG["crit_cols"],
-                                  AIRPORT_CONFIG["col_types"])
-    delay_cleaner = Transformer(data[1],
-                                DELAY_CONFIG["crit_cols"],
-                                DELAY_CONFIG["col_types"])
+                                  AIRPORT_CONFIG["col_types"],
+                                  compact)
     logger.info("Started cleaning airports")
-    clean_airport = airport_cleaner.clean()
+    with stage("clean_airports", rows_in=len(data[0])) as metrics:
+        clean_airport = airport_cleaner.clean()
+        metrics.rows_out = len(clean_airport)
     logger.info("airports cleaned")
     logger.info("Started cleaning delays")
-    clean_delay = delay_cleaner.clean()
+    with stage("clean_delay", rows_in=len(data[1])) as metrics:
+        if workers > 1:
+            clean_delay, _ = clean_partitioned(data[1],
+                                               DELAY_CONFIG["crit_cols"],
+                                               DELAY_CONFIG["col_types"],
+                                               compact, workers)
+        else:
+            delay_cleaner = Transformer(data[1],
+                                        DELAY_CONFIG["crit_cols"],
+                                        DELAY_CONFIG["col_types"],
+                                        compact)
+            clean_delay = delay_cleaner.clean()
+        metrics.rows_out = len(clean_delay)
     logger.info("delays cleaned")
 
     logger.info(f"Transform completed successfully - "
@@ -74,13 +76,25 @@ def transform_main(data: "tuple[pd.DataFrame,pd.DataFrame]",
                 f"Delays: {clean_delay.shape}")
 
     logger.info("starting merge")
-    merged_data = merge_main(clean_airport, clean_delay)
+    with stage("merge", rows_in=len(clean_delay)) as metrics:
+        merged_data = merge_main(clean_airport, clean_delay, compact)
+        metrics.rows_out = len(merged_data)
     logger.info(f"Completed merge - "
                 f"Merged Data: {merged_data.shape}")
 
     if write_to_file:
-        post("output", "clean_airports.csv", clean_airport)
-        post("output", "clean_delay.csv", clean_delay)
-        post("output", "merged_data.csv", merged_data)
+        post("output", f"clean_airports.{file_format}", clean_airport)
+        post("output", f"clean_delay.{file_format}", clean_delay)
+        if file_format != "arrow":
+            post("output", f"merged_data.{file_format}", merged_data)
+        # Uncompressed Arrow IPC with dictionary encoded strings, which the
+        # dashboard memory-maps instead of parsing
+        string_cols = merged_data.select_dtypes(["string", "object"]).columns
+        post("output", "merged_data.arrow",
+             merged_data.astype({col: "category" for col in string_cols}))
+        # year=/month= partitioned Parquet, read a few years at a time
+        post_dataset("output", "merged_data", merged_data)
+        for name, rollup in build_rollups(merged_data).items():
+            post("output", f"rollup_{name}.{file_format}", rollup)
 
     return merged_data
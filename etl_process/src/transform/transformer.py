@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from src.utils.instrumentation import stage
 from src.utils.logging_utils import setup_logger
 import logging
 from typing import Any
@@ -18,7 +20,8 @@ class Transformer:
 
     def __init__(self, data: pd.DataFrame,
                  crit_cols: "list[str]",
-                 col_types: "dict[str,list[str]]"):
+                 col_types: "dict[str,list[str]]",
+                 compact: bool = False):
         """Initialize the Transformer with data and configuration.
 
         Args:
@@ -28,6 +31,8 @@ class Transformer:
             col_types: Dictionary mapping column type categories to
             column lists.
                       Must contain keys: 'str_cols', 'int_cols', 'float_cols'
+            compact: Store str_cols as categoricals instead of 'string',
+            which is much smaller for low-cardinality columns
 
         Raises:
             ValueError: If critical columns are missing from data or required
@@ -45,22 +50,149 @@ class Transformer:
         self.data = data
         self.crit_cols = crit_cols
         self.col_types = col_types
+        self.type_mapping = dict(self.TYPE_MAPPING)
+        if compact:
+            self.type_mapping["str_cols"] = ("N/A", "category")
+
+    # Value used to fill nulls and dtype cast to, per col_types key
+    TYPE_MAPPING: "dict[str, tuple[Any, str]]" = {
+        "str_cols": ("N/A", "string"),
+        "int_cols": (0, "int64"),
+        "float_cols": (0, "float64")
+    }
 
     def clean(self):
         """Execute the complete data cleaning pipeline.
 
-        Performs all cleaning operations in sequence: removes duplicates,
-        formats columns, converts data types, and handles null values.
+        Removes duplicates, formats columns, handles null values and
+        converts data types in a single pass. Null statistics are computed
+        once per column and each column is filled and cast in one step, so
+        apart from the row selection no intermediate copies of the frame
+        are made. The result matches running remove_duplicates,
+        format_columns, handle_nulls and format_data_types in sequence.
+
+        The duplicate and null counts are kept in self.stats.
 
         Returns:
             pd.DataFrame: The cleaned DataFrame
         """
-        self.remove_duplicates()
-        self.format_columns()
-        self.handle_nulls()
-        self.format_data_types()
+        data = self.data
+        with stage("dedup", rows_in=len(data)) as metrics:
+            duplicated_rows = self._duplicated_rows(data)
+            metrics.rows_out = len(data) - int(duplicated_rows.sum())
+        logger.info(f"Removed {duplicated_rows.sum()} duplicate rows")
+
+        columns = data.columns.str.lower().str.replace(" ", "_")
+        logger.info("Column names formatted")
+
+        # formatted name -> position of the column in the raw data
+        positions = {col: i for i, col in enumerate(columns)}
+        critical_nulls = np.zeros(len(data), dtype=bool)
+        for col in self.crit_cols:
+            critical_nulls |= data.iloc[:, positions[col]].isna().to_numpy()
+        rows_dropped = int((critical_nulls & ~duplicated_rows).sum())
+
+        keep = ~(duplicated_rows | critical_nulls)
+        rows = None if keep.all() else np.flatnonzero(keep)
+
+        col_types = {col: key for key, cols in self.col_types.items()
+                     for col in cols}
+        missing_cols = [col for col in col_types if col not in positions]
+        if missing_cols:
+            raise KeyError(f"Typed columns not found in data: "
+                           f"{missing_cols}")
+        rows_with_nulls = np.zeros(len(data) if rows is None else len(rows),
+                                   dtype=bool)
+        nulls_before_fill = 0
+        nulls_after_fill = 0
+        clean_columns = {}
+        # fillna and astype are fused per column, so timed as one step
+        with stage("fill_cast", rows_in=len(data)) as metrics:
+            for i, col in enumerate(columns):
+                series = data.iloc[:, i]
+                if rows is not None:
+                    series = series.take(rows)
+                nulls = series.isna().to_numpy()
+                null_count = int(nulls.sum())
+                if null_count:
+                    rows_with_nulls |= nulls
+                    nulls_before_fill += null_count
+
+                if col in col_types:
+                    fill_value, dtype = self.type_mapping[col_types[col]]
+                    if null_count:
+                        series = self._fill(series, fill_value)
+                    if self._needs_cast(series, dtype):
+                        series = series.astype(dtype)
+                else:
+                    nulls_after_fill += null_count
+                clean_columns[col] = series.rename(col)
+
+            self.clean_data = pd.DataFrame(clean_columns, copy=False)
+            metrics.rows_out = len(self.clean_data)
+
+        self.stats = {
+            "rows": len(data),
+            "duplicates": int(duplicated_rows.sum()),
+            "rows_dropped": rows_dropped,
+            "rows_with_nulls": int(rows_with_nulls.sum()),
+            "nulls_before_fill": nulls_before_fill,
+            "nulls_after_fill": nulls_after_fill,
+        }
+        self._log_null_handling(rows_dropped,
+                                self.stats["rows_with_nulls"],
+                                nulls_before_fill,
+                                nulls_after_fill)
+        logger.info("columns converted to correct datatypes")
         return self.clean_data
 
+    @staticmethod
+    def _fill(series: pd.Series, fill_value: Any) -> pd.Series:
+        """Fill nulls, adding the fill value as a category if needed."""
+        if isinstance(series.dtype, pd.CategoricalDtype) and \
+                fill_value not in series.cat.categories:
+            series = series.cat.add_categories([fill_value])
+        return series.fillna(fill_value)
+
+    @staticmethod
+    def _needs_cast(series: pd.Series, dtype: str) -> bool:
+        """Whether a column is not yet in its target dtype.
+
+        Categorical string columns (parsed as category by extraction) are
+        kept as they are instead of being expanded to 'string'.
+        """
+        if dtype in ("string", "category") and \
+                isinstance(series.dtype, pd.CategoricalDtype):
+            return False
+        return series.dtype != dtype
+
+    @staticmethod
+    def _duplicated_rows(data: pd.DataFrame) -> np.ndarray:
+        """Same result as data.duplicated(), computed from row hashes.
+
+        Hashing every row is much cheaper than factorising each column.
+        Rows whose hash is unique cannot be duplicates, the few rows sharing
+        a hash are compared exactly so a collision never drops a row.
+        """
+        row_hashes = pd.util.hash_pandas_object(data, index=False)
+        candidates = row_hashes.duplicated(keep=False).to_numpy()
+        duplicated_rows = np.zeros(len(data), dtype=bool)
+        if candidates.any():
+            duplicated_rows[candidates] = \
+                data[candidates].duplicated().to_numpy()
+        return duplicated_rows
+
+    @staticmethod
+    def _log_null_handling(rows_dropped: int, rows_with_nulls: int,
+                           nulls_before_fill: int,
+                           nulls_after_fill: int) -> None:
+        if nulls_after_fill == 0:
+            logger.info(f"Dropped {rows_dropped} rows with critical nulls, "
+                        f"filled "
+                        f"{nulls_before_fill} nulls in {rows_with_nulls} rows")
+        else:
+            logger.warning(f"could not handle {nulls_after_fill} nulls")
+
     def remove_duplicates(self):
         """Remove duplicate rows from the dataset.
 
@@ -102,34 +234,27 @@ class Transformer:
         int_cols = self.col_types["int_cols"]
         float_cols = self.col_types["float_cols"]
 
-        self.clean_data[str_cols] = self.clean_data[str_cols].fillna("N/A")
+        for col in str_cols:
+            self.clean_data[col] = self._fill(self.clean_data[col], "N/A")
         self.clean_data[int_cols] = self.clean_data[int_cols].fillna(0)
         self.clean_data[float_cols] = self.clean_data[float_cols].fillna(0)
 
         nulls_after_fill = self.clean_data.isna().sum().sum()
 
-        if nulls_after_fill == 0:
-            logger.info(f"Dropped {rows_dropped} rows with critical nulls, "
-                        f"filled "
-                        f"{nulls_before_fill} nulls in {rows_with_nulls} rows")
-        else:
-            logger.warning(f"could not handle {nulls_after_fill} nulls")
+        self._log_null_handling(rows_dropped, rows_with_nulls,
+                                nulls_before_fill, nulls_after_fill)
 
     def format_data_types(self):
         """Convert columns to their specified data types.
 
         Applies type conversions based on the col_types configuration:
-        - str_cols: converted to 'string' dtype
+        - str_cols: converted to 'string' dtype, unless categorical, or
+          to 'category' in compact mode
         - int_cols: converted to 'int64' dtype
         - float_cols: converted to 'float64' dtype
         """
-        type_mapping: dict[str, Any] = {
-            "str_cols": "string",
-            "int_cols": "int64",
-            "float_cols": "float64"
-        }
-
-        for col_key, dtype in type_mapping.items():
-            cols = self.col_types[col_key]
-            self.clean_data[cols] = self.clean_data[cols].astype(dtype)
+        for col_key, (_, dtype) in self.type_mapping.items():
+            for col in self.col_types[col_key]:
+                if self._needs_cast(self.clean_data[col], dtype):
+                    self.clean_data[col] = self.clean_data[col].astype(dtype)
         logger.info("columns converted to correct datatypes")
@@ -1,13 +1,32 @@
 import pandas as pd
 from pathlib import Path
+from typing import Iterator
+from src.utils.instrumentation import stage
 from src.utils.logging_utils import setup_logger, log_extract_success
 import logging
 import timeit
 
 logger = setup_logger(__name__, "extract_data.log", level=logging.DEBUG)
 
+# Rows per chunk yielded by get_raw_file_chunks
+DEFAULT_CHUNKSIZE = 100_000
 
-def get_raw_file(fileName: str) -> pd.DataFrame:
+# pyarrow's multithreaded CSV parser releases the GIL, so files read from
+# different threads are parsed concurrently. It does not support chunksize,
+# so get_raw_file_chunks keeps the default C parser.
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+
+def _raw_path(fileName: str) -> Path:
+    """Build the path of a file in the raw data folder."""
+    return Path(__file__).parent.parent.parent / "data" / "raw" / fileName
+
+
+def get_raw_file(fileName: str, **read_options) -> pd.DataFrame:
     """
         Extracts a CSV file from the raw data folder and loads it into a pandas
         DataFrame.
@@ -15,6 +34,9 @@ def get_raw_file(fileName: str) -> pd.DataFrame:
         Args:
             fileName (str): The name of the CSV file to be loaded from the
             '../../data/raw/' directory.
+            **read_options: Passed to pd.read_csv, e.g. usecols, dtype and
+            na_values to parse straight into the final column types. The
+            engine defaults to CSV_ENGINE.
         Returns:
             pd.DataFrame: The contents of the CSV file as a pandas
             DataFrame.
@@ -28,10 +50,15 @@ def get_raw_file(fileName: str) -> pd.DataFrame:
     """
 
     start_time = timeit.default_timer()
-    data_path = Path(__file__).parent.parent.parent / "data" / "raw" / fileName
+    data_path = _raw_path(fileName)
+    read_options.setdefault("engine", CSV_ENGINE)
 
     try:
-        df = pd.read_csv(data_path)
+        with stage(f"read.{fileName}") as metrics:
+            df = pd.read_csv(data_path, **read_options)
+            metrics.rows_out = len(df)
+            if data_path.exists():
+                metrics.bytes_in = data_path.stat().st_size
         extract_file_execution_time = timeit.default_timer() - start_time
         log_extract_success(
             logger,
@@ -51,3 +78,83 @@ def get_raw_file(fileName: str) -> pd.DataFrame:
         logger.setLevel(logging.ERROR)
         logger.error(f"Error reading file {fileName}: {str(e)}")
         raise Exception(f"Error reading file {fileName}: {str(e)}")
+
+
+def get_raw_header(fileName: str) -> "list[str]":
+    """
+        Reads only the header row of a CSV file in the raw data folder.
+
+        Args:
+            fileName (str): The name of the CSV file in the raw data folder
+        Returns:
+            list[str]: The column names of the file
+        Raises:
+            FileNotFoundError: If the specified file does not exist in the
+            raw data folder.
+    """
+    data_path = _raw_path(fileName)
+    try:
+        return pd.read_csv(data_path, nrows=0).columns.tolist()
+    except FileNotFoundError:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"File {fileName} not found in {data_path}")
+        raise FileNotFoundError(
+            f"File {fileName} not found in {data_path}"
+        )
+
+
+def get_raw_file_chunks(fileName: str,
+                        chunksize: int = DEFAULT_CHUNKSIZE,
+                        **read_options) -> Iterator[pd.DataFrame]:
+    """
+        Streams a CSV file from the raw data folder as DataFrames of at most
+        `chunksize` rows, so peak memory is bounded by the chunk size rather
+        than the size of the file.
+
+        Args:
+            fileName (str): The name of the CSV file to be loaded from the
+            '../../data/raw/' directory.
+            chunksize (int): Maximum number of rows per chunk
+            **read_options: Passed to pd.read_csv
+        Yields:
+            pd.DataFrame: Consecutive chunks of the file
+        Raises:
+            ValueError: If chunksize is not a positive integer
+            FileNotFoundError: If the specified file does not exist in the
+            raw data folder.
+            Exception: If there is an error reading the file
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+
+    start_time = timeit.default_timer()
+    data_path = _raw_path(fileName)
+    rows = 0
+    columns = 0
+
+    try:
+        with pd.read_csv(data_path, chunksize=chunksize,
+                         **read_options) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                columns = chunk.shape[1]
+                yield chunk
+    except FileNotFoundError:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"File {fileName} not found in {data_path}")
+        raise FileNotFoundError(
+            f"File {fileName} not found in {data_path}"
+        )
+    except Exception as e:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"Error reading file {fileName}: {str(e)}")
+        raise Exception(f"Error reading file {fileName}: {str(e)}")
+
+    if rows:
+        log_extract_success(
+            logger,
+            fileName[:-4] + " from CSV in chunks",
+            (rows, columns),
+            timeit.default_timer() - start_time,
+            0.0001
+        )
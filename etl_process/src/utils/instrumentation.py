@@ -0,0 +1,242 @@
+from contextlib import contextmanager
+import contextvars
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+import psutil
+from src.utils.logging_utils import _ensure_log_directory, setup_logger
+import logging
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = setup_logger(__name__, "etl_pipeline.log", level=logging.DEBUG)
+
+# One JSON object per run is appended, next to the log files
+REPORT_FILE = "run_report.jsonl"
+
+# Names of the enclosing stages, prefixed to nested stage names
+_stage_path: contextvars.ContextVar[Tuple[str, ...]] = \
+    contextvars.ContextVar("stage_path", default=())
+
+# Linux only: VmHWM, the resident memory high-water mark, and the file
+# resetting it to the current resident memory when "5" is written to it
+_STATUS_PATH = Path("/proc/self/status")
+_CLEAR_REFS_PATH = Path("/proc/self/clear_refs")
+
+
+def peak_rss() -> int:
+    """High-water mark of the resident memory of this process, in bytes."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    return psutil.Process().memory_info().peak_wset
+
+
+def _read_high_water_mark() -> Optional[int]:
+    """VmHWM in bytes, None where the kernel does not report it."""
+    try:
+        with open(_STATUS_PATH, "r") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_high_water_mark() -> bool:
+    try:
+        with open(_CLEAR_REFS_PATH, "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class _PeakTracker:
+    """
+        Per-stage peaks of the resident memory, from the kernel high-water
+        mark, which is reset when a stage starts. Before each reset, the
+        mark reached so far is added to every stage still open, nested or
+        running in another thread, so a stage's peak is the largest mark of
+        the intervals it spans. The run report is tracked like a stage, as
+        a reset also lowers ru_maxrss.
+
+        Where the mark cannot be read or reset (not Linux, or /proc not
+        writable) nothing is tracked and the stage peaks stay None.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: List[object] = []
+        self.supported: Optional[bool] = None
+
+    def _fold(self) -> None:
+        mark = _read_high_water_mark()
+        if mark is None:
+            return
+        for tracked in self._open:
+            tracked.peak_rss_bytes = max(tracked.peak_rss_bytes or 0, mark)
+
+    def start(self, tracked) -> None:
+        """Reset the mark and track the peak of tracked from now on."""
+        with self._lock:
+            if self.supported is None:
+                self.supported = _read_high_water_mark() is not None and \
+                    _reset_high_water_mark()
+            if not self.supported:
+                return
+            self._fold()
+            _reset_high_water_mark()
+            self._open.append(tracked)
+
+    def stop(self, tracked) -> None:
+        """Set the peak of tracked and stop tracking it."""
+        with self._lock:
+            # by identity, equal metrics of two stages compare equal
+            if any(item is tracked for item in self._open):
+                self._fold()
+                self._open = [item for item in self._open
+                              if item is not tracked]
+
+
+_peaks = _PeakTracker()
+
+
+@dataclass
+class StageMetrics:
+    """
+        Measurements of one stage of a run. Wall and CPU time, resident
+        memory and its peak during the stage are measured by stage, the row
+        and byte counts are set by the instrumented code where they are
+        known. The peak is None where it cannot be measured, see
+        _PeakTracker.
+    """
+    name: str
+    started_at: str
+    wall_time_s: float = 0.0
+    cpu_time_s: float = 0.0
+    rss_start_bytes: int = 0
+    rss_end_bytes: int = 0
+    peak_rss_bytes: Optional[int] = None
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    bytes_in: Optional[int] = None
+    bytes_out: Optional[int] = None
+
+
+class RunReport:
+    """Stage metrics of one pipeline run, saved as a line of JSON."""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.stages: List[StageMetrics] = []
+        self.status = "running"
+        # set by _PeakTracker, ru_maxrss is used where it is not supported
+        self.peak_rss_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def add(self, metrics: StageMetrics) -> None:
+        with self._lock:
+            self.stages.append(metrics)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "status": self.status,
+            "peak_rss_bytes": self.peak_rss_bytes or peak_rss(),
+            "stages": [asdict(metrics) for metrics in self.stages],
+        }
+
+    def save(self, path: Path) -> None:
+        """Append the report to a JSON lines file."""
+        with open(path, "a") as file:
+            file.write(json.dumps(self.to_dict()) + "\n")
+        logger.info(f"Run report with {len(self.stages)} stages saved to "
+                    f"{path}")
+
+
+_active_report: Optional[RunReport] = None
+
+
+@contextmanager
+def run_report(path: Optional[Path] = None) -> Iterator[RunReport]:
+    """
+        Collect the stages run inside the block into a RunReport, saved
+        when the block exits, also if it fails.
+
+        Args:
+            path: JSON lines file, defaults to REPORT_FILE in the logs
+            folder
+    """
+    global _active_report
+    report = RunReport()
+    _active_report = report
+    _peaks.start(report)
+    try:
+        yield report
+        report.status = "succeeded"
+    except BaseException:
+        report.status = "failed"
+        raise
+    finally:
+        _active_report = None
+        _peaks.stop(report)
+        report.save(path or _ensure_log_directory() / REPORT_FILE)
+
+
+@contextmanager
+def stage(name: str, rows_in: Optional[int] = None,
+          bytes_in: Optional[int] = None) -> Iterator[StageMetrics]:
+    """
+        Measure a stage of the active run report. Stages opened inside
+        another stage are named after it, e.g. "transform.clean_delay.dedup".
+        Outside of run_report this only yields a metrics object to fill.
+
+        Args:
+            name: name of the stage
+            rows_in: rows going into the stage, if known
+            bytes_in: bytes going into the stage, if known
+
+        Yields:
+            StageMetrics: set rows_out and bytes_out on it
+    """
+    path = _stage_path.get() + (name,)
+    metrics = StageMetrics(".".join(path),
+                           datetime.now(timezone.utc).isoformat(),
+                           rows_in=rows_in, bytes_in=bytes_in)
+    report = _active_report
+    if report is None:
+        yield metrics
+        return
+
+    token = _stage_path.set(path)
+    process = psutil.Process()
+    metrics.rss_start_bytes = process.memory_info().rss
+    _peaks.start(metrics)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_time_s = time.perf_counter() - wall_start
+        metrics.cpu_time_s = time.process_time() - cpu_start
+        metrics.rss_end_bytes = process.memory_info().rss
+        _peaks.stop(metrics)
+        if metrics.peak_rss_bytes is not None:
+            # the mark is sampled by the kernel and can trail the RSS
+            metrics.peak_rss_bytes = max(metrics.peak_rss_bytes,
+                                         metrics.rss_start_bytes,
+                                         metrics.rss_end_bytes)
+        _stage_path.reset(token)
+        report.add(metrics)
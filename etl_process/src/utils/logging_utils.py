@@ -1,6 +1,12 @@
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+import multiprocessing
+import os
 from pathlib import Path
 import logging
-from typing import Tuple
+import queue
+import threading
+from typing import Dict, Tuple
 
 
 def _ensure_log_directory(base_path=None):
@@ -18,34 +24,99 @@ def _create_formatter():
     )
 
 
-def _create_handlers(log_directory, log_file, level):
-    """Create file and console handlers."""
-    file_handler = logging.FileHandler(log_directory / log_file)
-    file_handler.setLevel(level)
-
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-
-    formatter = _create_formatter()
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-
-    return file_handler, console_handler
+class _SharedQueueHandler(QueueHandler):
+    """
+    Queue handler of one log file, shared by every logger writing to it.
+
+    Records are handled by the listener thread of the process that created
+    it. In other processes, such as forked workers where that thread does
+    not exist, and once the listener has stopped, records are handled
+    synchronously in the calling thread instead.
+    """
+
+    def __init__(self, listener: QueueListener, asynchronous: bool):
+        super().__init__(listener.queue)
+        self.listener = listener
+        self.pid = os.getpid() if asynchronous else None
+
+    def emit(self, record):
+        if os.getpid() == self.pid:
+            super().emit(record)
+        else:
+            self.listener.handle(record)
+
+
+# Resolved log file path -> the queue handler writing to it
+_queue_handlers: Dict[Path, _SharedQueueHandler] = {}
+_console_handler = None
+_lock = threading.Lock()
+
+
+def _get_console_handler():
+    """Console handler shared by all log files, so lines never interleave."""
+    global _console_handler
+    if _console_handler is None:
+        _console_handler = logging.StreamHandler()
+        _console_handler.setFormatter(_create_formatter())
+    return _console_handler
+
+
+def _create_handlers(log_path):
+    """Create the file handler of a log file and get the console handler."""
+    file_handler = logging.FileHandler(log_path)
+    file_handler.setFormatter(_create_formatter())
+    return file_handler, _get_console_handler()
+
+
+def _get_queue_handler(log_path):
+    """
+    Get the queue handler of a log file, starting its listener thread the
+    first time the file is used. Listener threads are only started in the
+    main process, spawned workers log synchronously.
+    """
+    log_path = Path(log_path).resolve()
+    with _lock:
+        if log_path not in _queue_handlers:
+            listener = QueueListener(queue.SimpleQueue(),
+                                     *_create_handlers(log_path))
+            asynchronous = multiprocessing.parent_process() is None
+            if asynchronous:
+                listener.start()
+            _queue_handlers[log_path] = _SharedQueueHandler(listener,
+                                                            asynchronous)
+        return _queue_handlers[log_path]
+
+
+def stop_logging():
+    """
+    Write out the queued records and stop the listener threads. Logging
+    carries on synchronously afterwards. Registered to run at exit.
+    """
+    with _lock:
+        for handler in _queue_handlers.values():
+            if handler.pid == os.getpid():
+                handler.pid = None
+                handler.listener.stop()
+
+
+atexit.register(stop_logging)
 
 
 def setup_logger(name, log_file, level=logging.DEBUG, base_path=None):
-    """Function to setup a logger; can be used in multiple modules."""
+    """
+    Function to setup a logger; can be used in multiple modules.
+
+    Records are put on a queue and written by a listener thread, with one
+    file handler per log file shared by every logger using it, so logging
+    never blocks on disk I/O.
+    """
     log_directory = _ensure_log_directory(base_path)
 
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
     if not logger.handlers:
-        file_handler, console_handler = _create_handlers(
-            log_directory, log_file, level
-        )
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        logger.addHandler(_get_queue_handler(log_directory / log_file))
 
     return logger
 
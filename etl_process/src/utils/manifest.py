@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from src.utils.logging_utils import setup_logger
+from src.utils.post_data import DATA_DIR, post
+import logging
+
+logger = setup_logger(__name__, "etl_pipeline.log", level=logging.DEBUG)
+
+MANIFEST_PATH = DATA_DIR / "manifest.json"
+# Subdirectory of the data folder holding cached stage outputs
+CACHE_LOCATION = "cache"
+
+
+def hash_file(path: Path, block_size: int = 1 << 20) -> str:
+    """
+        Compute the SHA-256 of a file without loading it whole.
+
+        Args:
+            path: file to hash
+            block_size: bytes read at a time
+
+        Returns:
+            str: hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_config(config: Any) -> str:
+    """
+        Compute a stable SHA-256 of a JSON serialisable value, such as the
+        transform config dicts.
+    """
+    encoded = json.dumps(config, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class RunManifest:
+    """
+        Records, per pipeline stage, the hashes of the stage inputs and of
+        the artifacts it produced.
+
+        A stage whose key (the hash of its inputs) matches the last
+        completed run can be skipped and its cached artifacts reused. Stage
+        keys are chained through the output hashes of the previous stage, so
+        a change to the raw data invalidates every later stage.
+    """
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = path
+        if path.exists():
+            with open(path, "r") as file:
+                self.stages: Dict[str, Dict[str, Any]] = \
+                    json.load(file)["stages"]
+        else:
+            self.stages = {}
+
+    def is_fresh(self, stage: str, key: str) -> bool:
+        """
+            Whether the stage last completed with the same key and all of its
+            cached artifacts still exist.
+        """
+        entry = self.stages.get(stage)
+        if entry is None or entry["key"] != key:
+            return False
+        return all(Path(output["path"]).exists()
+                   for output in entry["outputs"].values())
+
+    def output_hashes(self, stage: str) -> Dict[str, str]:
+        """Hashes of the artifacts of a completed stage, keyed by name."""
+        outputs = self.stages.get(stage, {}).get("outputs", {})
+        return {f"{stage}.{name}": output["sha256"]
+                for name, output in outputs.items()}
+
+    def load_artifacts(self, stage: str) -> List[pd.DataFrame]:
+        """Read the cached artifacts of a stage, in the order they were
+        recorded."""
+        return [pd.read_parquet(output["path"])
+                for output in self.stages[stage]["outputs"].values()]
+
+    def record(self, stage: str, key: str, inputs: Dict[str, str],
+               artifacts: Optional[Dict[str, pd.DataFrame]] = None) -> None:
+        """
+            Cache the artifacts of a completed stage as Parquet and save the
+            manifest.
+
+            Args:
+                stage: name of the stage
+                key: hash of the stage inputs, see hash_config
+                inputs: input name -> hash, kept for inspection
+                artifacts: output name -> DataFrame produced by the stage
+        """
+        outputs = {}
+        for name, data in (artifacts or {}).items():
+            file_name = f"{stage}_{name}.parquet"
+            if not post(CACHE_LOCATION, file_name, data):
+                logger.warning(f"Could not cache {stage} output {name}, "
+                               "the stage will rerun next time")
+                return
+            path = DATA_DIR / CACHE_LOCATION / file_name
+            outputs[name] = {"path": str(path), "sha256": hash_file(path)}
+
+        self.stages[stage] = {
+            "key": key,
+            "inputs": inputs,
+            "outputs": outputs,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest, replacing the previous one atomically."""
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w") as file:
+            json.dump({"stages": self.stages}, file, indent=2)
+        temp_path.replace(self.path)
+        logger.info(f"Run manifest saved to {self.path}")
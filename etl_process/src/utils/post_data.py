@@ -1,32 +1,105 @@
 from pathlib import Path
+import shutil
+from typing import Callable, Dict, Tuple
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.utils.instrumentation import stage
 from src.utils.logging_utils import setup_logger
 import logging
 
 logger = setup_logger(__name__, "extract_data.log", level=logging.DEBUG)
 
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+# Hive partition columns of the datasets written by post_dataset
+PARTITION_COLS = ["year", "month"]
+
+
+def _write_csv(data_path: Path, data: pd.DataFrame) -> None:
+    with open(data_path, "w+", newline='') as file:
+        data.to_csv(file)
+
+
+def _count_csv(data_path: Path) -> int:
+    # CSV has no metadata, so the rows have to be counted (minus the header)
+    with open(data_path, "r") as file:
+        return sum(1 for n in file) - 1
+
+
+def _write_parquet(data_path: Path, data: pd.DataFrame) -> None:
+    data.to_parquet(data_path, index=False)
+
+
+def _count_parquet(data_path: Path) -> int:
+    return pq.read_metadata(data_path).num_rows
+
+
+def _write_feather(data_path: Path, data: pd.DataFrame) -> None:
+    data.reset_index(drop=True).to_feather(data_path)
+
+
+def _write_arrow(data_path: Path, data: pd.DataFrame) -> None:
+    # Uncompressed, so readers can memory-map the file and use the column
+    # buffers in place. Written beside the target and renamed over it, so
+    # a process that still maps the previous file keeps a complete file.
+    temp_path = data_path.with_name(data_path.name + ".tmp")
+    data.reset_index(drop=True).to_feather(temp_path,
+                                           compression="uncompressed")
+    temp_path.replace(data_path)
+
+
+def _count_feather(data_path: Path) -> int:
+    # Record batch lengths live in the IPC footer, no column data is read
+    with pa.memory_map(str(data_path)) as source:
+        reader = pa.ipc.open_file(source)
+        return sum(reader.get_batch(i).num_rows
+                   for i in range(reader.num_record_batches))
+
+
+# File extension -> (writer, row counter)
+OUTPUT_FORMATS: Dict[str, Tuple[Callable[[Path, pd.DataFrame], None],
+                                Callable[[Path], int]]] = {
+    ".csv": (_write_csv, _count_csv),
+    ".parquet": (_write_parquet, _count_parquet),
+    ".feather": (_write_feather, _count_feather),
+    ".arrow": (_write_arrow, _count_feather),
+}
+
 
 def post(location: str, fileName: str, data: pd.DataFrame) -> bool:
     """
-        Save a pandas DataFrame to a CSV file in the specified location.
+        Save a pandas DataFrame to a file in the specified location.
+
+        The output format is chosen from the file extension (see
+        OUTPUT_FORMATS). Parquet and Feather/Arrow IPC files keep the column
+        dtypes and their row counts are checked from the file metadata.
+        Arrow IPC (.arrow) files are written uncompressed, to be memory
+        mapped, while Feather files are compressed.
 
         Args:
-            location (str): Subdirectory within the data folder where the file will be saved
-            fileName (str): Name of the CSV file to create (should include .csv extension)
-            data (pd.DataFrame): DataFrame to save as CSV
+            location (str): Subdirectory within the data folder where the
+            file will be saved
+            fileName (str): Name of the file to create, including one of the
+            extensions in OUTPUT_FORMATS
+            data (pd.DataFrame): DataFrame to save
 
         Returns:
-            bool: True if file was saved successfully, False if an error occurred
+            bool: True if file was saved successfully, False if an error
+            occurred
     """
-    data_path = Path(__file__).parent.parent.parent / "data" / location / fileName
+    data_path = DATA_DIR / location / fileName
     try:
-        with open(data_path, "w+", newline='') as file:
-            data.to_csv(file)
-        expected_rows = len(data) + 1
-        logger.info(f"Contents saved to csv at {data_path}")
-        with open(data_path, "r") as file:
-            actual_rows = sum(1 for n in file)
-        if actual_rows != expected_rows:
+        suffix = data_path.suffix.lower()
+        if suffix not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format '{suffix}'")
+        write, count_rows = OUTPUT_FORMATS[suffix]
+
+        with stage(f"write.{fileName}", rows_in=len(data)) as metrics:
+            write(data_path, data)
+            metrics.rows_out = len(data)
+            metrics.bytes_out = data_path.stat().st_size
+        logger.info(f"Contents saved to {suffix[1:]} at {data_path}")
+        if count_rows(data_path) != len(data):
             logger.warning("Created file does not contain expected rows")
         return True
     except Exception as e:
@@ -34,6 +107,70 @@ def post(location: str, fileName: str, data: pd.DataFrame) -> bool:
         return False
 
 
+def post_dataset(location: str, dirName: str, data: pd.DataFrame,
+                 partition_cols: "list[str]" = PARTITION_COLS) -> bool:
+    """
+        Save a pandas DataFrame as a Hive partitioned Parquet dataset, e.g.
+        <dirName>/year=2024/month=1/part-0.parquet, so readers filtering on
+        the partition columns only open the matching files.
+
+        Every file keeps min/max statistics per column in its footer, and
+        the footers of all partitions are collected in <dirName>/_metadata,
+        so row counts and statistics are known without opening the
+        partitions. The dataset is written beside the target and swapped
+        in once complete.
+
+        Args:
+            location (str): Subdirectory within the data folder where the
+            dataset will be saved
+            dirName (str): Name of the dataset directory
+            data (pd.DataFrame): DataFrame to save, containing
+            partition_cols
+            partition_cols (list[str]): Columns to partition by, in order
+
+        Returns:
+            bool: True if the dataset was saved successfully, False if an
+            error occurred
+    """
+    target = DATA_DIR / location / dirName
+    temp_dir = target.with_name(dirName + ".tmp")
+    old_dir = target.with_name(dirName + ".old")
+    try:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        with stage(f"write.{dirName}", rows_in=len(data)) as metrics:
+            # Group each partition's rows first, otherwise every batch is
+            # split across all partitions and each file holds dozens of
+            # tiny row groups
+            table = pa.Table.from_pandas(data, preserve_index=False) \
+                .sort_by([(col, "ascending") for col in partition_cols])
+            file_metadata = []
+            pq.write_to_dataset(table, temp_dir,
+                                partition_cols=partition_cols,
+                                basename_template="part-{i}.parquet",
+                                metadata_collector=file_metadata)
+            # partition values live in the paths, not in the files
+            file_schema = pa.schema([field for field in table.schema
+                                     if field.name not in partition_cols])
+            pq.write_metadata(file_schema, temp_dir / "_metadata",
+                              metadata_collector=file_metadata)
+            metrics.rows_out = sum(metadata.num_rows
+                                   for metadata in file_metadata)
+
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if target.exists():
+            target.rename(old_dir)
+        temp_dir.rename(target)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        logger.info(f"Contents saved to {len(file_metadata)} partitions "
+                    f"at {target}")
+        if metrics.rows_out != len(data):
+            logger.warning("Created dataset does not contain expected rows")
+        return True
+    except Exception as e:
+        logger.error(f"Could not save dataset - {e}")
+        return False
+
+
 if __name__ == "__main__":
     testDF = pd.DataFrame(
         {
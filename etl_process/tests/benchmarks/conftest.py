@@ -0,0 +1,158 @@
+import json
+import os
+from pathlib import Path
+import timeit
+import pytest
+import logging
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from config.transform_config import AIRPORT_CONFIG, DELAY_CONFIG
+from src.extract import get_airports, get_delay_data
+from src.transform.merge import merge_main
+from src.transform.transformer import Transformer
+from src.utils.get_data import get_raw_file
+from tests.benchmarks.data_generator import (
+    BENCH_SIZES,
+    bench_size,
+    write_raw_files,
+)
+
+# Stored timings per benchmark size, compared against on every run
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+# Fraction a timing may exceed its baseline by before the benchmark fails
+BENCH_TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.5"))
+# Slowdowns below this many seconds are timer noise and never fail
+NOISE_FLOOR_S = 0.05
+# Write this run's timings to the baseline instead of comparing
+UPDATE_BASELINE = os.getenv("BENCH_UPDATE_BASELINE", "False") == "True"
+
+# benchmark name -> (seconds, baseline seconds or None) of this run
+_timings = {}
+
+
+@pytest.fixture(autouse=True)
+def disable_logging():
+    """Disable logging during benchmarks"""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def engine(request):
+    """
+    SQLAlchemy engine on the pytest-postgresql test database. The database
+    benchmarks are skipped when pytest-postgresql is missing or cannot start
+    a server, e.g. without a local PostgreSQL install.
+    """
+    try:
+        postgresql = request.getfixturevalue("postgresql")
+    except Exception as error:
+        pytest.skip(f"No PostgreSQL server for the benchmark: {error}")
+    info = postgresql.info
+    engine = create_engine(
+        f"postgresql+psycopg://{info.user}:{info.password or ''}@"
+        f"{info.host}:{info.port}/{info.dbname}"
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE SCHEMA IF NOT EXISTS de_2506_a"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def raw_dir(tmp_path_factory):
+    """Raw data folder with synthetic files of the selected BENCH_SIZE"""
+    directory = tmp_path_factory.mktemp("raw")
+    write_raw_files(directory, BENCH_SIZES[bench_size()])
+    return directory
+
+
+@pytest.fixture(scope="session")
+def raw_path(raw_dir):
+    """Point get_raw_file at the synthetic raw data folder"""
+    with patch('src.utils.get_data._raw_path', lambda name: raw_dir / name):
+        yield
+
+
+@pytest.fixture(scope="session")
+def raw_delay(raw_path):
+    """Delay data as read by extract_delay_data, before sorting"""
+    return get_raw_file("Airline_Delay_Cause.csv",
+                        **get_delay_data.READ_OPTIONS)
+
+
+@pytest.fixture(scope="session")
+def clean_airports(raw_path):
+    """Cleaned US airports, as passed to merge_main"""
+    airports = get_raw_file("airports.csv", **get_airports.READ_OPTIONS)
+    airports = airports[airports["country"] == "United States"]
+    return Transformer(airports.drop(columns="country"),
+                       AIRPORT_CONFIG["crit_cols"],
+                       AIRPORT_CONFIG["col_types"]).clean()
+
+
+@pytest.fixture(scope="session")
+def clean_delay(raw_delay):
+    """Cleaned delay data, as passed to merge_main"""
+    return Transformer(raw_delay, DELAY_CONFIG["crit_cols"],
+                       DELAY_CONFIG["col_types"]).clean()
+
+
+@pytest.fixture(scope="session")
+def merged(clean_airports, clean_delay):
+    """Output of merge_main"""
+    return merge_main(clean_airports, clean_delay)
+
+
+def _load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, "r") as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def timed():
+    """
+    Run a function under a benchmark name, record its wall time and fail
+    if it is more than BENCH_TOLERANCE slower than the stored baseline of
+    the same size. Returns the result of the function.
+    """
+    baseline = _load_baseline().get(bench_size(), {})
+
+    def run(name, func, *args, **kwargs):
+        start_time = timeit.default_timer()
+        result = func(*args, **kwargs)
+        elapsed = timeit.default_timer() - start_time
+        expected = baseline.get(name)
+        _timings[name] = (elapsed, expected)
+        if not UPDATE_BASELINE and expected is not None and \
+                elapsed > expected * (1 + BENCH_TOLERANCE) and \
+                elapsed - expected > NOISE_FLOOR_S:
+            pytest.fail(f"{name} took {elapsed:.3f}s, baseline "
+                        f"{expected:.3f}s (+{BENCH_TOLERANCE:.0%} allowed)")
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _timings:
+        return
+    size = bench_size()
+    terminalreporter.section(f"benchmarks ({size})")
+    for name, (elapsed, expected) in sorted(_timings.items()):
+        change = "no baseline" if expected is None else \
+            f"baseline {expected:.3f}s ({elapsed / expected - 1:+.0%})"
+        terminalreporter.write_line(f"{name:40s} {elapsed:8.3f}s  {change}")
+
+    if UPDATE_BASELINE:
+        baseline = _load_baseline()
+        baseline.setdefault(size, {}).update(
+            {name: round(elapsed, 4)
+             for name, (elapsed, _) in _timings.items()})
+        with open(BASELINE_PATH, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+            file.write("\n")
+        terminalreporter.write_line(f"Baseline updated at {BASELINE_PATH}")
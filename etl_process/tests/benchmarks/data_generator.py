@@ -0,0 +1,162 @@
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+CAUSES = ["carrier", "weather", "nas", "security", "late_aircraft"]
+# Delay rows of each benchmark size, chosen with the BENCH_SIZE variable
+BENCH_SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+# Delay rows generated and written to CSV at a time
+WRITE_CHUNK_ROWS = 1_000_000
+CARRIERS = {"AA": "American Airlines Inc.", "DL": "Delta Air Lines Inc.",
+            "UA": "United Air Lines Inc.", "WN": "Southwest Airlines Co.",
+            "B6": "JetBlue Airways", "AS": "Alaska Airlines Inc."}
+
+
+def _airport_names(count: int):
+    """IATA codes and BTS style 'City, ST: Name' airport names"""
+    codes = [f"{chr(65 + i // 676)}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}"
+             for i in range(count)]
+    states = ["NY", "CA", "TX", "FL", "IL", "GA", "WA", "CO"]
+    names = [f"City {code}, {states[i % len(states)]}: {code} Airport"
+             for i, code in enumerate(codes)]
+    return codes, names
+
+
+def delay_frame(rows: int, duplicate_rate: float = 0.01,
+                null_rate: float = 0.01, seed: int = 0) -> pd.DataFrame:
+    """
+    Raw Airline_Delay_Cause.csv shaped frame, including duplicate rows and
+    nulls in both critical and non-critical columns.
+    """
+    rng = np.random.default_rng(seed)
+    codes, names = _airport_names(400)
+    airport = rng.integers(0, len(codes), rows)
+    carrier = rng.choice(list(CARRIERS), rows)
+    data = {
+        "year": rng.integers(2003, 2025, rows).astype(float),
+        "month": rng.integers(1, 13, rows),
+        "carrier": carrier,
+        "carrier_name": pd.Series(carrier).map(CARRIERS).to_numpy(),
+        "airport": np.asarray(codes)[airport],
+        "airport_name": np.asarray(names)[airport],
+        "arr_flights": rng.integers(0, 5000, rows).astype(float),
+        "arr_del15": rng.integers(0, 1000, rows).astype(float),
+    }
+    for cause in CAUSES:
+        data[f"{cause}_ct"] = rng.random(rows) * 100
+    data.update({
+        "arr_cancelled": rng.integers(0, 50, rows).astype(float),
+        "arr_diverted": rng.integers(0, 10, rows).astype(float),
+        "arr_delay": rng.integers(0, 50000, rows).astype(float),
+    })
+    for cause in CAUSES:
+        data[f"{cause}_delay"] = rng.integers(0, 10000, rows).astype(float)
+    frame = pd.DataFrame(data)
+
+    for col in ["airport_name", "arr_flights", "carrier_ct", "arr_delay"]:
+        frame.loc[rng.random(rows) < null_rate, col] = None
+
+    duplicates = frame.sample(frac=duplicate_rate, random_state=seed)
+    return pd.concat([frame, duplicates], ignore_index=True)
+
+
+def airport_frame(count: int = 350) -> pd.DataFrame:
+    """
+    Cleaned airports frame holding the first `count` of the 400 codes used
+    by delay_frame, the delay rows of the other codes are unmatched.
+    """
+    codes, _ = _airport_names(count)
+    return pd.DataFrame({
+        "name": [f"{code} Airport" for code in codes],
+        "city": [f"City {code}" for code in codes],
+        "iata": codes,
+        "lat": np.linspace(25, 48, count),
+        "lon": np.linspace(-120, -70, count),
+        "alt": np.linspace(0, 2000, count),
+    }).astype({"name": "string", "city": "string", "iata": "string"})
+
+
+def merged_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Frame with the columns and dtypes of merge_main output"""
+    rng = np.random.default_rng(seed)
+    data = {
+        "year": rng.integers(2003, 2025, rows),
+        "month": rng.integers(1, 13, rows),
+        "carrier": rng.choice(list(CARRIERS), rows),
+        "carrier_name": rng.choice(list(CARRIERS.values()), rows),
+        "arr_flights": rng.integers(0, 5000, rows),
+        "arr_cancelled": rng.integers(0, 50, rows),
+        "arr_diverted": rng.integers(0, 10, rows),
+        "arr_delay": rng.integers(0, 50000, rows),
+    }
+    for cause in CAUSES:
+        data[f"{cause}_delay"] = rng.integers(0, 10000, rows)
+        data[f"{cause}_ct"] = rng.random(rows) * 100
+    data.update({
+        "name": rng.choice(["Airport A", "Airport B"], rows),
+        "city": rng.choice(["City A", "City B"], rows),
+        "iata": rng.choice(["AAA", "BBB"], rows),
+        "lat": rng.random(rows) * 50,
+        "lon": rng.random(rows) * -120,
+        "alt": rng.random(rows) * 1000,
+        "state": rng.choice(["NY", "CA", "TX"], rows),
+    })
+    frame = pd.DataFrame(data)
+    frame["total_ct"] = frame.filter(like="_ct").sum(axis=1)
+    frame["arr_flights_pct"] = round(
+        frame["total_ct"] / frame["arr_flights"].clip(lower=1) * 100, 2)
+    str_cols = ["carrier", "carrier_name", "name", "city", "iata", "state"]
+    return frame.astype({col: "string" for col in str_cols})
+
+
+def bench_size() -> str:
+    """Benchmark size selected with BENCH_SIZE, one of BENCH_SIZES"""
+    size = os.getenv("BENCH_SIZE", "10k")
+    if size not in BENCH_SIZES:
+        raise ValueError(f"Unknown BENCH_SIZE {size}, expected one of "
+                         f"{list(BENCH_SIZES)}")
+    return size
+
+
+def raw_airport_frame(count: int = 350) -> pd.DataFrame:
+    """
+    Raw airports.csv shaped frame holding the first `count` of the 400 codes
+    used by delay_frame, so the delay rows of the other codes are unmatched.
+    Every tenth airport is outside the United States, and icao and alt
+    are partly null, written as \\N like the source file.
+    """
+    codes, _ = _airport_names(count)
+    index = np.arange(count)
+    return pd.DataFrame({
+        "id": index,
+        "name": [f"{code} Airport" for code in codes],
+        "city": [f"City {code}" for code in codes],
+        "country": np.where(index % 10 == 9, "Canada", "United States"),
+        "iata": codes,
+        "icao": [f"K{code}" if i % 3 else "\\N"
+                 for i, code in enumerate(codes)],
+        "lat": np.linspace(25, 48, count),
+        "lon": np.linspace(-120, -70, count),
+        "alt": [str(i * 5) if i % 4 else "\\N" for i in index],
+        "tz": -5,
+        "dst": "A",
+        "timezone": "America/New_York",
+        "type": "airport",
+        "source": "OurAirports",
+    })
+
+
+def write_raw_files(directory: Path, rows: int, seed: int = 0) -> None:
+    """
+    Write airports.csv and an Airline_Delay_Cause.csv of `rows` delay rows
+    plus duplicates to directory. The delay file is generated
+    WRITE_CHUNK_ROWS at a time, so 10M rows never sit in memory at once.
+    """
+    raw_airport_frame().to_csv(directory / "airports.csv", index=False)
+    delay_path = directory / "Airline_Delay_Cause.csv"
+    for i, start in enumerate(range(0, rows, WRITE_CHUNK_ROWS)):
+        chunk = delay_frame(min(WRITE_CHUNK_ROWS, rows - start),
+                            seed=seed + i)
+        chunk.to_csv(delay_path, mode="w" if i == 0 else "a",
+                     header=i == 0, index=False)
@@ -0,0 +1,36 @@
+import os
+import timeit
+from unittest.mock import patch
+import pytest
+from sqlalchemy import text
+from src.load.load_database import load_to_database, write_table
+from tests.benchmarks.data_generator import merged_frame
+
+pytest.importorskip("pytest_postgresql")
+
+BENCH_LOAD_ROWS = int(os.getenv("BENCH_LOAD_ROWS", "20000"))
+
+
+@pytest.mark.parametrize("method", ["insert", "copy"])
+def test_write_table_benchmark(engine, method):
+    """Time a full replace of the target table with each load method"""
+    data = merged_frame(BENCH_LOAD_ROWS)
+
+    start_time = timeit.default_timer()
+    rows = write_table(engine, data, method)
+    elapsed = timeit.default_timer() - start_time
+
+    with engine.connect() as conn:
+        loaded = conn.execute(
+            text("SELECT COUNT(*) FROM de_2506_a.sam_capstone")).scalar()
+    assert rows == loaded == BENCH_LOAD_ROWS
+    print(f"\n{method}: {BENCH_LOAD_ROWS} rows in {elapsed:.3f}s "
+          f"({BENCH_LOAD_ROWS / elapsed:.0f} rows/s)")
+
+
+def test_load_to_database_benchmark(engine, merged, timed):
+    """Time loading the merged synthetic data of the selected BENCH_SIZE,
+    including the row and column count validation"""
+    with patch('src.load.load_database.create_db_engine',
+               return_value=engine):
+        assert timed("load_to_database", load_to_database, merged)
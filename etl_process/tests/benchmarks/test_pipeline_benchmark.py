@@ -0,0 +1,44 @@
+from unittest.mock import patch
+import pytest
+from config.transform_config import DELAY_CONFIG
+from src.extract import get_airports, get_delay_data
+from src.transform.merge import merge_main
+from src.transform.transformer import Transformer
+from src.utils.get_data import get_raw_file
+from src.utils.post_data import post
+
+RAW_FILES = {
+    "airports.csv": get_airports.READ_OPTIONS,
+    "Airline_Delay_Cause.csv": get_delay_data.READ_OPTIONS,
+}
+
+
+@pytest.mark.parametrize("file_name", RAW_FILES)
+def test_get_raw_file_benchmark(raw_path, timed, file_name):
+    data = timed(f"get_raw_file.{file_name}", get_raw_file, file_name,
+                 **RAW_FILES[file_name])
+    assert not data.empty
+
+
+def test_clean_benchmark(raw_delay, timed):
+    transformer = Transformer(raw_delay, DELAY_CONFIG["crit_cols"],
+                              DELAY_CONFIG["col_types"])
+    result = timed("Transformer.clean", transformer.clean)
+    stats = transformer.stats
+    assert stats["duplicates"] > 0 and stats["rows_dropped"] > 0
+    assert len(result) == stats["rows"] - stats["duplicates"] \
+        - stats["rows_dropped"]
+
+
+def test_merge_benchmark(clean_airports, clean_delay, timed):
+    result = timed("merge_main", merge_main, clean_airports, clean_delay)
+    # delay rows of airports missing from airports.csv are dropped
+    assert 0 < len(result) < len(clean_delay)
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_post_benchmark(merged, timed, tmp_path, file_format):
+    (tmp_path / "output").mkdir()
+    with patch('src.utils.post_data.DATA_DIR', tmp_path):
+        assert timed(f"post.{file_format}", post, "output",
+                     f"merged_data.{file_format}", merged)
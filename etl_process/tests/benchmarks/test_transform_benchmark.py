@@ -0,0 +1,87 @@
+import os
+import timeit
+import tracemalloc
+import pandas as pd
+import pytest
+from src.transform.transform import DELAY_CONFIG
+from src.transform.airport_index import AirportIndex
+from src.transform.transformer import Transformer
+from tests.benchmarks.data_generator import (
+    BENCH_SIZES,
+    airport_frame,
+    bench_size,
+    delay_frame,
+)
+
+BENCH_TRANSFORM_ROWS = int(os.getenv("BENCH_TRANSFORM_ROWS",
+                                     BENCH_SIZES[bench_size()]))
+
+
+def _method_chain(transformer: Transformer) -> pd.DataFrame:
+    transformer.remove_duplicates()
+    transformer.format_columns()
+    transformer.handle_nulls()
+    transformer.format_data_types()
+    return transformer.clean_data
+
+
+def _fused(transformer: Transformer) -> pd.DataFrame:
+    return transformer.clean()
+
+
+@pytest.fixture(scope="module")
+def raw_delay():
+    return delay_frame(BENCH_TRANSFORM_ROWS)
+
+
+@pytest.mark.parametrize("clean", [_method_chain, _fused])
+def test_clean_benchmark(raw_delay, clean):
+    """Peak traced memory and wall time of one clean of the delay data"""
+    transformer = Transformer(raw_delay.copy(),
+                              DELAY_CONFIG["crit_cols"],
+                              DELAY_CONFIG["col_types"])
+
+    tracemalloc.start()
+    start_time = timeit.default_timer()
+    result = clean(transformer)
+    elapsed = timeit.default_timer() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert not result.isna().any().any()
+    print(f"\n{clean.__name__}: {len(raw_delay)} rows in {elapsed:.3f}s, "
+          f"peak {peak / 2 ** 20:.0f} MiB")
+
+
+@pytest.fixture(scope="module")
+def clean_delay(raw_delay):
+    return Transformer(raw_delay, DELAY_CONFIG["crit_cols"],
+                       DELAY_CONFIG["col_types"]).clean()
+
+
+def _merge_join(airports: pd.DataFrame,
+                delays: pd.DataFrame) -> pd.DataFrame:
+    return delays.merge(airports, left_on="airport", right_on="iata",
+                        how="left").dropna()
+
+
+def _index_join(airports: pd.DataFrame,
+                delays: pd.DataFrame) -> pd.DataFrame:
+    return AirportIndex(airports).join(delays, on="airport")
+
+
+@pytest.mark.parametrize("join", [_merge_join, _index_join])
+def test_airport_join_benchmark(clean_delay, join):
+    """Wall time and peak traced memory of attaching the airport columns"""
+    airports = airport_frame()
+
+    tracemalloc.start()
+    start_time = timeit.default_timer()
+    result = join(airports, clean_delay)
+    elapsed = timeit.default_timer() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result["iata"].notna().all()
+    print(f"\n{join.__name__}: {len(result)} of {len(clean_delay)} rows in "
+          f"{elapsed:.3f}s, peak {peak / 2 ** 20:.0f} MiB")
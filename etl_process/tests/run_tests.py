@@ -1,3 +1,4 @@
+import os
 import sys
 import subprocess
 
@@ -10,7 +11,9 @@ def main():
         'unit': {'dir': 'tests/unit_tests', 'cov': ['config', 'src']},
         'integration': {'dir': 'tests/integration_tests', 'cov': []},
         'component': {'dir': 'tests/component_tests', 'cov': []},
-        'all': {'dir': 'tests', 'cov': ['config', 'etl']},
+        # The benchmarks are run on their own, see bench
+        'all': {'dir': 'tests --ignore=tests/benchmarks',
+                'cov': ['config', 'etl']},
     }
 
     # Check to see if a command was supplied for the test run
@@ -32,6 +35,14 @@ def main():
             cov_command = f'ENV=test pytest --verbose {test_dir}'
 
         subprocess.run(cov_command, shell=True)
+    elif command == 'bench':
+        # Optional size of the synthetic data, see BENCH_SIZES
+        if len(sys.argv) > 2:
+            os.environ['BENCH_SIZE'] = sys.argv[2]
+        subprocess.run(
+            'ENV=test pytest --verbose tests/benchmarks',
+            shell=True
+        )
     elif command == 'lint':
         subprocess.run(['flake8', '.'])
     else:
@@ -41,7 +52,8 @@ def main():
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         raise ValueError(
-            "Usage: run_tests.py <unit|integration|component|all|lint>"
+            "Usage: run_tests.py "
+            "<unit|integration|component|all|lint|bench [10k|1m|10m]>"
         )
     else:
         main()
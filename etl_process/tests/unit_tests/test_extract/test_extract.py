@@ -1,6 +1,7 @@
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
-from src.extract.extract import extract_main
+from src.extract.extract import extract_main, extract_stream_main
 
 
 class TestExtractMain:
@@ -18,3 +19,61 @@ class TestExtractMain:
 
         with pytest.raises(Exception, match="Extraction failed"):
             extract_main()
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    @patch('src.extract.extract.extract_delay_data')
+    @patch('src.extract.extract.extract_airport_locations')
+    def test_extract_main_returns_both_sources(self, mock_extract_airports,
+                                               mock_extract_delays, parallel):
+        """Test that both modes return (airports, delays) in order"""
+        airports, delays = MagicMock(), MagicMock()
+        mock_extract_airports.return_value = airports
+        mock_extract_delays.return_value = delays
+
+        assert extract_main(parallel=parallel) == (airports, delays)
+        mock_extract_airports.assert_called_once()
+        mock_extract_delays.assert_called_once()
+
+    @patch('src.extract.extract.extract_delay_data')
+    @patch('src.extract.extract.extract_airport_locations')
+    def test_extract_main_parallel_propagates_error(self,
+                                                    mock_extract_airports,
+                                                    mock_extract_delays):
+        """Test that an error in an extraction thread is raised"""
+        mock_extract_delays.side_effect = KeyError("Missing columns")
+
+        with pytest.raises(KeyError, match="Missing columns"):
+            extract_main(parallel=True)
+
+    @patch('src.extract.extract.extract_delay_data')
+    @patch('src.extract.extract.extract_airport_locations')
+    def test_extract_main_parallel_runs_concurrently(self,
+                                                     mock_extract_airports,
+                                                     mock_extract_delays):
+        """Test that both extractions run at the same time"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other():
+            # Raises BrokenBarrierError if the calls run one after the other
+            barrier.wait()
+            return MagicMock()
+
+        mock_extract_airports.side_effect = wait_for_other
+        mock_extract_delays.side_effect = wait_for_other
+
+        extract_main(parallel=True)
+
+
+class TestExtractStreamMain:
+
+    @patch('src.extract.extract.extract_delay_data_chunks')
+    @patch('src.extract.extract.extract_airport_locations')
+    def test_extract_stream_main(self, mock_extract_airports,
+                                 mock_extract_chunks):
+        """Test that airports are read whole and delays as chunks"""
+        airports, chunks = MagicMock(), MagicMock()
+        mock_extract_airports.return_value = airports
+        mock_extract_chunks.return_value = chunks
+
+        assert extract_stream_main(1000) == (airports, chunks)
+        mock_extract_chunks.assert_called_once_with(1000)
@@ -7,6 +7,15 @@ from src.extract.get_airports import extract_airport_locations
 # All mock data is AI generated
 class TestExtractAirportLocations:
 
+    @pytest.fixture(autouse=True)
+    def mock_get_raw_header(self):
+        with patch('src.extract.get_airports.get_raw_header',
+                   return_value=['id', 'name', 'city', 'country', 'iata',
+                                 'icao', 'lat', 'lon', 'alt', 'tz', 'dst',
+                                 'timezone', 'type', 'source']
+                   ) as mock_header:
+            yield mock_header
+
     @patch('src.extract.get_airports.get_raw_file')
     def test_extract_airport_locations_success(self, mock_get_raw_file):
         """Test successful extraction of US airports"""
@@ -35,13 +44,14 @@ class TestExtractAirportLocations:
         assert all(result['iata'].isin(['AAA', 'BBB']))
 
     @patch('src.extract.get_airports.get_raw_file')
-    def test_missing_columns_raises_error(self, mock_get_raw_file):
-        """Test that missing columns raise KeyError"""
-        mock_data = pd.DataFrame({'id': [1], 'name': ['Airport']})
-        mock_get_raw_file.return_value = mock_data
+    def test_missing_columns_raises_error(self, mock_get_raw_file,
+                                          mock_get_raw_header):
+        """Test that missing columns raise KeyError before parsing"""
+        mock_get_raw_header.return_value = ['id', 'name']
 
         with pytest.raises(KeyError, match="Missing expected columns"):
             extract_airport_locations()
+        mock_get_raw_file.assert_not_called()
 
     @patch('src.extract.get_airports.get_raw_file')
     def test_no_us_airports_raises_error(self, mock_get_raw_file):
@@ -58,17 +68,37 @@ class TestExtractAirportLocations:
             extract_airport_locations()
 
     @patch('src.extract.get_airports.get_raw_file')
-    def test_replaces_null_values(self, mock_get_raw_file):
-        """Test that \\N values are replaced with None"""
-        mock_data = pd.DataFrame({
-            'id': [1], 'name': ['Airport'], 'city': ['\\N'], 'country': ['United States'],
-            'iata': ['AAA'], 'icao': ['AAAA'], 'lat': [40.0], 'lon': [-74.0],
-            'alt': ['\\N'], 'tz': ['EST'], 'dst': ['A'], 'timezone': ['America/New_York'],
-            'type': ['airport'], 'source': ['OurAirports']
+    def test_reads_with_typed_options(self, mock_get_raw_file):
+        """Test that columns, dtypes and \\N nulls are pushed to the reader"""
+        mock_get_raw_file.return_value = pd.DataFrame({
+            'name': ['Airport'], 'city': [None], 'country': ['United States'],
+            'iata': ['AAA'], 'lat': [40.0], 'lon': [-74.0], 'alt': [None]
         })
-        mock_get_raw_file.return_value = mock_data
 
         result = extract_airport_locations()
 
+        options = mock_get_raw_file.call_args[1]
+        assert options['na_values'] == ['\\N']
+        assert set(options['usecols']) == {'name', 'city', 'country', 'iata',
+                                           'lat', 'lon', 'alt'}
+        assert options['dtype']['iata'] == 'string'
+        assert options['dtype']['lat'] == 'float64'
+        assert result['city'].isna().iloc[0]
+        assert result['alt'].isna().iloc[0]
+
+    def test_parses_null_values(self, tmp_path):
+        """Test that \\N values in the file are read as nulls"""
+        path = tmp_path / "airports.csv"
+        path.write_text(
+            "id,name,city,country,iata,icao,lat,lon,alt,tz,dst,timezone,"
+            "type,source\n"
+            "1,Airport,\\N,United States,AAA,AAAA,40.0,-74.0,\\N,-5,A,"
+            "America/New_York,airport,OurAirports\n"
+        )
+        with patch('src.utils.get_data._raw_path', return_value=path):
+            result = extract_airport_locations()
+
         assert result['city'].isna().iloc[0]
         assert result['alt'].isna().iloc[0]
+        assert result['alt'].dtype == 'float64'
+        assert result['name'].dtype == 'string'
@@ -1,12 +1,22 @@
 import pytest
 import pandas as pd
 from unittest.mock import patch
-from src.extract.get_delay_data import extract_delay_data
+from src.extract.get_delay_data import (
+    EXPECTED_SCHEMA,
+    extract_delay_data,
+    extract_delay_data_chunks,
+)
 
 
 # All mock data is AI generated
 class TestExtractDelayData:
 
+    @pytest.fixture(autouse=True)
+    def mock_get_raw_header(self):
+        with patch('src.extract.get_delay_data.get_raw_header',
+                   return_value=list(EXPECTED_SCHEMA)) as mock_header:
+            yield mock_header
+
     @patch('src.extract.get_delay_data.get_raw_file')
     def test_extract_delay_data_success(self, mock_get_raw_file):
         """Test successful extraction of delay data"""
@@ -45,13 +55,29 @@ class TestExtractDelayData:
         assert all(col in result.columns for col in mock_data.columns)
 
     @patch('src.extract.get_delay_data.get_raw_file')
-    def test_missing_columns_raises_error(self, mock_get_raw_file):
-        """Test that missing columns raise KeyError"""
-        mock_data = pd.DataFrame({'year': [2023], 'month': [1]})
-        mock_get_raw_file.return_value = mock_data
+    def test_missing_columns_raises_error(self, mock_get_raw_file,
+                                          mock_get_raw_header):
+        """Test that missing columns raise KeyError before parsing"""
+        mock_get_raw_header.return_value = ['year', 'month']
 
         with pytest.raises(KeyError, match="Missing expected columns"):
             extract_delay_data()
+        mock_get_raw_file.assert_not_called()
+
+    @patch('src.extract.get_delay_data.get_raw_file')
+    def test_reads_with_typed_options(self, mock_get_raw_file):
+        """Test that the schema is pushed down into the reader"""
+        mock_get_raw_file.return_value = pd.DataFrame(
+            {col: [1] for col in EXPECTED_SCHEMA})
+
+        extract_delay_data()
+
+        options = mock_get_raw_file.call_args[1]
+        assert options['usecols'] == EXPECTED_SCHEMA
+        assert options['dtype']['carrier'] == 'category'
+        assert options['dtype']['airport'] == 'category'
+        assert options['dtype']['airport_name'] == 'string'
+        assert options['dtype']['carrier_ct'] == 'float64'
 
     @patch('src.extract.get_delay_data.get_raw_file')
     def test_empty_data_raises_error(self, mock_get_raw_file):
@@ -119,3 +145,46 @@ class TestExtractDelayData:
         assert result.iloc[0]['year'] == 2022
         assert result.iloc[1]['year'] == 2023 and result.iloc[1]['month'] == 1
         assert result.iloc[2]['year'] == 2023 and result.iloc[2]['month'] == 2
+
+
+class TestExtractDelayDataChunks:
+
+    @pytest.fixture
+    def header(self):
+        return list(EXPECTED_SCHEMA)
+
+    @patch('src.extract.get_delay_data.get_raw_file_chunks')
+    @patch('src.extract.get_delay_data.get_raw_header')
+    def test_yields_chunks(self, mock_header, mock_chunks, header):
+        """Test that chunks are passed through after header validation"""
+        chunk = pd.DataFrame({col: [1, 2] for col in header})
+        mock_header.return_value = header
+        mock_chunks.return_value = iter([chunk, chunk])
+
+        result = list(extract_delay_data_chunks(chunksize=2))
+
+        assert len(result) == 2
+        mock_header.assert_called_once_with("Airline_Delay_Cause.csv")
+        assert mock_chunks.call_args[0] == ("Airline_Delay_Cause.csv", 2)
+        assert mock_chunks.call_args[1]['usecols'] == EXPECTED_SCHEMA
+
+    @patch('src.extract.get_delay_data.get_raw_file_chunks')
+    @patch('src.extract.get_delay_data.get_raw_header')
+    def test_missing_columns_raises_before_reading(self, mock_header,
+                                                   mock_chunks):
+        """Test that the schema is checked on the header only"""
+        mock_header.return_value = ['year', 'month']
+
+        with pytest.raises(KeyError, match="Missing expected columns"):
+            list(extract_delay_data_chunks())
+        mock_chunks.assert_not_called()
+
+    @patch('src.extract.get_delay_data.get_raw_file_chunks')
+    @patch('src.extract.get_delay_data.get_raw_header')
+    def test_empty_file_raises_error(self, mock_header, mock_chunks, header):
+        """Test that a file without rows raises ValueError"""
+        mock_header.return_value = header
+        mock_chunks.return_value = iter([])
+
+        with pytest.raises(ValueError, match="No delay extracted"):
+            list(extract_delay_data_chunks())
@@ -0,0 +1,71 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from unittest.mock import MagicMock
+from src.load.copy_loader import (
+    build_create_table,
+    copy_batches,
+    copy_dataframe,
+    pg_type,
+)
+
+
+class TestCopyLoader:
+
+    @pytest.fixture
+    def sample_data(self):
+        return pd.DataFrame({
+            'year': [2023, 2023, 2024],
+            'carrier': ['AA', None, 'DL'],
+            'carrier_ct': [1.5, None, 2.5],
+        }).astype({'year': 'int64', 'carrier': 'string'})
+
+    @pytest.mark.parametrize("dtype, expected", [
+        ('int64', 'BIGINT'),
+        ('Int64', 'BIGINT'),
+        ('float64', 'DOUBLE PRECISION'),
+        ('bool', 'BOOLEAN'),
+        ('string', 'TEXT'),
+        ('category', 'TEXT'),
+        ('object', 'TEXT'),
+        ('datetime64[ns]', 'TIMESTAMP'),
+    ])
+    def test_pg_type(self, dtype, expected):
+        assert pg_type(pd.Series([], dtype=dtype).dtype) == expected
+
+    def test_build_create_table(self, sample_data):
+        statement = build_create_table(sample_data, 'sam_capstone',
+                                       'de_2506_a')
+        assert statement.as_string(None) == (
+            'CREATE TABLE "de_2506_a"."sam_capstone" '
+            '("year" BIGINT, "carrier" TEXT, "carrier_ct" DOUBLE PRECISION)'
+        )
+
+    def test_copy_dataframe_batches(self, sample_data):
+        conn = MagicMock()
+        copy = conn.cursor.return_value.__enter__.return_value \
+            .copy.return_value.__enter__.return_value
+
+        rows = copy_dataframe(conn, sample_data, 'sam_capstone',
+                              'de_2506_a', batch_size=2)
+
+        assert rows == 3
+        writes = [bytes(c[0][0]) for c in copy.write.call_args_list]
+        assert writes == [b'2023,"AA",1.5\n2023,,\n', b'2024,"DL",2.5\n']
+
+    def test_copy_dataframe_invalid_batch_size(self, sample_data):
+        with pytest.raises(ValueError, match="batch_size must be positive"):
+            copy_dataframe(MagicMock(), sample_data, 't', 's', batch_size=0)
+
+    def test_copy_batches(self, sample_data):
+        conn = MagicMock()
+        copy = conn.cursor.return_value.__enter__.return_value \
+            .copy.return_value.__enter__.return_value
+        batches = pa.Table.from_pandas(sample_data, preserve_index=False) \
+            .to_batches(max_chunksize=2)
+
+        rows = copy_batches(conn, batches, list(sample_data.columns),
+                            'sam_capstone', 'de_2506_a')
+
+        assert rows == 3
+        assert copy.write.call_count == 2
@@ -0,0 +1,133 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from src.load.incremental import (
+    build_upsert,
+    start_period,
+    sync_watermark,
+    upsert_table,
+)
+
+
+class TestIncremental:
+
+    @pytest.fixture
+    def sample_data(self):
+        return pd.DataFrame({
+            'year': [2024, 2024, 2025],
+            'month': [4, 5, 1],
+            'carrier': ['AA', 'AA', 'DL'],
+            'iata': ['JFK', 'JFK', 'LAX'],
+            'arr_flights': [100, 120, 90]
+        })
+
+    @pytest.fixture
+    def engine(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def cursor(self, engine):
+        return engine.begin.return_value.__enter__.return_value \
+            .connection.driver_connection.cursor.return_value \
+            .__enter__.return_value
+
+    def test_build_upsert(self):
+        statement = build_upsert(['year', 'month', 'carrier', 'iata',
+                                  'arr_flights'], 'sam_capstone', 'de_2506_a')
+        query = statement.as_string(None)
+        assert query.startswith('INSERT INTO "de_2506_a"."sam_capstone"')
+        # the last staging row of a repeated key wins
+        assert 'ORDER BY "year", "month", "carrier", "iata", ctid DESC' \
+            in query
+        assert ('ON CONFLICT ("year", "month", "carrier", "iata") '
+                'DO UPDATE SET "arr_flights" = EXCLUDED."arr_flights"'
+                ) in query
+        assert query.endswith('WHERE ("sam_capstone"."arr_flights") '
+                              'IS DISTINCT FROM (EXCLUDED."arr_flights")')
+
+    @patch('src.load.incremental.copy_dataframe')
+    def test_upsert_first_load_sends_everything(self, mock_copy, engine,
+                                                cursor, sample_data):
+        cursor.fetchone.return_value = None
+        cursor.rowcount = 3
+
+        assert upsert_table(engine, sample_data, 'sam_capstone',
+                            'de_2506_a') == (3, None)
+        assert len(mock_copy.call_args[0][1]) == 3
+        watermark_args = cursor.execute.call_args_list[-1][0][1]
+        assert watermark_args == ('sam_capstone', 2025, 1)
+
+    @patch('src.load.incremental.copy_dataframe')
+    def test_upsert_sends_periods_from_watermark(self, mock_copy, engine,
+                                                 cursor, sample_data):
+        cursor.fetchone.return_value = (2024, 5)
+        cursor.rowcount = 1
+
+        assert upsert_table(engine, sample_data, 'sam_capstone',
+                            'de_2506_a') == (1, (2024, 5))
+
+        copied = mock_copy.call_args[0][1]
+        assert copied['month'].tolist() == [5, 1]
+
+    @patch('src.load.incremental.copy_dataframe')
+    def test_upsert_sends_lookback_months(self, mock_copy, engine, cursor,
+                                          sample_data):
+        cursor.fetchone.return_value = (2025, 1)
+        cursor.rowcount = 2
+
+        upsert_table(engine, sample_data, 'sam_capstone', 'de_2506_a',
+                     lookback_months=8)
+
+        copied = mock_copy.call_args[0][1]
+        assert copied['month'].tolist() == [5, 1]
+
+    def test_start_period(self):
+        assert start_period((2025, 3)) == (2025, 3)
+        assert start_period((2025, 3), 3) == (2024, 12)
+        assert start_period((2025, 1), 13) == (2023, 12)
+        with pytest.raises(ValueError):
+            start_period((2025, 1), -1)
+
+    @patch('src.load.incremental.copy_dataframe')
+    def test_upsert_nothing_new(self, mock_copy, engine, cursor,
+                                sample_data):
+        cursor.fetchone.return_value = (2025, 2)
+
+        assert upsert_table(engine, sample_data, 'sam_capstone',
+                            'de_2506_a') == (0, (2025, 2))
+        mock_copy.assert_not_called()
+
+    @patch('src.load.incremental.copy_dataframe')
+    def test_upsert_rejects_repeated_keys(self, mock_copy, engine, cursor,
+                                          sample_data):
+        # no key index yet, and the table repeats a key
+        cursor.fetchall.side_effect = [[], [(2024, 4, 'AA', 'JFK', 2)]]
+
+        with pytest.raises(ValueError, match="repeating a key"):
+            upsert_table(engine, sample_data, 'sam_capstone', 'de_2506_a')
+        statements = [call.args[0].as_string(None)
+                      if hasattr(call.args[0], 'as_string') else call.args[0]
+                      for call in cursor.execute.call_args_list]
+        assert not any('CREATE UNIQUE INDEX' in statement
+                       for statement in statements)
+        mock_copy.assert_not_called()
+
+    def test_sync_watermark(self, engine, cursor):
+        cursor.fetchone.return_value = (2025, 3)
+
+        assert sync_watermark(engine, 'sam_capstone', 'de_2506_a',
+                              ['year', 'month']) == (2025, 3)
+        assert cursor.execute.call_args[0][1] == ('sam_capstone', 2025, 3)
+
+    def test_sync_watermark_empty_table(self, engine, cursor):
+        cursor.fetchone.return_value = None
+
+        assert sync_watermark(engine, 'sam_capstone', 'de_2506_a',
+                              ['year', 'month']) is None
+        assert cursor.execute.call_args[0][0].as_string(None).startswith(
+            'DELETE FROM "de_2506_a"."load_watermark"')
+
+    def test_sync_watermark_without_periods(self, engine):
+        assert sync_watermark(engine, 'sam_capstone', 'de_2506_a',
+                              ['name']) is None
+        engine.begin.assert_not_called()
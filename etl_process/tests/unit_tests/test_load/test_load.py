@@ -1,7 +1,7 @@
 import pytest
 import pandas as pd
 from unittest.mock import patch
-from src.load.load import load_main
+from src.load.load import load_main, load_stream_main
 
 
 class TestLoad:
@@ -19,4 +19,25 @@ class TestLoad:
                                sample_data):
         mock_load_to_database.return_value = True
         load_main(sample_data)
-        mock_load_to_database.assert_called_once_with(sample_data)
+        mock_load_to_database.assert_called_once_with(sample_data,
+                                                      mode="replace",
+                                                      workers=1,
+                                                      lookback_months=0)
+
+    @patch('src.load.load.load_to_database')
+    def test_load_main_incremental(self,
+                                   mock_load_to_database,
+                                   sample_data):
+        load_main(sample_data, "incremental")
+        mock_load_to_database.assert_called_once_with(sample_data,
+                                                      mode="incremental",
+                                                      workers=1,
+                                                      lookback_months=0)
+
+    @patch('src.load.load.load_chunks_to_database')
+    def test_load_stream_main(self, mock_load_chunks, sample_data):
+        chunks = iter([sample_data])
+        mock_load_chunks.return_value = True
+
+        assert load_stream_main(chunks) is True
+        mock_load_chunks.assert_called_once_with(chunks)
@@ -1,8 +1,13 @@
 import pytest
 import pandas as pd
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import MagicMock, Mock, patch
 from sqlalchemy import Engine
-from src.load.load_database import load_to_database, execute_sql
+from src.load.load_database import (
+    load_chunks_to_database,
+    load_parquet_to_database,
+    load_to_database,
+    write_table,
+)
 
 
 class TestLoadDatabase:
@@ -20,27 +25,96 @@ class TestLoadDatabase:
 
     @patch('src.load.load_database.load_db_config')
     @patch('src.load.load_database.create_engine')
-    @patch('src.load.load_database.execute_sql')
+    @patch('src.load.load_database.validate_load')
     @patch('pandas.DataFrame.to_sql')
     def test_load_to_database_success(self,
                                       mock_to_sql,
-                                      mock_execute_sql,
+                                      mock_validate_load,
                                       mock_create_engine,
                                       mock_config,
-                                      sample_data,
-                                      mock_engine):
+                                      sample_data):
         mock_config.return_value = {
             "target_database": {
                 "user": "test", "password": "test",
                 "host": "test", "port": "5432", "dbname": "test"
             }
         }
-        mock_create_engine.return_value = mock_engine
-        mock_execute_sql.return_value = True
-        result = load_to_database(sample_data)
+        mock_create_engine.return_value = MagicMock()
+        mock_validate_load.return_value = True
+        result = load_to_database(sample_data, method="insert")
         assert result is True
         mock_to_sql.assert_called_once()
-        assert mock_execute_sql.call_count == 2
+        assert mock_to_sql.call_args[0][0] == "sam_capstone_shadow"
+        mock_validate_load.assert_called_once()
+        assert mock_validate_load.call_args[0][1].rows == 2
+
+    @patch('src.load.load_database.load_db_config')
+    @patch('src.load.load_database.create_engine')
+    @patch('src.load.load_database.validate_load')
+    @patch('src.load.load_database.copy_dataframe')
+    @patch('pandas.DataFrame.to_sql')
+    def test_load_to_database_copy(self,
+                                   mock_to_sql,
+                                   mock_copy,
+                                   mock_validate_load,
+                                   mock_create_engine,
+                                   mock_config,
+                                   sample_data):
+        mock_config.return_value = {
+            "target_database": {
+                "user": "test", "password": "test",
+                "host": "test", "port": "5432", "dbname": "test"
+            }
+        }
+        engine = MagicMock()
+        mock_create_engine.return_value = engine
+        mock_copy.return_value = len(sample_data)
+        mock_validate_load.return_value = True
+
+        result = load_to_database(sample_data)
+
+        assert result is True
+        assert mock_create_engine.call_args[0][0] \
+            .startswith("postgresql+psycopg://")
+        mock_to_sql.assert_not_called()
+        mock_copy.assert_called_once()
+        cursor = engine.begin.return_value.__enter__.return_value \
+            .connection.driver_connection.cursor.return_value \
+            .__enter__.return_value
+        statements = [c[0][0].as_string(None)
+                      for c in cursor.execute.call_args_list]
+        assert statements[0] == ('DROP TABLE IF EXISTS '
+                                 '"de_2506_a"."sam_capstone_shadow"')
+        assert statements[1] == ('CREATE TABLE '
+                                 '"de_2506_a"."sam_capstone_shadow" '
+                                 '("name" TEXT, "age" BIGINT)')
+        assert mock_copy.call_args[0][2] == "sam_capstone_shadow"
+        assert statements[-1] == ('ALTER TABLE '
+                                  '"de_2506_a"."sam_capstone_shadow" '
+                                  'RENAME TO "sam_capstone"')
+        expected = mock_validate_load.call_args[0][1]
+        assert (expected.rows, expected.columns) == (2, 2)
+
+    @patch('src.load.load_database.create_db_engine')
+    @patch('src.load.load_database.validate_load')
+    @patch('src.load.load_database.sync_watermark')
+    @patch('src.load.load_database.write_table')
+    def test_load_to_database_replace_syncs_watermark(self, mock_write_table,
+                                                      mock_sync_watermark,
+                                                      mock_validate_load,
+                                                      mock_create_engine):
+        data = pd.DataFrame({"year": [2024], "month": [5]})
+        mock_write_table.return_value = 1
+        mock_validate_load.return_value = True
+
+        assert load_to_database(data) is True
+        mock_sync_watermark.assert_called_once_with(
+            mock_create_engine.return_value, "sam_capstone", "de_2506_a",
+            ["year", "month"])
+
+    def test_write_table_unknown_method(self, sample_data, mock_engine):
+        with pytest.raises(ValueError, match="Unknown load method"):
+            write_table(mock_engine, sample_data, method="bulk")
 
     @patch('src.load.load_database.load_db_config')
     def test_load_to_database_config_error(self, mock_config, sample_data):
@@ -49,25 +123,94 @@ class TestLoadDatabase:
         result = load_to_database(sample_data)
         assert result is False
 
-    @patch('builtins.open', new_callable=mock_open, read_data="SELECT COUNT(*) as result")
-    @patch('src.load.load_database.pd.read_sql_query')
-    def test_sql_success(self, mock_read_sql, mock_file, mock_engine):
-        mock_read_sql.return_value = pd.DataFrame({"result": [5]})
+    @patch('src.load.load_database.create_db_engine')
+    @patch('src.load.load_database.validate_load')
+    @patch('src.load.load_database.upsert_table')
+    @patch('src.load.load_database.write_table')
+    def test_load_to_database_incremental(self,
+                                          mock_write_table,
+                                          mock_upsert_table,
+                                          mock_validate_load,
+                                          mock_create_engine,
+                                          mock_engine):
+        data = pd.DataFrame({
+            "year": [2023, 2024, 2024], "month": [12, 1, 1],
+            "carrier": ["AA", "AA", "AA"], "iata": ["JFK", "JFK", "JFK"],
+            "arr_flights": [5, 10, 20]
+        })
+        mock_create_engine.return_value = mock_engine
+        mock_upsert_table.return_value = (1, (2024, 1))
+        mock_validate_load.return_value = True
 
-        with patch("pathlib.Path.exists", return_value=True):
-            result = execute_sql(mock_engine, "test_query", 5)
-        assert result is True
+        assert load_to_database(data, mode="incremental") is True
+        mock_write_table.assert_not_called()
+        mock_upsert_table.assert_called_once()
+        # only the periods sent, with the last row of a repeated key
+        expected = mock_validate_load.call_args[0][1]
+        assert expected.rows == 1
+        assert expected.year_rows == {2024: 1}
+        assert expected.sums == {"arr_flights": 20.0}
+        assert mock_validate_load.call_args[0][4] == (2024, 1)
 
-    def test_sql_file_not_found(self, mock_engine):
-        with patch("pathlib.Path.exists", return_value=False):
-            result = execute_sql(mock_engine, "nonthere", 5)
-        assert result is False
+    def test_load_to_database_unknown_mode(self, sample_data):
+        assert load_to_database(sample_data, mode="append") is False
 
-    @patch('builtins.open', new_callable=mock_open, read_data="SELECT COUNT(*) as result")
-    @patch('src.load.load_database.pd.read_sql_query')
-    def test_sql_mismatch(self, mock_read_sql, mock_file, mock_engine):
-        mock_read_sql.return_value = pd.DataFrame({"result": [3]})
+    @patch('src.load.load_database.create_db_engine')
+    @patch('src.load.load_database.validate_load')
+    @patch('src.load.load_database.copy_batches')
+    def test_load_parquet_to_database(self, mock_copy_batches,
+                                      mock_validate_load, mock_create_engine,
+                                      sample_data, tmp_path):
+        path = tmp_path / "merged_data.parquet"
+        sample_data.to_parquet(path)
+        engine = MagicMock()
+        mock_create_engine.return_value = engine
+        mock_copy_batches.side_effect = \
+            lambda conn, batches, *args: sum(b.num_rows for b in batches)
+        mock_validate_load.return_value = True
 
-        with patch("pathlib.Path.exists", return_value=True):
-            result = execute_sql(mock_engine, "test_query", 5)
-        assert result is False
+        assert load_parquet_to_database(path, batch_size=1) is True
+        assert mock_copy_batches.call_args[0][2] == ["name", "age"]
+        expected = mock_validate_load.call_args[0][1]
+        assert (expected.rows, expected.columns) == (2, 2)
+        assert expected.nulls == {"name": 0, "age": 0}
+
+    def test_load_parquet_to_database_missing_file(self, tmp_path):
+        assert load_parquet_to_database(tmp_path / "missing.parquet") \
+            is False
+
+    @patch('src.load.load_database.create_db_engine')
+    @patch('src.load.load_database.validate_load')
+    @patch('src.load.load_database.stream_copy')
+    def test_load_chunks_to_database(self, mock_stream_copy,
+                                     mock_validate_load, mock_create_engine,
+                                     sample_data):
+        mock_stream_copy.side_effect = \
+            lambda engine, chunks, *args: sum(map(len, chunks))
+        mock_validate_load.return_value = True
+
+        assert load_chunks_to_database(iter([sample_data, sample_data])) \
+            is True
+        expected = mock_validate_load.call_args[0][1]
+        assert (expected.rows, expected.columns) == (4, 2)
+
+    @patch('src.load.load_database.create_db_engine')
+    @patch('src.load.load_database.validate_load')
+    @patch('src.load.load_database.stream_copy')
+    def test_load_chunks_to_database_empty_stream(self, mock_stream_copy,
+                                                  mock_validate_load,
+                                                  mock_create_engine):
+        mock_stream_copy.side_effect = \
+            lambda engine, chunks, *args: sum(map(len, chunks))
+
+        assert load_chunks_to_database(iter([])) is True
+        mock_validate_load.assert_not_called()
+
+    @patch('src.load.load_database.create_db_engine')
+    @patch('src.load.load_database.stream_copy')
+    def test_load_chunks_to_database_failure(self, mock_stream_copy,
+                                             mock_create_engine,
+                                             sample_data):
+        mock_stream_copy.side_effect = RuntimeError("connection lost")
+
+        assert load_chunks_to_database(iter([sample_data])) is False
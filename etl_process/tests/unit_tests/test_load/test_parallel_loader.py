@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from src.load.parallel_loader import parallel_copy, split_by_year
+
+
+class TestParallelLoader:
+
+    @pytest.fixture
+    def sample_data(self):
+        return pd.DataFrame({
+            'year': [2021] * 4 + [2022] * 3 + [2023] * 2 + [2024],
+            'month': range(1, 11),
+            'arr_flights': range(10)
+        })
+
+    @pytest.fixture
+    def engine(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def cursor(self, engine):
+        return engine.begin.return_value.__enter__.return_value \
+            .connection.driver_connection.cursor.return_value \
+            .__enter__.return_value
+
+    def _statements(self, cursor):
+        return [call.args[0].as_string(None)
+                for call in cursor.execute.call_args_list]
+
+    def test_split_by_year_balances_whole_years(self, sample_data):
+        parts = split_by_year(sample_data, 2)
+
+        assert [sorted(part['year'].unique()) for part in parts] == \
+            [[2021, 2024], [2022, 2023]]
+        assert pd.concat(parts).sort_index().equals(sample_data)
+
+    def test_split_by_year_at_most_one_part_per_year(self, sample_data):
+        assert len(split_by_year(sample_data, 8)) == 4
+        assert split_by_year(sample_data.head(0), 2) == []
+
+    def test_split_by_year_keeps_missing_years(self, sample_data):
+        data = sample_data.astype({'year': float})
+        data.loc[[1, 5, 9], 'year'] = None
+
+        parts = split_by_year(data, 3)
+
+        assert sum(len(part) for part in parts) == len(data)
+        assert pd.concat(parts).sort_index().equals(data)
+        assert sum(part['year'].isna().all() for part in parts) == 1
+
+    def test_split_by_year_invalid_streams(self, sample_data):
+        with pytest.raises(ValueError):
+            split_by_year(sample_data, 0)
+
+    @patch('src.load.parallel_loader.copy_dataframe')
+    def test_parallel_copy_swaps_shadow_table(self, mock_copy, engine,
+                                              cursor, sample_data):
+        mock_copy.side_effect = lambda conn, part, *args: len(part)
+
+        rows = parallel_copy(engine, sample_data, 'sam_capstone',
+                             'de_2506_a', 3)
+
+        assert rows == len(sample_data)
+        assert mock_copy.call_count == 3
+        assert {call.args[2] for call in mock_copy.call_args_list} == \
+            {'sam_capstone_shadow'}
+        statements = self._statements(cursor)
+        assert statements[0] == \
+            'DROP TABLE IF EXISTS "de_2506_a"."sam_capstone_shadow"'
+        assert 'DROP TABLE IF EXISTS "de_2506_a"."sam_capstone"' in \
+            statements
+        assert 'ALTER TABLE "de_2506_a"."sam_capstone_shadow" ' \
+            'RENAME TO "sam_capstone"' in statements
+
+    @patch('src.load.parallel_loader.copy_dataframe')
+    def test_parallel_copy_failure_keeps_target(self, mock_copy, engine,
+                                                cursor, sample_data):
+        mock_copy.side_effect = RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            parallel_copy(engine, sample_data, 'sam_capstone',
+                          'de_2506_a', 2)
+
+        statements = self._statements(cursor)
+        assert statements[-1] == \
+            'DROP TABLE IF EXISTS "de_2506_a"."sam_capstone_shadow"'
+        assert not any('RENAME' in statement for statement in statements)
@@ -0,0 +1,61 @@
+import pandas as pd
+from unittest.mock import MagicMock
+from src.load.shadow_table import create_shadow_table, swap_in_shadow
+
+
+class TestShadowTable:
+
+    def _statements(self, cursor):
+        return [call.args[0].as_string(None)
+                for call in cursor.execute.call_args_list]
+
+    def test_create_shadow_table(self):
+        cursor = MagicMock()
+        data = pd.DataFrame({'year': [2024], 'iata': ['JFK']})
+
+        shadow = create_shadow_table(cursor, data, 'sam_capstone',
+                                     'de_2506_a')
+
+        assert shadow == 'sam_capstone_shadow'
+        assert self._statements(cursor) == [
+            'DROP TABLE IF EXISTS "de_2506_a"."sam_capstone_shadow"',
+            'CREATE TABLE "de_2506_a"."sam_capstone_shadow" '
+            '("year" BIGINT, "iata" TEXT)',
+        ]
+
+    def test_swap_in_shadow_indexes_before_swapping(self):
+        cursor = MagicMock()
+
+        swap_in_shadow(cursor, 'sam_capstone', 'de_2506_a',
+                       ['year', 'month', 'carrier', 'iata', 'state'])
+
+        assert self._statements(cursor) == [
+            'CREATE INDEX "sam_capstone_shadow_year_idx" ON '
+            '"de_2506_a"."sam_capstone_shadow" ("year")',
+            'CREATE INDEX "sam_capstone_shadow_state_idx" ON '
+            '"de_2506_a"."sam_capstone_shadow" ("state")',
+            'CREATE INDEX "sam_capstone_shadow_carrier_idx" ON '
+            '"de_2506_a"."sam_capstone_shadow" ("carrier")',
+            'CREATE INDEX "sam_capstone_shadow_iata_idx" ON '
+            '"de_2506_a"."sam_capstone_shadow" ("iata")',
+            'ANALYZE "de_2506_a"."sam_capstone_shadow"',
+            'DROP TABLE IF EXISTS "de_2506_a"."sam_capstone"',
+            'ALTER TABLE "de_2506_a"."sam_capstone_shadow" '
+            'RENAME TO "sam_capstone"',
+            'ALTER INDEX "de_2506_a"."sam_capstone_shadow_year_idx" '
+            'RENAME TO "sam_capstone_year_idx"',
+            'ALTER INDEX "de_2506_a"."sam_capstone_shadow_state_idx" '
+            'RENAME TO "sam_capstone_state_idx"',
+            'ALTER INDEX "de_2506_a"."sam_capstone_shadow_carrier_idx" '
+            'RENAME TO "sam_capstone_carrier_idx"',
+            'ALTER INDEX "de_2506_a"."sam_capstone_shadow_iata_idx" '
+            'RENAME TO "sam_capstone_iata_idx"',
+        ]
+
+    def test_swap_in_shadow_skips_missing_index_columns(self):
+        cursor = MagicMock()
+
+        swap_in_shadow(cursor, 'sam_capstone', 'de_2506_a', ['name'])
+
+        assert not any('INDEX' in statement
+                       for statement in self._statements(cursor))
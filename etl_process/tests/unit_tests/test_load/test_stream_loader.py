@@ -0,0 +1,105 @@
+import threading
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from src.load.stream_loader import StreamAborted, stream_copy
+
+
+class TestStreamLoader:
+
+    @pytest.fixture
+    def chunks(self):
+        return [pd.DataFrame({'year': [2023 + i] * 2, 'arr_flights': [1, 2]})
+                for i in range(3)]
+
+    @pytest.fixture
+    def engine(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def cursor(self, engine):
+        return engine.begin.return_value.__enter__.return_value \
+            .connection.driver_connection.cursor.return_value \
+            .__enter__.return_value
+
+    def _statements(self, cursor):
+        return [call.args[0].as_string(None)
+                for call in cursor.execute.call_args_list]
+
+    @patch('src.load.stream_loader.copy_dataframe')
+    def test_stream_copy_loads_every_chunk(self, mock_copy, engine, cursor,
+                                           chunks):
+        mock_copy.side_effect = lambda conn, chunk, *args: len(chunk)
+
+        rows = stream_copy(engine, iter(chunks), 'sam_capstone',
+                           'de_2506_a', queue_size=1)
+
+        assert rows == 6
+        assert [call.args[1]['year'].iloc[0]
+                for call in mock_copy.call_args_list] == [2023, 2024, 2025]
+        assert {call.args[2] for call in mock_copy.call_args_list} == \
+            {'sam_capstone_shadow'}
+        # one transaction for the whole stream
+        engine.begin.assert_called_once()
+        assert 'ALTER TABLE "de_2506_a"."sam_capstone_shadow" ' \
+            'RENAME TO "sam_capstone"' in self._statements(cursor)
+
+    @patch('src.load.stream_loader.copy_dataframe')
+    def test_stream_copy_overlaps_production(self, mock_copy, engine,
+                                             chunks):
+        copying = threading.Event()
+        mock_copy.side_effect = lambda *args: copying.set() or 2
+
+        def produce():
+            yield chunks[0]
+            # the first chunk is copied while the second is produced
+            assert copying.wait(timeout=5)
+            yield chunks[1]
+
+        assert stream_copy(engine, produce(), 'sam_capstone',
+                           'de_2506_a') == 4
+
+    @patch('src.load.stream_loader.copy_dataframe')
+    def test_stream_copy_producer_failure_keeps_target(self, mock_copy,
+                                                       engine, cursor,
+                                                       chunks):
+        mock_copy.return_value = 2
+
+        def produce():
+            yield chunks[0]
+            raise RuntimeError("parse error")
+
+        with pytest.raises(RuntimeError, match="parse error"):
+            stream_copy(engine, produce(), 'sam_capstone', 'de_2506_a')
+
+        # the loader left the transaction with an error, rolling it back
+        exit_args = engine.begin.return_value.__exit__.call_args.args
+        assert exit_args[0] is StreamAborted
+        assert not any('RENAME' in statement
+                       for statement in self._statements(cursor))
+
+    @patch('src.load.stream_loader.copy_dataframe')
+    def test_stream_copy_loader_failure_stops_producer(self, mock_copy,
+                                                       engine, chunks):
+        mock_copy.side_effect = RuntimeError("connection lost")
+        produced = []
+
+        def produce():
+            for i in range(100):
+                produced.append(i)
+                yield chunks[0]
+
+        with pytest.raises(RuntimeError, match="connection lost"):
+            stream_copy(engine, produce(), 'sam_capstone', 'de_2506_a',
+                        queue_size=1)
+        assert len(produced) < 100
+
+    def test_stream_copy_empty_stream(self, engine, cursor):
+        assert stream_copy(engine, iter([]), 'sam_capstone',
+                           'de_2506_a') == 0
+        cursor.execute.assert_not_called()
+
+    def test_stream_copy_invalid_queue_size(self, engine, chunks):
+        with pytest.raises(ValueError):
+            stream_copy(engine, iter(chunks), 'sam_capstone', 'de_2506_a',
+                        queue_size=0)
@@ -0,0 +1,142 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from src.load.validation import (
+    Checksums,
+    build_validation_query,
+    compare_checksums,
+    fetch_checksums,
+    frame_checksums,
+    track_batches,
+    track_frames,
+    validate_load,
+)
+
+
+class TestValidation:
+
+    @pytest.fixture
+    def sample_data(self):
+        return pd.DataFrame({
+            'year': [2023, 2024, 2024],
+            'carrier': ['AA', None, 'DL'],
+            'arr_flights': [10, 20, 30],
+            'total_ct': [1.5, np.nan, 2.25]
+        })
+
+    @pytest.fixture
+    def engine(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def cursor(self, engine):
+        return engine.connect.return_value.__enter__.return_value \
+            .connection.driver_connection.cursor.return_value \
+            .__enter__.return_value
+
+    def test_frame_checksums(self, sample_data):
+        checksums = frame_checksums(sample_data)
+
+        assert checksums.rows == 3
+        assert checksums.columns == 4
+        assert checksums.year_rows == {2023: 1, 2024: 2}
+        assert checksums.sums == {'total_ct': 3.75, 'arr_flights': 60.0}
+        assert checksums.nulls == {'year': 0, 'carrier': 1,
+                                   'arr_flights': 0, 'total_ct': 1}
+
+    def test_track_batches_matches_frame(self, sample_data):
+        checksums = frame_checksums(sample_data.head(0))
+        table = pa.Table.from_pandas(sample_data, preserve_index=False)
+
+        batches = list(track_batches(table.to_batches(max_chunksize=2),
+                                     checksums))
+
+        assert sum(batch.num_rows for batch in batches) == 3
+        assert checksums == frame_checksums(sample_data)
+
+    def test_track_frames_adds_up_chunks(self, sample_data):
+        checksums = Checksums()
+
+        chunks = list(track_frames([sample_data.head(1),
+                                    sample_data.tail(2)], checksums))
+
+        assert len(chunks) == 2
+        assert checksums == frame_checksums(sample_data)
+
+    def test_build_validation_query(self):
+        query = build_validation_query(['year', 'total_ct'], 'sam_capstone',
+                                       'de_2506_a', ['total_ct'])
+
+        assert query.as_string(None) == (
+            'SELECT c.n, t.* FROM (SELECT COUNT(*) AS n FROM '
+            'information_schema.columns WHERE table_schema = %s AND '
+            'table_name = %s) AS c LEFT JOIN (SELECT "year", COUNT(*), '
+            'SUM("total_ct"), COUNT(*) - COUNT("year"), '
+            'COUNT(*) - COUNT("total_ct") FROM "de_2506_a"."sam_capstone" '
+            'GROUP BY "year") AS t ON true')
+
+    def test_build_validation_query_since(self):
+        query = build_validation_query(['year', 'month'], 'sam_capstone',
+                                       'de_2506_a', [], since=True)
+
+        assert 'FROM "de_2506_a"."sam_capstone" WHERE ("year", "month") ' \
+            '>= (%s, %s) GROUP BY "year"' in query.as_string(None)
+
+    def test_fetch_checksums_since(self, engine, cursor):
+        cursor.fetchall.return_value = [(2, 2024, 3, 0, 0)]
+
+        actual = fetch_checksums(engine, ['year', 'month'], 'sam_capstone',
+                                 'de_2506_a', since=(2024, 5))
+
+        assert cursor.execute.call_args[0][1] == \
+            ('de_2506_a', 'sam_capstone', 2024, 5)
+        assert actual.year_rows == {2024: 3}
+
+    def test_fetch_checksums_adds_up_groups(self, engine, cursor,
+                                            sample_data):
+        cursor.fetchall.return_value = [
+            (4, 2023, 1, 1.5, Decimal(10), 0, 0, 0, 0),
+            (4, 2024, 2, 2.25, Decimal(50), 0, 1, 0, 1),
+        ]
+
+        actual = fetch_checksums(engine, list(sample_data.columns),
+                                 'sam_capstone', 'de_2506_a')
+
+        cursor.execute.assert_called_once()
+        assert cursor.execute.call_args[0][1] == \
+            ('de_2506_a', 'sam_capstone')
+        assert compare_checksums(frame_checksums(sample_data), actual) == []
+
+    def test_fetch_checksums_empty_table(self, engine, cursor):
+        cursor.fetchall.return_value = [(2, None, None, None, None, None)]
+
+        actual = fetch_checksums(engine, ['year', 'total_ct'],
+                                 'sam_capstone', 'de_2506_a')
+
+        assert actual == Checksums(columns=2, sums={'total_ct': 0.0},
+                                   nulls={'year': 0, 'total_ct': 0})
+
+    def test_compare_checksums_reports_mismatches(self, sample_data):
+        expected = frame_checksums(sample_data)
+        actual = frame_checksums(sample_data.head(2))
+
+        mismatches = compare_checksums(expected, actual)
+
+        assert mismatches[0] == 'rows: expected 3, got 2'
+        assert 'sum of arr_flights: expected 60.0, got 30.0' in mismatches
+
+    def test_compare_checksums_tolerates_float_order(self):
+        expected = Checksums(sums={'total_ct': 0.1 + 0.2 + 0.3})
+        actual = Checksums(sums={'total_ct': 0.3 + 0.2 + 0.1})
+
+        assert compare_checksums(expected, actual) == []
+
+    def test_validate_load_mismatch(self, engine, cursor):
+        expected = frame_checksums(pd.DataFrame({'age': [1, 2]}))
+        cursor.fetchall.return_value = [(1, None, 1, 0)]
+
+        assert validate_load(engine, expected, 'sam_capstone',
+                             'de_2506_a') is False
@@ -0,0 +1,120 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from config.transform_config import DELAY_CONFIG
+from src.extract.extract import extract_main
+from src.extract.get_delay_data import EXPECTED_SCHEMA
+from src.out_of_core.duckdb_pipeline import (
+    clean_columns,
+    remove_stale_outputs,
+    run_duckdb_pipeline,
+)
+from src.transform.aggregate import build_rollups
+from src.transform.transform import transform_main
+
+
+# Sample data is AI generated
+class TestDuckdbPipeline:
+
+    @pytest.fixture
+    def raw_dir(self, tmp_path):
+        """
+        Raw files with duplicates, nulls and unmatched airports. The last
+        airport repeats BBB with a name sorting before the first one's.
+        """
+        airports = pd.DataFrame({
+            'id': [1, 2, 3, 4, 5, 6],
+            'name': ['Airport A', 'Airport B', 'Airport A', 'Airport C',
+                     'Foreign', 'Aardvark Field'],
+            'city': ['City A', None, 'City A', 'City C', 'City F',
+                     'City B'],
+            'country': ['United States'] * 4 + ['Canada', 'United States'],
+            'iata': ['AAA', 'BBB', 'AAA', None, 'FFF', 'BBB'],
+            'icao': ['\\N'] * 6,
+            'lat': [40.1, 41.2, 40.1, 42.3, 50.0, 41.0],
+            'lon': [-74.1, -75.2, -74.1, -76.3, -80.0, -75.0],
+            'alt': [100, None, 100, 300, 10, 150],
+            'tz': [1] * 6, 'dst': ['A'] * 6, 'timezone': ['x'] * 6,
+            'type': ['airport'] * 6, 'source': ['s'] * 6,
+        })
+        rows = 6
+        delays = pd.DataFrame({
+            'year': [2023.0, 2023.0, 2024.0, 2023.0, None, 2024.0],
+            'month': [1, 1, 2, 1, 3, 4],
+            'carrier': ['AA', 'DL', 'AA', 'AA', 'AA', 'DL'],
+            'carrier_name': ['American', 'Delta', 'American', 'American',
+                             'American', 'Delta'],
+            'airport': ['AAA', 'BBB', 'AAA', 'AAA', 'AAA', 'FFF'],
+            'airport_name': ['A City, NY: Airport A', 'B City, CA: B',
+                             'A City, NY: Airport A', 'A City, NY: Airport A',
+                             'A City, NY: Airport A', 'F City, QC: F'],
+            'arr_flights': [100.0, None, 50.0, 100.0, 10.0, 5.0],
+            'arr_delay': [10.7, 20.0, None, 10.7, 1.0, 1.0],
+        })
+        for col in EXPECTED_SCHEMA:
+            if col not in delays:
+                delays[col] = [float(i % 3) for i in range(rows)]
+        airports.to_csv(tmp_path / 'airports.csv', index=False)
+        delays[EXPECTED_SCHEMA].to_csv(tmp_path / 'Airline_Delay_Cause.csv',
+                                       index=False)
+        return tmp_path
+
+    def test_clean_columns(self):
+        """Test fills and casts generated from the config"""
+        expressions = clean_columns(DELAY_CONFIG, ['carrier', 'year',
+                                                   'carrier_ct', 'other'])
+        assert expressions == [
+            "coalesce(\"carrier\", 'N/A') AS \"carrier\"",
+            'CAST(trunc(coalesce("year", 0)) AS BIGINT) AS "year"',
+            'CAST(coalesce("carrier_ct", 0) AS DOUBLE) AS "carrier_ct"',
+            '"other" AS "other"',
+        ]
+
+    def test_matches_pandas_pipeline(self, raw_dir, tmp_path):
+        """Test that the merged output and rollups match transform_main"""
+        output = tmp_path / 'output'
+        output.mkdir()
+
+        def raw_path(file_name):
+            return raw_dir / file_name
+
+        with patch('src.utils.get_data._raw_path', raw_path), \
+                patch('src.out_of_core.duckdb_pipeline._raw_path',
+                      raw_path), \
+                patch('src.out_of_core.duckdb_pipeline.SPILL_DIR',
+                      tmp_path / 'spill'):
+            expected = transform_main(extract_main(parallel=False))
+            merged_path = run_duckdb_pipeline(output, write_rollups=True)
+
+        result = pd.read_parquet(merged_path)
+        assert list(result.columns) == list(expected.columns)
+        assert len(result) == 3
+        # Strings come back from Parquet as object columns
+        str_cols = expected.select_dtypes(exclude='number').columns
+        pd.testing.assert_frame_equal(
+            result.reset_index(drop=True),
+            expected.astype({col: object for col in str_cols})
+            .reset_index(drop=True),
+            check_dtype=False)
+
+        for name, rollup in build_rollups(expected).items():
+            pd.testing.assert_frame_equal(
+                pd.read_parquet(output / f'rollup_{name}.parquet'),
+                rollup, check_dtype=False)
+
+    def test_remove_stale_outputs(self, tmp_path):
+        """Test that only this run's merged data and rollups are kept"""
+        written = [tmp_path / 'merged_data.parquet',
+                   tmp_path / 'rollup_year_state.parquet']
+        stale = [tmp_path / 'merged_data.arrow',
+                 tmp_path / 'rollup_year_state.arrow',
+                 tmp_path / 'rollup_year_name.csv']
+        for path in written + stale + [tmp_path / 'clean_delay.csv']:
+            path.touch()
+        (tmp_path / 'merged_data' / 'year=2024').mkdir(parents=True)
+
+        remove_stale_outputs(tmp_path, written)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == \
+            ['clean_delay.csv', 'merged_data.parquet',
+             'rollup_year_state.parquet']
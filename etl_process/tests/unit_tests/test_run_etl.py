@@ -0,0 +1,94 @@
+import json
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from scripts import run_etl
+from src.utils.instrumentation import REPORT_FILE, stage
+
+
+@patch("scripts.run_etl._ensure_log_directory")
+@patch("scripts.run_etl.run_pipeline")
+def test_main_writes_run_report(mock_run_pipeline, mock_log_directory,
+                                tmp_path):
+    """The run_etl console script calls main, which writes the report"""
+    mock_log_directory.return_value = tmp_path
+
+    def run_stage():
+        with stage("extract"):
+            pass
+    mock_run_pipeline.side_effect = run_stage
+
+    run_etl.main()
+
+    report = json.loads((tmp_path / REPORT_FILE).read_text())
+    assert report["status"] == "succeeded"
+    assert report["stages"][0]["name"] == "extract"
+
+
+@patch("scripts.run_etl._ensure_log_directory")
+@patch("scripts.run_etl.run_pipeline")
+def test_main_reports_failed_run(mock_run_pipeline, mock_log_directory,
+                                 tmp_path):
+    mock_log_directory.return_value = tmp_path
+    mock_run_pipeline.side_effect = ValueError("Unknown ETL_ENGINE")
+
+    with pytest.raises(ValueError):
+        run_etl.main()
+
+    report = json.loads((tmp_path / REPORT_FILE).read_text())
+    assert report["status"] == "failed"
+
+
+class FakeManifest:
+    """In-memory RunManifest keeping the stage keys and artifacts"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def is_fresh(self, stage, key):
+        return self.stages.get(stage, (None,))[0] == key
+
+    def output_hashes(self, stage):
+        return {}
+
+    def load_artifacts(self, stage):
+        return self.stages[stage][1]
+
+    def record(self, stage, key, inputs, artifacts=None):
+        self.stages[stage] = (key, list((artifacts or {}).values()))
+
+
+@patch("scripts.run_etl.setup_env")
+@patch("scripts.run_etl.hash_file", return_value="raw")
+@patch("scripts.run_etl.load_main", return_value=True)
+@patch("scripts.run_etl.transform_main")
+@patch("scripts.run_etl.extract_main")
+@patch("scripts.run_etl.RunManifest")
+def test_run_pipeline_reruns_stages_for_post_data(mock_manifest,
+                                                  mock_extract,
+                                                  mock_transform,
+                                                  mock_load, mock_hash_file,
+                                                  mock_setup_env,
+                                                  monkeypatch):
+    """Switching POST_DATA on reruns the stages that write the files"""
+    mock_manifest.return_value = FakeManifest()
+    mock_extract.return_value = (pd.DataFrame({"a": [1]}),
+                                 pd.DataFrame({"b": [2]}))
+    mock_transform.return_value = pd.DataFrame({"c": [3]})
+    for name in ["OUTPUT_FORMAT", "ETL_ENGINE", "FORCE_RUN"]:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("POST_DATA", "False")
+
+    run_etl.run_pipeline()
+    run_etl.run_pipeline()
+    assert (mock_extract.call_count, mock_transform.call_count) == (1, 1)
+
+    monkeypatch.setenv("POST_DATA", "True")
+    run_etl.run_pipeline()
+    assert mock_extract.call_args.args == (True, "csv")
+    assert mock_transform.call_args.args[1:3] == (True, "csv")
+
+    monkeypatch.setenv("OUTPUT_FORMAT", "parquet")
+    run_etl.run_pipeline()
+    assert mock_extract.call_args.args == (True, "parquet")
+    assert mock_transform.call_count == 3
@@ -0,0 +1,88 @@
+import importlib.util
+import os
+from pathlib import Path
+import pandas as pd
+import pytest
+from src.transform.aggregate import ROLLUPS, build_rollups
+
+DASHBOARD_UTIL = Path(__file__).parents[4] / "streamlit_app" / "util.py"
+
+
+class TestBuildRollups:
+
+    @pytest.fixture
+    def merged_data(self):
+        return pd.DataFrame({
+            'year': [2023, 2023, 2024, 2024],
+            'carrier_name': ['American', 'American', 'Delta', 'American'],
+            'name': ['JFK', 'LAX', 'JFK', 'JFK'],
+            'state': ['NY', 'CA', 'NY', 'NY'],
+            'arr_flights': [100, 200, 50, 25],
+            'carrier_ct': [1.0, 2.0, 3.0, 4.0],
+            'weather_ct': [0.5, 0.5, 0.5, 0.5],
+            'total_ct': [1.5, 2.5, 3.5, 4.5],
+            'lat': [40.0, 34.0, 40.0, 42.0],
+            'lon': [-73.0, -118.0, -73.0, -75.0],
+            'arr_flights_pct': [1.5, 1.25, 7.0, 18.0]
+        })
+
+    def test_builds_every_rollup(self, merged_data):
+        rollups = build_rollups(merged_data)
+
+        assert set(rollups) == set(ROLLUPS)
+        for name, group_cols in ROLLUPS.items():
+            assert list(rollups[name].columns[:2]) == group_cols
+
+    @pytest.fixture
+    def dashboard(self):
+        """The dashboard's util module, loaded from its file"""
+        pytest.importorskip("streamlit")
+        spec = importlib.util.spec_from_file_location("dashboard_util",
+                                                      DASHBOARD_UTIL)
+        dashboard = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(dashboard)
+        return dashboard
+
+    def test_sums_and_means(self, merged_data):
+        rollup = build_rollups(merged_data)['state_year'] \
+            .set_index(['state', 'year'])
+
+        ny_2024 = rollup.loc[('NY', 2024)]
+        assert ny_2024['arr_flights'] == 75
+        assert ny_2024['carrier_ct'] == 7.0
+        assert ny_2024['total_ct'] == 8.0
+        assert ny_2024['lat'] == 41.0
+        assert ny_2024['arr_flights_pct'] == 12.5
+
+    def test_matches_full_groupby(self, merged_data):
+        """Test that re-aggregating a rollup gives the full groupby"""
+        rollup = build_rollups(merged_data)['year_carrier']
+        cols = ['carrier_ct', 'weather_ct', 'total_ct', 'arr_flights']
+
+        expected = merged_data.groupby('carrier_name')[cols].sum()
+        result = rollup.groupby('carrier_name')[cols].sum()
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_dashboard_rollups_match(self, dashboard, merged_data):
+        """Test that the dashboard rebuilds the rollups the ETL writes"""
+        assert dashboard.ROLLUPS == ROLLUPS
+        expected = build_rollups(merged_data)
+        for name, rollup in dashboard.build_rollups(merged_data).items():
+            pd.testing.assert_frame_equal(rollup, expected[name])
+
+    def test_dashboard_reads_newest_rollups(self, dashboard, tmp_path,
+                                            monkeypatch):
+        """Test that rollups of an earlier OUTPUT_FORMAT are not read"""
+        monkeypatch.setattr(dashboard, "_output_dir", lambda: tmp_path)
+        for name in ROLLUPS:
+            for suffix, mtime in [(".arrow", 100), (".csv", 200)]:
+                file = tmp_path / f"rollup_{name}{suffix}"
+                file.touch()
+                os.utime(file, (mtime, mtime))
+
+        files = dashboard._rollup_files()
+
+        assert {file.suffix for file in files.values()} == {".csv"}
+        (tmp_path / "rollup_year_name.csv").unlink()
+        (tmp_path / "rollup_year_name.arrow").unlink()
+        assert dashboard._rollup_files() is None
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from src.transform.airport_index import AirportIndex
+
+
+class TestAirportIndex:
+
+    @pytest.fixture
+    def airports(self):
+        return pd.DataFrame({
+            'name': ['Airport A', 'Airport B', 'Airport C'],
+            'iata': ['AAA', 'BBB', 'CCC'],
+            'lat': [40.1, 41.2, 42.3]
+        }).astype({'name': 'string', 'iata': 'string'})
+
+    @pytest.fixture
+    def delays(self):
+        return pd.DataFrame({
+            'airport': ['BBB', 'ZZZ', 'AAA', 'BBB', 'ZZZ', 'YYY'],
+            'arr_flights': [1, 2, 3, 4, 5, 6]
+        }, index=[10, 11, 12, 13, 14, 15]).astype({'airport': 'string'})
+
+    def test_join_matches_merge(self, airports, delays):
+        """Test that join gives the matched rows of a left merge"""
+        result = AirportIndex(airports).join(delays, on='airport')
+
+        expected = delays.reset_index().merge(
+            airports, left_on='airport', right_on='iata', how='left'
+        ).dropna().set_index('index').rename_axis(None)
+        pd.testing.assert_frame_equal(result, expected)
+        assert result.index.tolist() == [10, 12, 13]
+
+    def test_categorical_codes(self, airports, delays):
+        """Test lookup of categorical codes, including nulls"""
+        codes = pd.Series(['CCC', None, 'XXX', 'AAA'], dtype='category')
+        codes = codes.cat.add_categories(['BBB'])
+
+        positions = AirportIndex(airports).lookup(codes)
+
+        assert positions.tolist() == [2, -1, -1, 0]
+
+    def test_unmatched_counts(self, airports, delays):
+        """Test that unmatched codes are counted, most frequent first"""
+        index = AirportIndex(airports)
+        index.join(delays, on='airport')
+
+        assert index.unmatched_counts().to_dict() == {'ZZZ': 2, 'YYY': 1}
+
+    def test_chunks_match_whole_frame(self, airports, delays):
+        """Test that joining chunk by chunk gives the whole frame join"""
+        index = AirportIndex(airports)
+        chunks = [index.join(chunk, on='airport')
+                  for chunk in (delays[:2], delays[2:4], delays[4:])]
+
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks),
+            AirportIndex(airports).join(delays, on='airport'))
+        assert index.unmatched_counts().to_dict() == {'ZZZ': 2, 'YYY': 1}
+
+    def test_duplicate_codes_keep_first(self, airports):
+        """Test that a duplicated code resolves to its first airport"""
+        airports = pd.concat([airports, airports.head(1)
+                              .assign(name='Airport A2')])
+
+        index = AirportIndex(airports)
+
+        assert len(index.airports) == 3
+        assert index.lookup(pd.Series(['AAA'])).tolist() == [0]
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from src.transform.merge import airport_dimension, merge_main, parse_states
+
+
+class TestMerge:
+
+    @pytest.fixture
+    def airports(self):
+        return pd.DataFrame({
+            'name': ['Airport A', 'Airport B'],
+            'city': ['City A', 'City B'],
+            'iata': ['AAA', 'BBB'],
+            'lat': [40.1, 41.2],
+            'lon': [-74.1, -75.2],
+            'alt': [100.0, 200.0]
+        }).astype({'name': 'string', 'city': 'string', 'iata': 'string'})
+
+    @pytest.fixture
+    def delays(self):
+        return pd.DataFrame({
+            'year': [2023, 2023, 2024, 2024],
+            'airport': ['AAA', 'BBB', 'AAA', 'CCC'],
+            'airport_name': ['A City, NY: Airport A', 'B City, CA: Airport B',
+                             'A City, NY: Airport A', 'N/A'],
+            'arr_flights': [100, 200, 50, 10],
+            'arr_del15': [10, 20, 5, 1],
+            'carrier_ct': [4.0, 6.0, 2.0, 1.0]
+        }).astype({'airport': 'string', 'airport_name': 'string'})
+
+    def test_parse_states(self):
+        """Test state parsing, names without a state give a null"""
+        states = parse_states(pd.Series(['A City, NY: Airport A', 'N/A'],
+                                        dtype='string'))
+        assert states[0] == 'NY'
+        assert states.isna()[1]
+        assert parse_states(pd.Series(['N/A'], dtype='string')).isna().all()
+
+    def test_airport_dimension(self, delays):
+        """Test one dimension row per name, mapped back to every row"""
+        dimension, rows = airport_dimension(delays)
+
+        assert dimension['airport'].tolist() == ['AAA', 'BBB', 'CCC']
+        assert dimension['state'].tolist()[:2] == ['NY', 'CA']
+        assert rows.tolist() == [0, 1, 0, 2]
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_merge_main_state(self, airports, delays, compact):
+        """Test the state of every matched row, also for categorical names"""
+        if compact:
+            delays = delays.astype({'airport': 'category',
+                                    'airport_name': 'category'})
+
+        result = merge_main(airports, delays, compact)
+
+        assert result['state'].tolist() == ['NY', 'CA', 'NY']
+        assert isinstance(result['state'].dtype,
+                          pd.CategoricalDtype) == compact
+        assert 'airport_name' not in result.columns
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from src.transform.partitioned import (
+    clean_partitioned,
+    merge_stats,
+    partition_rows,
+)
+from src.transform.transformer import Transformer
+
+
+class TestPartitionedClean:
+
+    @pytest.fixture
+    def config(self):
+        return {
+            'crit_cols': ['name'],
+            'col_types': {
+                'str_cols': ['name', 'carrier'],
+                'int_cols': ['year'],
+                'float_cols': ['delay']
+            }
+        }
+
+    @pytest.fixture
+    def raw_data(self):
+        """Rows with duplicates, critical nulls and fillable nulls"""
+        rng = np.random.default_rng(0)
+        rows = 400
+        data = pd.DataFrame({
+            'name': rng.choice(['A', 'B', 'C', None], rows),
+            'Carrier': pd.Categorical(rng.choice(['AA', 'DL', None], rows)),
+            'year': rng.choice([2020.0, 2021.0, np.nan], rows),
+            'delay': rng.integers(0, 5, rows).astype(float)
+        })
+        # Shuffled labels, to check the original index is kept
+        data.index = rng.permutation(rows) + 1000
+        return data
+
+    @pytest.fixture(autouse=True)
+    def small_partitions(self):
+        with patch('src.transform.partitioned.MIN_PARTITION_ROWS', 10), \
+                patch('src.transform.partitioned.os.cpu_count',
+                      return_value=4):
+            yield
+
+    def test_partition_rows_keeps_duplicates_together(self, raw_data):
+        """Test that identical rows are always in the same partition"""
+        partition = pd.Series(partition_rows(raw_data, 4))
+        groups = raw_data.reset_index(drop=True).astype(str) \
+            .groupby(list(raw_data.columns))
+
+        assert partition.between(0, 3).all()
+        assert all(partition[rows].nunique() == 1
+                   for rows in groups.indices.values())
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_matches_single_process_clean(self, raw_data, config, compact):
+        """Test that the result and stats match Transformer.clean"""
+        cleaner = Transformer(raw_data, config['crit_cols'],
+                              config['col_types'], compact)
+        expected = cleaner.clean()
+
+        result, stats = clean_partitioned(raw_data, config['crit_cols'],
+                                          config['col_types'], compact,
+                                          workers=3)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert stats == cleaner.stats
+        assert stats['duplicates'] > 0
+
+    def test_small_data_cleaned_in_process(self, raw_data, config):
+        """Test that no pool is started for a single partition"""
+        with patch('src.transform.partitioned.ProcessPoolExecutor') \
+                as mock_pool:
+            result, stats = clean_partitioned(raw_data.head(15),
+                                              config['crit_cols'],
+                                              config['col_types'],
+                                              workers=4)
+
+        mock_pool.assert_not_called()
+        assert stats['rows'] == 15
+
+    def test_workers_capped_at_cpu_count(self, raw_data, config):
+        """Test that no more partitions than CPUs are made"""
+        with patch('src.transform.partitioned.os.cpu_count',
+                   return_value=1), \
+                patch('src.transform.partitioned.ProcessPoolExecutor') \
+                as mock_pool:
+            clean_partitioned(raw_data, config['crit_cols'],
+                              config['col_types'], workers=8)
+
+        mock_pool.assert_not_called()
+
+    def test_merge_stats(self):
+        """Test that partition statistics are summed"""
+        merged = merge_stats([{'rows': 2, 'duplicates': 1},
+                              {'rows': 3, 'duplicates': 0}])
+        assert merged == {'rows': 5, 'duplicates': 1}
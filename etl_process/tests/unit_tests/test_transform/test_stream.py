@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.transform.stream import SeenRows, transform_chunks
+from src.transform.transform import transform_main
+
+
+class TestStream:
+
+    @pytest.fixture
+    def airports(self):
+        return pd.DataFrame({
+            'name': ['Airport A', 'Airport B'],
+            'iata': ['AAA', 'BBB'],
+            'city': ['City A', 'City B'],
+            'lat': [40.1, 41.2],
+            'lon': [-74.1, -75.2],
+            'alt': [100.0, 200.0]
+        })
+
+    @pytest.fixture
+    def delays(self):
+        rows = 6
+        return pd.DataFrame({
+            'year': [2023.0] * rows,
+            'month': [1.0, 2.0, 3.0, 1.0, 4.0, 2.0],
+            'carrier': ['AA', 'AA', 'DL', 'AA', 'DL', 'AA'],
+            'carrier_name': ['American'] * rows,
+            'airport': ['AAA', 'BBB', 'AAA', 'AAA', 'CCC', 'BBB'],
+            'airport_name': ['A City, NY: Airport A',
+                             'B City, CA: Airport B',
+                             'A City, NY: Airport A',
+                             'A City, NY: Airport A', 'N/A',
+                             'B City, CA: Airport B'],
+            **{col: [1.0, 2.0, 3.0, 1.0, 5.0, 2.0] for col in [
+                'arr_flights', 'arr_del15', 'arr_cancelled',
+                'arr_diverted', 'arr_delay', 'carrier_delay',
+                'weather_delay', 'nas_delay', 'security_delay',
+                'late_aircraft_delay', 'carrier_ct', 'weather_ct',
+                'nas_ct', 'security_ct', 'late_aircraft_ct']}
+        }).astype({'carrier': 'category', 'airport': 'category'})
+
+    def test_seen_rows_across_chunks(self):
+        seen_rows = SeenRows()
+        first = pd.DataFrame({'a': [1, 2, 2]})
+        second = pd.DataFrame({'a': [3, 2, 1, 3]})
+
+        # repeats inside a chunk are left to Transformer.clean
+        assert seen_rows.filter_new(first).tolist() == [True, True, True]
+        assert seen_rows.filter_new(second).tolist() == \
+            [True, False, False, True]
+        assert len(seen_rows) == 3
+        assert np.all(np.diff(seen_rows.hashes.astype(float)) > 0)
+
+    def test_seen_rows_merges_runs(self):
+        seen_rows = SeenRows()
+
+        for start in range(0, 64, 4):
+            assert seen_rows.filter_new(
+                pd.DataFrame({'a': range(start, start + 4)})).all()
+
+        assert not seen_rows.filter_new(pd.DataFrame({'a': range(64)})).any()
+        assert len(seen_rows) == 64
+        # each run is more than twice the next, so there are O(log n)
+        sizes = [len(run) for run in seen_rows.runs]
+        assert all(size > 2 * next_size
+                   for size, next_size in zip(sizes, sizes[1:]))
+        assert len(sizes) < 16
+
+    def test_transform_chunks_matches_transform_main(self, airports,
+                                                     delays):
+        chunks = [delays.iloc[start:start + 2]
+                  for start in range(0, len(delays), 2)]
+
+        streamed = pd.concat(transform_chunks(airports, iter(chunks)))
+        expected = transform_main((airports, delays))
+
+        # rows 3 and 5 repeat rows 0 and 1 of earlier chunks, 4 has no
+        # airport
+        assert streamed.index.tolist() == [0, 1, 2]
+        pd.testing.assert_frame_equal(streamed, expected)
+
+    def test_transform_chunks_is_lazy(self, airports, delays):
+        def chunks():
+            yield delays.iloc[:2]
+            raise RuntimeError("parse error")
+
+        merged = transform_chunks(airports, chunks())
+
+        assert len(next(merged)) == 2
+        with pytest.raises(RuntimeError, match="parse error"):
+            next(merged)
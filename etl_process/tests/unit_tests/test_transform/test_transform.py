@@ -50,16 +50,36 @@ class TestTransformMain:
     def sample_data_tuple(self, sample_airport_data, sample_delay_data):
         return (sample_airport_data, sample_delay_data)
 
+    @patch('src.transform.transform.post_dataset')
     @patch('src.transform.transform.post')
-    def test_transform_main_writes_to_file_when_requested(self, mock_post, sample_data_tuple):
+    def test_transform_main_writes_to_file_when_requested(self, mock_post, mock_post_dataset, sample_data_tuple):
         """Test that transform_main writes to file when write_to_file=True"""
         transform_main(sample_data_tuple, write_to_file=True)
 
-        assert mock_post.call_count == 3
+        assert mock_post.call_count == 8
         mock_post.assert_any_call("output", "clean_airports.csv",
                                   mock_post.call_args_list[0][0][2])
         mock_post.assert_any_call("output", "clean_delay.csv",
                                   mock_post.call_args_list[1][0][2])
+        written = [call[0][1] for call in mock_post.call_args_list]
+        assert "rollup_state_year.csv" in written
+        assert not any(name.startswith("airport_dim") for name in written)
+        assert "merged_data.arrow" in written
+        mock_post_dataset.assert_called_once()
+        assert mock_post_dataset.call_args[0][:2] == ("output", "merged_data")
+
+    @patch('src.transform.transform.post_dataset')
+    @patch('src.transform.transform.post')
+    def test_transform_main_publishes_arrow_for_dashboard(self, mock_post, mock_post_dataset, sample_data_tuple):
+        """Test that the merged data is published once as categorical Arrow"""
+        transform_main(sample_data_tuple, write_to_file=True,
+                       file_format="arrow")
+
+        written = {call[0][1]: call[0][2] for call in mock_post.call_args_list}
+        assert mock_post.call_count == 7
+        dashboard_data = written["merged_data.arrow"]
+        assert dashboard_data["iata"].dtype == "category"
+        assert dashboard_data["state"].dtype == "category"
 
     def test_transform_main_cleans_columns(self, sample_data_tuple):
         """Test that the data is properly cleaned"""
@@ -68,6 +88,27 @@ class TestTransformMain:
         assert all(col.islower() for col in result.columns)
         assert all('_' in col or col.isalpha() for col in result.columns)
 
+    def test_transform_main_compact(self, sample_data_tuple):
+        """Test that compact mode keeps string columns as categoricals"""
+        # More rows than airport names, so the categorical names have fewer
+        # categories than rows and the states must be mapped back per row
+        delays = pd.concat([sample_data_tuple[1]] * 3, ignore_index=True)
+        delays['month'] = range(1, 7)
+        delays['airport'] = ['AAA', 'BBB', 'BBB', 'AAA', 'AAA', 'BBB']
+        delays['airport_name'] = [
+            {'AAA': 'A City, NY: Airport A',
+             'BBB': 'B City, CA: Airport B'}[code]
+            for code in delays['airport']]
+        # string names, as extracted, become categoricals with string
+        # categories in compact mode
+        delays = delays.astype({'airport_name': 'string'})
+        result = transform_main((sample_data_tuple[0], delays), compact=True)
+
+        for col in ['carrier', 'carrier_name', 'name', 'iata', 'state']:
+            assert isinstance(result[col].dtype, pd.CategoricalDtype), col
+        assert result['state'].tolist() == ['NY', 'CA', 'CA', 'NY', 'NY',
+                                            'CA']
+
     def test_transform_main_with_dirty_data(self):
         """Test transform_main with data that needs cleaning"""
         dirty_airport = pd.DataFrame({
@@ -174,3 +174,109 @@ class TestTransformerDelayData:
         result = transformer.clean()
         assert len(result) == 2
         assert result['carrier_ct'].fillna(0).equals(result['carrier_ct'])
+
+
+class TestTransformerFusedClean:
+
+    @pytest.fixture
+    def dirty_data(self):
+        return pd.DataFrame({
+            'year': [2023, 2023, 2023, None, 2024],
+            'carrier': ['AA', 'AA', None, 'DL', 'UA'],
+            'Arr Flights': [100.0, 100.0, 50.0, 20.0, None],
+            'Carrier CT': [1.5, 1.5, None, 2.0, None],
+            'Note': ['x', 'x', None, 'y', 'z']
+        })
+
+    @pytest.fixture
+    def config(self):
+        return {
+            'crit_cols': ['year', 'carrier'],
+            'col_types': {
+                'str_cols': ['carrier', 'note'],
+                'int_cols': ['year', 'arr_flights'],
+                'float_cols': ['carrier_ct']
+            }
+        }
+
+    def _method_chain(self, data, config):
+        transformer = Transformer(data, config['crit_cols'],
+                                  config['col_types'])
+        transformer.remove_duplicates()
+        transformer.format_columns()
+        transformer.handle_nulls()
+        transformer.format_data_types()
+        return transformer.clean_data
+
+    def test_clean_matches_method_chain(self, dirty_data, config):
+        """Test that the fused clean gives the same frame as the chain"""
+        expected = self._method_chain(dirty_data.copy(), config)
+        result = Transformer(dirty_data, config['crit_cols'],
+                             config['col_types']).clean()
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_clean_does_not_modify_input(self, dirty_data, config):
+        """Test that the raw data is left untouched"""
+        original = dirty_data.copy()
+        Transformer(dirty_data, config['crit_cols'],
+                    config['col_types']).clean()
+
+        pd.testing.assert_frame_equal(dirty_data, original)
+
+    def test_clean_logs_null_statistics(self, dirty_data, config):
+        """Test that null statistics are computed once and logged"""
+        with patch('src.transform.transformer.logger') as mock_logger:
+            Transformer(dirty_data, config['crit_cols'],
+                        config['col_types']).clean()
+
+        mock_logger.info.assert_any_call("Removed 1 duplicate rows")
+        mock_logger.info.assert_any_call(
+            "Dropped 2 rows with critical nulls, filled 2 nulls in 1 rows")
+
+    def test_clean_warns_on_untyped_nulls(self, dirty_data, config):
+        """Test that nulls in columns without a type are reported"""
+        config['col_types']['str_cols'] = ['carrier']
+        dirty_data.loc[4, 'Note'] = None
+        with patch('src.transform.transformer.logger') as mock_logger:
+            Transformer(dirty_data, config['crit_cols'],
+                        config['col_types']).clean()
+
+        mock_logger.warning.assert_called_once_with(
+            "could not handle 1 nulls")
+
+    def test_clean_missing_typed_column(self, dirty_data, config):
+        """Test that typed columns missing from the data are rejected"""
+        config['col_types']['float_cols'].append('weather_ct')
+        with pytest.raises(KeyError, match="Typed columns not found"):
+            Transformer(dirty_data, config['crit_cols'],
+                        config['col_types']).clean()
+
+    def test_duplicated_rows_confirms_hash_matches(self, dirty_data):
+        """Test that rows sharing a hash are compared exactly"""
+        with patch('src.transform.transformer.pd.util.hash_pandas_object',
+                   return_value=pd.Series([1] * len(dirty_data))):
+            result = Transformer._duplicated_rows(dirty_data)
+
+        assert result.tolist() == dirty_data.duplicated().tolist()
+
+    def test_clean_compact_uses_categoricals(self, dirty_data, config):
+        """Test that compact mode stores str_cols as categoricals"""
+        result = Transformer(dirty_data, config['crit_cols'],
+                             config['col_types'], compact=True).clean()
+
+        assert isinstance(result['carrier'].dtype, pd.CategoricalDtype)
+        assert isinstance(result['note'].dtype, pd.CategoricalDtype)
+        assert result['note'].tolist() == ['x', 'z']
+        assert result['year'].dtype == 'int64'
+
+    def test_clean_fills_categorical_nulls(self, dirty_data, config):
+        """Test that N/A is added as a category before filling"""
+        dirty_data['Note'] = dirty_data['Note'].astype('category')
+        dirty_data.loc[4, 'Note'] = None
+
+        result = Transformer(dirty_data, config['crit_cols'],
+                             config['col_types']).clean()
+
+        assert isinstance(result['note'].dtype, pd.CategoricalDtype)
+        assert result['note'].tolist() == ['x', 'N/A']
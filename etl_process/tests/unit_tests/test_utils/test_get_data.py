@@ -1,7 +1,12 @@
 import pytest
 import pandas as pd
 from unittest.mock import patch
-from src.utils.get_data import get_raw_file
+from src.utils.get_data import (
+    CSV_ENGINE,
+    get_raw_file,
+    get_raw_file_chunks,
+    get_raw_header,
+)
 
 
 class TestGetFile:
@@ -44,3 +49,50 @@ class TestGetFile:
         # Verify the path construction
         called_path = mock_read_csv.call_args[0][0]
         assert str(called_path).endswith("data\\raw\\airports.csv")
+
+    @patch('src.utils.get_data.pd.read_csv')
+    def test_get_raw_file_default_engine(self, mock_read_csv):
+        """Test that the CSV engine defaults to CSV_ENGINE"""
+        mock_read_csv.return_value = pd.DataFrame({'col1': [1]})
+
+        get_raw_file("test.csv")
+        assert mock_read_csv.call_args.kwargs['engine'] == CSV_ENGINE
+
+        get_raw_file("test.csv", engine="c")
+        assert mock_read_csv.call_args.kwargs['engine'] == "c"
+
+
+class TestGetFileChunks:
+
+    @pytest.fixture
+    def raw_csv(self, tmp_path):
+        path = tmp_path / "test.csv"
+        pd.DataFrame({'col1': range(5), 'col2': list('abcde')}) \
+            .to_csv(path, index=False)
+        return path
+
+    def test_get_raw_file_chunks_bounded_size(self, raw_csv):
+        """Test that the file is yielded in chunks of at most chunksize"""
+        with patch('src.utils.get_data._raw_path', return_value=raw_csv):
+            chunks = list(get_raw_file_chunks("test.csv", chunksize=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert pd.concat(chunks)['col1'].tolist() == [0, 1, 2, 3, 4]
+
+    def test_get_raw_file_chunks_not_found(self, tmp_path):
+        """Test FileNotFoundError handling"""
+        with patch('src.utils.get_data._raw_path',
+                   return_value=tmp_path / "missing.csv"):
+            with pytest.raises(FileNotFoundError,
+                               match="File test.csv not found"):
+                list(get_raw_file_chunks("test.csv"))
+
+    def test_get_raw_file_chunks_invalid_chunksize(self):
+        """Test that a non-positive chunksize is rejected"""
+        with pytest.raises(ValueError, match="chunksize must be positive"):
+            list(get_raw_file_chunks("test.csv", chunksize=0))
+
+    def test_get_raw_header(self, raw_csv):
+        """Test that only the header is returned"""
+        with patch('src.utils.get_data._raw_path', return_value=raw_csv):
+            assert get_raw_header("test.csv") == ['col1', 'col2']
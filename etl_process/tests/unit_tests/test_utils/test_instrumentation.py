@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.instrumentation import _peaks, run_report, stage
+from src.utils.post_data import post
+
+
+class TestStage:
+
+    def test_stage_outside_report_is_not_recorded(self):
+        with stage("extract", rows_in=3) as metrics:
+            metrics.rows_out = 2
+        assert metrics.name == "extract"
+        assert metrics.wall_time_s == 0.0
+
+    def test_nested_stages_are_prefixed(self, tmp_path):
+        with run_report(tmp_path / "report.jsonl") as report:
+            with stage("transform"):
+                with stage("clean_delay", rows_in=10) as metrics:
+                    metrics.rows_out = 8
+
+        names = [metrics.name for metrics in report.stages]
+        assert names == ["transform.clean_delay", "transform"]
+        inner = report.stages[0]
+        assert (inner.rows_in, inner.rows_out) == (10, 8)
+        assert inner.wall_time_s > 0
+        assert inner.peak_rss_bytes >= inner.rss_end_bytes > 0
+
+    def test_peak_rss_is_per_stage(self, tmp_path):
+        """A stage after a larger one reports its own, lower peak"""
+        size = 200 * 2**20
+        with run_report(tmp_path / "report.jsonl") as report:
+            if not _peaks.supported:
+                pytest.skip("No resettable memory high-water mark")
+            with stage("transform"):
+                with stage("large"):
+                    data = np.ones(size, dtype=np.uint8)
+                    del data
+                with stage("small"):
+                    data = np.ones(size // 100, dtype=np.uint8)
+                    del data
+
+        peaks = {metrics.name: metrics.peak_rss_bytes
+                 for metrics in report.stages}
+        large, small = peaks["transform.large"], peaks["transform.small"]
+        assert large - small > size // 2
+        assert peaks["transform"] >= large
+        assert report.to_dict()["peak_rss_bytes"] >= large
+
+    def test_copied_context_keeps_parent_in_threads(self, tmp_path):
+        def read():
+            with stage("read.airports.csv"):
+                pass
+
+        with run_report(tmp_path / "report.jsonl") as report:
+            with stage("extract"), ThreadPoolExecutor(1) as executor:
+                executor.submit(contextvars.copy_context().run, read) \
+                    .result()
+
+        assert report.stages[0].name == "extract.read.airports.csv"
+
+    def test_post_records_write_stage(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('src.utils.post_data.DATA_DIR', tmp_path)
+        (tmp_path / "output").mkdir()
+        data = pd.DataFrame({"year": [2024, 2025]})
+
+        with run_report(tmp_path / "report.jsonl") as report:
+            assert post("output", "merged_data.csv", data)
+
+        metrics = report.stages[0]
+        assert metrics.name == "write.merged_data.csv"
+        assert metrics.rows_out == 2
+        assert metrics.bytes_out == \
+            (tmp_path / "output" / "merged_data.csv").stat().st_size
+
+
+class TestRunReport:
+
+    def test_report_appended_as_json_line(self, tmp_path):
+        path = tmp_path / "report.jsonl"
+        for _ in range(2):
+            with run_report(path):
+                with stage("load", rows_in=5):
+                    pass
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        report = json.loads(lines[-1])
+        assert report["status"] == "succeeded"
+        assert report["stages"][0]["name"] == "load"
+        assert report["stages"][0]["rows_in"] == 5
+
+    def test_failed_run_is_saved(self, tmp_path):
+        path = tmp_path / "report.jsonl"
+        with pytest.raises(ValueError):
+            with run_report(path):
+                with stage("transform"):
+                    raise ValueError("bad data")
+
+        report = json.loads(path.read_text())
+        assert report["status"] == "failed"
+        assert report["stages"][0]["name"] == "transform"
@@ -1,4 +1,5 @@
 import logging
+from logging.handlers import QueueHandler
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -31,19 +32,61 @@ def test_create_formatter_returns_correct_format():
     assert "%(levelname)s" in fmt_str
 
 
-def test_create_handlers_returns_both_handlers():
+def test_create_handlers_share_console_handler():
     with tempfile.TemporaryDirectory() as temp_dir:
         log_dir = Path(temp_dir)
-        file_handler, console_handler = _create_handlers(
-            log_dir, "test.log", logging.INFO
+        file_handler, console_handler = _create_handlers(log_dir / "a.log")
+        other_file_handler, other_console_handler = _create_handlers(
+            log_dir / "b.log"
         )
 
         assert isinstance(file_handler, logging.FileHandler)
         assert isinstance(console_handler, logging.StreamHandler)
-        assert file_handler.level == logging.INFO
+        assert console_handler is other_console_handler
         file_handler.close()
-        assert console_handler.level == logging.INFO
-        console_handler.close()
+        other_file_handler.close()
+
+
+def test_loggers_of_one_file_share_queue_handler(tmp_path):
+    base_path = tmp_path / "src" / "utils"
+    first = setup_logger("test.shared.first", "shared.log",
+                         base_path=base_path)
+    second = setup_logger("test.shared.second", "shared.log",
+                          base_path=base_path)
+    other = setup_logger("test.shared.other", "other.log",
+                         base_path=base_path)
+
+    assert isinstance(first.handlers[0], QueueHandler)
+    assert first.handlers == second.handlers
+    assert first.handlers != other.handlers
+    for logger in (first, second, other):
+        logger.handlers.clear()
+
+
+def test_queued_records_written_by_listener(tmp_path):
+    logging.disable(logging.NOTSET)
+    logger = setup_logger("test.queued", "queued.log",
+                          base_path=tmp_path / "src" / "utils")
+    logger.propagate = False
+    handler = logger.handlers[0]
+    # keep the file handler only, so the test prints nothing
+    handler.listener.handlers = handler.listener.handlers[:1]
+    for i in range(100):
+        logger.info(f"record {i}")
+
+    # stopping the listener drains the queue
+    handler.listener.stop()
+    handler.pid = None
+    log_path = tmp_path / "logs" / "queued.log"
+    lines = log_path.read_text().splitlines()
+    assert len(lines) == 100
+    assert lines[-1].endswith("INFO - record 99")
+
+    # once stopped, records are written synchronously
+    logger.info("after stop")
+    assert log_path.read_text().splitlines()[-1].endswith("after stop")
+    logger.handlers.clear()
+    handler.listener.handlers[0].close()
 
 
 @patch("src.utils.logging_utils.logging.getLogger")
@@ -56,7 +99,9 @@ def test_setup_logger_creates_logger_with_handlers(mock_get_logger):
         setup_logger("test", "test.log", base_path=temp_dir)
 
         mock_logger.setLevel.assert_called_once_with(logging.DEBUG)
-        assert mock_logger.addHandler.call_count == 2
+        mock_logger.addHandler.assert_called_once()
+        handler = mock_logger.addHandler.call_args.args[0]
+        assert isinstance(handler, QueueHandler)
 
 
 @patch("src.utils.logging_utils.logging.getLogger")
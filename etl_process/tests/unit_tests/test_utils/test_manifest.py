@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from src.utils.manifest import RunManifest, hash_config, hash_file
+
+
+class TestHashing:
+
+    def test_hash_file_tracks_content(self, tmp_path):
+        path = tmp_path / "raw.csv"
+        path.write_text("a,b\n1,2\n")
+        first = hash_file(path, block_size=4)
+        assert first == hash_file(path)
+
+        path.write_text("a,b\n1,3\n")
+        assert hash_file(path) != first
+
+    def test_hash_config_is_order_independent(self):
+        assert hash_config({"a": [1], "b": 2}) == \
+            hash_config({"b": 2, "a": [1]})
+        assert hash_config({"a": [1]}) != hash_config({"a": [2]})
+
+
+class TestRunManifest:
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        (tmp_path / "cache").mkdir()
+        with patch('src.utils.manifest.DATA_DIR', tmp_path), \
+                patch('src.utils.post_data.DATA_DIR', tmp_path):
+            yield tmp_path
+
+    @pytest.fixture
+    def frame(self):
+        return pd.DataFrame({"year": [2024, 2025], "iata": ["JFK", "LAX"]})
+
+    def test_new_manifest_is_not_fresh(self, data_dir):
+        manifest = RunManifest(data_dir / "manifest.json")
+        assert not manifest.is_fresh("extract", "key")
+
+    def test_record_and_reuse(self, data_dir, frame):
+        manifest = RunManifest(data_dir / "manifest.json")
+        manifest.record("extract", "key", {"raw.csv": "abc"},
+                        {"delay": frame})
+
+        reloaded = RunManifest(data_dir / "manifest.json")
+        assert reloaded.is_fresh("extract", "key")
+        assert not reloaded.is_fresh("extract", "other")
+        assert reloaded.load_artifacts("extract")[0].equals(frame)
+        assert list(reloaded.output_hashes("extract")) == ["extract.delay"]
+
+    def test_missing_artifact_is_not_fresh(self, data_dir, frame):
+        manifest = RunManifest(data_dir / "manifest.json")
+        manifest.record("extract", "key", {}, {"delay": frame})
+        (data_dir / "cache" / "extract_delay.parquet").unlink()
+
+        assert not manifest.is_fresh("extract", "key")
+
+    def test_stage_without_artifacts(self, data_dir):
+        manifest = RunManifest(data_dir / "manifest.json")
+        manifest.record("load", "key", {"LOAD_MODE": "replace"})
+
+        assert RunManifest(data_dir / "manifest.json").is_fresh("load", "key")
+
+    @patch('src.utils.manifest.post', return_value=False)
+    def test_failed_cache_write_is_not_recorded(self, mock_post, data_dir,
+                                                frame):
+        manifest = RunManifest(data_dir / "manifest.json")
+        manifest.record("extract", "key", {}, {"delay": frame})
+
+        assert not manifest.is_fresh("extract", "key")
+        assert not (data_dir / "manifest.json").exists()
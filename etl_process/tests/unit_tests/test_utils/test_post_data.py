@@ -0,0 +1,142 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from unittest.mock import patch
+import pyarrow.parquet as pq
+from src.utils.post_data import OUTPUT_FORMATS, post, post_dataset
+
+
+class TestPost:
+
+    @pytest.fixture
+    def sample_data(self):
+        return pd.DataFrame({
+            'year': [2023, 2024],
+            'carrier': ['AA', 'DL'],
+            'carrier_ct': [1.5, 2.5]
+        }, index=[3, 7]).astype({'year': 'int64',
+                                 'carrier': 'string',
+                                 'carrier_ct': 'float64'})
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        (tmp_path / "output").mkdir()
+        with patch('src.utils.post_data.DATA_DIR', tmp_path):
+            yield tmp_path
+
+    def test_post_csv(self, data_dir, sample_data):
+        """Test that csv output is unchanged"""
+        assert post("output", "sample.csv", sample_data) is True
+
+        result = pd.read_csv(data_dir / "output" / "sample.csv", index_col=0)
+        assert result.index.tolist() == [3, 7]
+        assert result['carrier'].tolist() == ['AA', 'DL']
+
+    @pytest.mark.parametrize("file_name", ["sample.parquet",
+                                           "sample.feather",
+                                           "sample.arrow"])
+    def test_post_columnar_preserves_dtypes(self, data_dir, sample_data,
+                                            file_name):
+        """Test that columnar formats keep the transformer dtypes"""
+        assert post("output", file_name, sample_data) is True
+
+        path = data_dir / "output" / file_name
+        if file_name.endswith(".parquet"):
+            result = pd.read_parquet(path)
+        else:
+            result = pd.read_feather(path)
+        assert result.dtypes.equals(sample_data.dtypes)
+        assert len(result) == len(sample_data)
+
+    def test_post_arrow_uncompressed_and_replaced(self, data_dir,
+                                                  sample_data):
+        """Test that Arrow IPC output can be memory-mapped and is swapped
+        in whole"""
+        path = data_dir / "output" / "sample.arrow"
+        assert post("output", "sample.arrow", sample_data.head(1)) is True
+        assert post("output", "sample.arrow", sample_data) is True
+
+        # uncompressed buffers are read in place, nothing is allocated
+        allocated = pa.total_allocated_bytes()
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert pa.total_allocated_bytes() == allocated
+        assert table.num_rows == len(sample_data)
+        assert list((data_dir / "output").iterdir()) == [path]
+
+    def test_post_row_count_from_metadata(self, data_dir, sample_data):
+        """Test that a row mismatch is logged but still reported as saved"""
+        write, _ = OUTPUT_FORMATS[".parquet"]
+        with patch.dict(OUTPUT_FORMATS, {".parquet": (write, lambda p: 1)}), \
+                patch('src.utils.post_data.logger') as mock_logger:
+            assert post("output", "sample.parquet", sample_data) is True
+        mock_logger.warning.assert_called_once()
+
+    def test_post_unsupported_format(self, data_dir, sample_data):
+        """Test that unknown extensions are rejected"""
+        assert post("output", "sample.xlsx", sample_data) is False
+
+    def test_post_missing_directory(self, data_dir, sample_data):
+        """Test that write errors return False"""
+        assert post("missing", "sample.csv", sample_data) is False
+
+
+class TestPostDataset:
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        (tmp_path / "output").mkdir()
+        with patch('src.utils.post_data.DATA_DIR', tmp_path):
+            yield tmp_path
+
+    @pytest.fixture
+    def sample_data(self):
+        return pd.DataFrame({
+            'year': [2023, 2023, 2024],
+            'month': [1, 2, 1],
+            'carrier': ['AA', 'DL', 'AA'],
+            'carrier_ct': [1.5, 2.5, 3.5]
+        }).astype({'carrier': 'string'})
+
+    def test_post_dataset_partitions_by_year_and_month(self, data_dir,
+                                                       sample_data):
+        """Test that each year and month is written to its own partition"""
+        assert post_dataset("output", "merged", sample_data) is True
+
+        root = data_dir / "output" / "merged"
+        assert sorted(path.relative_to(root).as_posix()
+                      for path in root.rglob("*.parquet")) == [
+            "year=2023/month=1/part-0.parquet",
+            "year=2023/month=2/part-0.parquet",
+            "year=2024/month=1/part-0.parquet",
+        ]
+        result = pq.read_table(root, filters=[("year", "=", 2024)])
+        assert result.column("carrier_ct").to_pylist() == [3.5]
+
+    def test_post_dataset_collects_statistics(self, data_dir, sample_data):
+        """Test that _metadata holds the row count and column statistics
+        of every partition"""
+        assert post_dataset("output", "merged", sample_data) is True
+
+        metadata = pq.read_metadata(data_dir / "output" / "merged"
+                                    / "_metadata")
+        assert metadata.num_rows == 3
+        assert metadata.num_row_groups == 3
+        statistics = metadata.row_group(0).column(1).statistics
+        assert statistics.has_min_max
+
+    def test_post_dataset_replaces_previous_dataset(self, data_dir,
+                                                    sample_data):
+        """Test that partitions of an older run do not survive"""
+        assert post_dataset("output", "merged", sample_data) is True
+        assert post_dataset("output", "merged", sample_data.tail(1)) is True
+
+        root = data_dir / "output" / "merged"
+        assert [path.name for path in root.glob("year=*")] == ["year=2024"]
+        assert sorted(path.name for path in (data_dir / "output").iterdir()) \
+            == ["merged"]
+
+    def test_post_dataset_missing_column(self, data_dir, sample_data):
+        """Test that write errors return False"""
+        assert post_dataset("output", "merged",
+                            sample_data.drop(columns="month")) is False
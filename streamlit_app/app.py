@@ -1,7 +1,7 @@
 import streamlit as st
 
 from navbar import navbar
-from util import get_data, AccessType
+from util import AccessType
 
 
 def main():
@@ -9,10 +9,9 @@ def main():
     st.set_page_config(page_title="Airport Delays", layout="wide")
     with open("styles.css") as f:
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    data = get_data(AccessType.FILE)
     with st.container(key="title"):
         st.title("Airport Delay Stats")
-    navbar(data)
+    navbar(AccessType.FILE)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,18 @@
-import pandas as pd
 import streamlit as st
 import plotly.express as px  # type: ignore
-from util import STATE_NAMES
+from util import STATE_NAMES, AccessType, get_group_totals, get_years
 
 
-def graph_display(data: pd.DataFrame):
+def graph_display(access: AccessType):
 
-    ct_cols = [col for col in data.columns if col.endswith('_ct')]
+    years = get_years(access)
 
     # Filter controls
     col1, col2, col4 = st.columns(3)
 
     with col1:
-        selected_years = st.multiselect("Year", sorted(data['year'].unique()),
-                                        default=[data['year'].max()])
+        selected_years = st.multiselect("Year", years,
+                                        default=years[-1:])
 
     with col2:
         group_options = {
@@ -26,11 +25,8 @@ def graph_display(data: pd.DataFrame):
     with col4:
         sort_order = st.selectbox("Order", ['Descending', 'Ascending'])
 
-    filtered_data = data[data['year'].isin(selected_years)]
-
-    agg_dict = {col: 'sum' for col in ct_cols}
-    agg_dict['arr_flights'] = 'sum'
-    grouped_data = filtered_data.groupby(group_by).agg(agg_dict).reset_index()
+    grouped_data = get_group_totals(access, selected_years, group_by)
+    ct_cols = [col for col in grouped_data.columns if col.endswith('_ct')]
 
     if group_by == 'state':
         grouped_data['state_name'] = grouped_data['state'].map(STATE_NAMES)
@@ -1,17 +1,13 @@
-import pandas as pd
 import streamlit as st
 import plotly.express as px  # type: ignore
-from util import STATE_NAMES
+from util import STATE_NAMES, AccessType, get_state_summary
 
 
-def map_display(data: pd.DataFrame):
+def map_display(access: AccessType):
 
-    ct_cols = [col for col in data.columns if col.endswith('_ct')]
-    agg_dict = {'lat': 'mean', 'lon': 'mean', 'arr_flights': 'sum',
-                'arr_flights_pct': 'mean'}
-    agg_dict.update({col: 'sum' for col in ct_cols})
+    state_summary = get_state_summary(access)
+    ct_cols = [col for col in state_summary.columns if col.endswith('_ct')]
 
-    state_summary = data.groupby(['state', 'year']).agg(agg_dict).reset_index()
     state_summary['state_name'] = state_summary['state'].map(STATE_NAMES)
 
     for col in ct_cols:
@@ -1,9 +1,9 @@
 from enum import Enum
-import pandas as pd
 import streamlit as st
 
 from nav_pages.graph import graph_display
 from nav_pages.map import map_display
+from util import AccessType
 
 
 class ColorPalette(Enum):
@@ -13,7 +13,7 @@ class ColorPalette(Enum):
     ACCENT = "#f1e3dd"
 
 
-def navbar(data: pd.DataFrame):
+def navbar(access: AccessType):
 
     with st.container(key="navbar-container", border=None):
         page = st.radio(
@@ -27,6 +27,6 @@ def navbar(data: pd.DataFrame):
         if page == "Home":
             st.title("🏠 Home")
         elif page == "Graph":
-            graph_display(data)
+            graph_display(access)
         elif page == "Map":
-            map_display(data)
+            map_display(access)
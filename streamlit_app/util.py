@@ -1,8 +1,20 @@
 from enum import Enum
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import os
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import (
+    Engine,
+    Select,
+    column,
+    create_engine,
+    func,
+    select,
+    table,
+    text,
+)
 import streamlit as st
 
 
@@ -11,6 +23,36 @@ class AccessType(Enum):
     FILE = 2
 
 
+# Low-cardinality string columns, kept as categoricals so the frame is
+# compact and groupbys run on integer codes
+CATEGORY_COLS = ["carrier", "carrier_name", "name", "city", "iata", "state"]
+
+# Seconds a cached dataset is kept even if its source has not changed
+CACHE_TTL = 600
+
+SCHEMA_NAME = "de_2506_a"
+TABLE_NAME = "sam_capstone"
+TABLE = f"{SCHEMA_NAME}.{TABLE_NAME}"
+
+
+# Rollup name -> group-by columns, mirrors ROLLUPS in
+# etl_process/src/transform/aggregate.py, kept equal by test_aggregate.py
+ROLLUPS = {
+    "year_carrier": ["year", "carrier_name"],
+    "year_name": ["year", "name"],
+    "year_state": ["year", "state"],
+    "state_year": ["state", "year"],
+}
+# Graph page group-by column -> rollup holding it
+ROLLUP_BY_GROUP = {
+    "carrier_name": "year_carrier",
+    "name": "year_name",
+    "state": "year_state",
+}
+# Columns averaged, rather than summed, by the rollups
+MEAN_COLS = ["lat", "lon", "arr_flights_pct"]
+
+
 # AI generated
 STATE_NAMES = {
     'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas',
@@ -31,26 +73,304 @@ STATE_NAMES = {
 }
 
 
-def get_data(access: AccessType = AccessType.DATABASE) -> pd.DataFrame:
+# year=/month= partitioned Parquet dataset written by the ETL transform
+DATASET_NAME = "merged_data"
+PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int64()), ("month", pa.int64())]), flavor="hive"
+)
+
+
+def _output_dir() -> Path:
+    return Path(os.getcwd()).parent / "etl_process" / "data" / "output"
+
+
+def _dataset_dir() -> Path:
+    return _output_dir() / DATASET_NAME
+
+
+@st.cache_resource
+def get_engine() -> Engine:
+    """
+    Pooled engine shared by every dashboard session, created on first use.
+    """
+    secrets = st.secrets
+    return create_engine(
+        f"postgresql://{secrets['SOURCE_DB_USER']}:{secrets['SOURCE_DB_PASSWORD']}@"
+        f"{secrets['SOURCE_DB_HOST']}:{secrets['SOURCE_DB_PORT']}/{secrets['SOURCE_DB_NAME']}",
+        pool_size=5,
+        pool_pre_ping=True
+    )
+
+
+def data_version(access: AccessType) -> tuple:
+    """
+    Cheap fingerprint of the dashboard's data source, used as part of the
+    cache key so a new ETL run invalidates the cached data.
+
+    For files this is the modification time of every ETL output and of
+    the run manifest. For the database it is the table oid, which changes
+    when a full load recreates the table, and its row change counters.
+    """
     if access == AccessType.DATABASE:
-        # Add connection to database
-        secrets = st.secrets
+        with get_engine().connect() as conn:
+            return tuple(conn.execute(text(
+                "SELECT s.relid, s.n_tup_ins + s.n_tup_upd + s.n_tup_del "
+                "FROM pg_stat_user_tables s "
+                "WHERE s.relid = to_regclass(:table)"
+            ), {"table": TABLE}).fetchone() or ())
+
+    output = _output_dir()
+    files = sorted(output.glob("*")) + [output.parent / "manifest.json",
+                                        _dataset_dir() / "_metadata"]
+    return tuple((file.name, file.stat().st_mtime_ns)
+                 for file in files if file.is_file())
+
+
+def _read_arrow(file: Path) -> pd.DataFrame:
+    """
+    Memory-map an uncompressed Arrow IPC file written by the ETL. Numeric
+    columns point straight at the mapped pages, which every dashboard
+    process shares through the OS page cache, and strings are stored
+    dictionary encoded, so loading costs almost no time or memory.
+    """
+    with pa.memory_map(str(file)) as source:
+        return pa.ipc.open_file(source).read_all() \
+            .to_pandas(split_blocks=True)
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=2)
+def _load_data(access: AccessType, version: tuple) -> pd.DataFrame:
+    if access == AccessType.DATABASE:
+        with get_engine().connect() as conn:
+            df = pd.read_sql(f"SELECT * FROM {TABLE}", conn)
+            return df.astype({col: "category" for col in CATEGORY_COLS})
+
+    output = _output_dir()
+    arrow_file = output / "merged_data.arrow"
+    if arrow_file.exists():
+        df = _read_arrow(arrow_file)
+        return df.astype({col: "category" for col in CATEGORY_COLS})
+    # Parquet output (OUTPUT_FORMAT=parquet) keeps the ETL dtypes
+    parquet_file = output / "merged_data.parquet"
+    if parquet_file.exists():
+        df = pd.read_parquet(parquet_file)
+        return df.astype({col: "category" for col in CATEGORY_COLS})
+    file = output / "merged_data.csv"
+    if not file.exists():
+        raise FileNotFoundError(f"file not found {file}")
+    df = pd.read_csv(file, encoding="latin-1", index_col=0,
+                     dtype={col: "category" for col in CATEGORY_COLS})
+    return df
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=8)
+def _load_partitions(version: tuple, years: tuple) -> pd.DataFrame:
+    dataset = ds.dataset(_dataset_dir(), format="parquet",
+                         partitioning=PARTITIONING)
+    # The filter on the partition column skips the other years' files
+    # without opening them
+    df = dataset.to_table(filter=ds.field("year").isin(years)).to_pandas()
+    return df.astype({col: "category" for col in CATEGORY_COLS})
+
+
+def get_data(access: AccessType = AccessType.DATABASE,
+             years: Optional["list[int]"] = None) -> pd.DataFrame:
+    """
+    Load the merged data, cached across reruns and sessions.
+
+    With years in file mode, only the year= partitions of those years are
+    read from the partitioned dataset, when the ETL wrote one.
+
+    Every session gets the same DataFrame, so callers must not modify it in
+    place. The cache is dropped after CACHE_TTL seconds or as soon as
+    data_version changes.
+    """
+    version = data_version(access)
+    if years is not None and access == AccessType.FILE and \
+            _dataset_dir().exists():
+        return _load_partitions(version, tuple(sorted(years)))
+    df = _load_data(access, version)
+    return df if years is None else df[df['year'].isin(years)]
+
+
+def build_rollups(data: pd.DataFrame) -> "dict[str, pd.DataFrame]":
+    """Aggregate the merged data the same way the ETL transform does."""
+    ct_cols = [col for col in data.columns if col.endswith('_ct')]
+    agg_dict = {col: 'sum' for col in ct_cols}
+    agg_dict['arr_flights'] = 'sum'
+    agg_dict.update({col: 'mean' for col in MEAN_COLS})
+    return {name: data.groupby(group_cols, observed=True)
+            .agg(agg_dict).reset_index()
+            for name, group_cols in ROLLUPS.items()}
+
 
-        engine = create_engine(
-            f"postgresql://{secrets['SOURCE_DB_USER']}:{secrets['SOURCE_DB_PASSWORD']}@"
-            f"{secrets['SOURCE_DB_HOST']}:{secrets['SOURCE_DB_PORT']}/{secrets['SOURCE_DB_NAME']}"
-        )
-        with engine.connect() as conn:
-            df = pd.read_sql("SELECT * FROM de_2506_a.sam_capstone", conn)
-            return df
+def _rollup_files() -> Optional["dict[str, Path]"]:
+    """
+    Paths of the rollups written by the ETL, the most recently written
+    one when a rollup was written in several formats, e.g. after
+    OUTPUT_FORMAT changed. None if any rollup is missing.
+    """
+    output = _output_dir()
+    files = {}
+    for name in ROLLUPS:
+        written = [file for file in (output / f"rollup_{name}{suffix}"
+                                     for suffix in (".arrow", ".parquet",
+                                                    ".csv"))
+                   if file.exists()]
+        if written:
+            files[name] = max(written, key=lambda file: file.stat().st_mtime)
+    return files if len(files) == len(ROLLUPS) else None
 
+
+def _read_output(file: Path) -> pd.DataFrame:
+    if file.suffix == ".arrow":
+        return _read_arrow(file)
+    if file.suffix == ".parquet":
+        return pd.read_parquet(file)
+    return pd.read_csv(file, encoding="latin-1", index_col=0)
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=2)
+def _load_rollups(access: AccessType,
+                  version: tuple) -> "dict[str, pd.DataFrame]":
     if access == AccessType.FILE:
-        file = Path(os.getcwd()).parent / "etl_process" / "data" / "output" / "merged_data.csv"
-        if not file.exists():
-            raise FileNotFoundError(f"file not found {file}")
-        df = pd.read_csv(file, encoding="latin-1", index_col=0)
-        return df
+        files = _rollup_files()
+        if files is not None:
+            return {name: _read_output(file) for name, file in files.items()}
+
+    return build_rollups(_load_data(access, version))
+
+
+def get_rollups(access: AccessType = AccessType.DATABASE
+                ) -> "dict[str, pd.DataFrame]":
+    """
+    Load the rollups written by the ETL transform, falling back to
+    aggregating the merged data when they are missing. Cached like
+    get_data.
+    """
+    return _load_rollups(access, data_version(access))
+
+
+def _table_columns(conn) -> "list[str]":
+    return list(conn.execute(text(f"SELECT * FROM {TABLE} LIMIT 0")).keys())
+
+
+def aggregate_query(columns: "list[str]",
+                    group_cols: "list[str]",
+                    years: Optional["list[int]"] = None,
+                    means: bool = True) -> Select:
+    """
+    Build the parameterized GROUP BY query computing a rollup in the
+    database, optionally restricted to some years.
+
+    Args:
+        columns: columns of the table, the '_ct' ones are summed
+        group_cols: columns to group by, must be columns of the table
+        years: years to keep, all years if None
+        means: whether to also average MEAN_COLS
+
+    Returns:
+        Select: the query, the years are sent as bound parameters
+    """
+    missing = set(group_cols) - set(columns)
+    if missing:
+        raise ValueError(f"Unknown group by columns: {sorted(missing)}")
+
+    source = table(TABLE_NAME, *map(column, columns), schema=SCHEMA_NAME)
+    sums = [col for col in columns if col.endswith('_ct')] + ['arr_flights']
+    aggregates = [func.sum(source.c[col]).label(col) for col in sums]
+    if means:
+        aggregates += [func.avg(source.c[col]).label(col)
+                       for col in MEAN_COLS]
+    groups = [source.c[col] for col in group_cols]
+
+    query = select(*groups, *aggregates).group_by(*groups)
+    if years is not None:
+        query = query.where(source.c.year.in_(years))
+    return query
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def _query_years(access: AccessType, version: tuple) -> "list[int]":
+    if access == AccessType.DATABASE:
+        with get_engine().connect() as conn:
+            return list(conn.execute(text(
+                f"SELECT DISTINCT year FROM {TABLE} ORDER BY year"
+            )).scalars())
+    if _dataset_dir().exists():
+        # The partition directory names list the years, no data is read
+        return sorted(int(path.name.split("=")[1])
+                      for path in _dataset_dir().glob("year=*"))
+    years = _load_rollups(access, version)['year_state']['year']
+    return sorted(years.unique().tolist())
+
+
+def get_years(access: AccessType = AccessType.DATABASE) -> "list[int]":
+    """Sorted years present in the data."""
+    return _query_years(access, data_version(access))
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def _query_group_totals(access: AccessType, version: tuple,
+                        years: tuple, group_by: str) -> pd.DataFrame:
+    if access == AccessType.DATABASE:
+        with get_engine().connect() as conn:
+            query = aggregate_query(_table_columns(conn), [group_by],
+                                    list(years), means=False)
+            return pd.read_sql(query, conn)
+
+    if _rollup_files() is None and _dataset_dir().exists():
+        # Without rollups, aggregate only the selected years' partitions
+        rollup = get_data(access, list(years))
+    else:
+        rollup = _load_rollups(access, version)[ROLLUP_BY_GROUP[group_by]]
+    sum_cols = [col for col in rollup.columns if col.endswith('_ct')]
+    sum_cols.append('arr_flights')
+    return rollup[rollup['year'].isin(years)] \
+        .groupby(group_by, observed=True)[sum_cols].sum().reset_index()
+
+
+def get_group_totals(access: AccessType,
+                     years: "list[int]",
+                     group_by: str) -> pd.DataFrame:
+    """
+    Sums of the '_ct' columns and arr_flights per group over some years.
+
+    In database mode the filter and the aggregation run in PostgreSQL and
+    only one row per group is fetched.
+
+    Args:
+        access: where the data is read from
+        years: years to include
+        group_by: one of the ROLLUP_BY_GROUP columns
+
+    Returns:
+        pd.DataFrame: one row per group
+    """
+    if group_by not in ROLLUP_BY_GROUP:
+        raise ValueError(f"Unsupported group by column {group_by}")
+    return _query_group_totals(access, data_version(access),
+                               tuple(sorted(years)), group_by)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def _query_state_summary(access: AccessType,
+                         version: tuple) -> pd.DataFrame:
+    if access == AccessType.DATABASE:
+        with get_engine().connect() as conn:
+            query = aggregate_query(_table_columns(conn),
+                                    ROLLUPS['state_year'])
+            return pd.read_sql(query, conn)
+    return _load_rollups(access, version)['state_year']
+
 
+def get_state_summary(access: AccessType = AccessType.DATABASE
+                      ) -> pd.DataFrame:
+    """
+    The state_year rollup. In database mode it is aggregated by
+    PostgreSQL, so one row per state and year is fetched.
+    """
+    return _query_state_summary(access, data_version(access))
 
 
 if __name__ == "__main__":